@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from ..core.logging_config import get_logger
+from ..core.perf import perf
+from .monitor import monitor_service
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/debug/perf")
+async def get_perf_stats():
+    """获取采集器自身的耗时统计和自身CPU预算调节器的状态
+
+    耗时统计包括各阶段 p50/p95/p99、错误和缓存降级次数，单位毫秒。
+    """
+    try:
+        data = perf.snapshot()
+        data["governor"] = monitor_service.governor.snapshot()
+        return {"success": True, "data": data}
+    except Exception as e:
+        logger.error(f"获取性能统计失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """以 Prometheus 文本格式输出采集器自身的耗时指标"""
+    return PlainTextResponse(
+        perf.prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
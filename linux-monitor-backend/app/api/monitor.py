@@ -1,18 +1,104 @@
 import asyncio
 import json
+import os
+import re
 import time
-
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from ..core.logging_config import get_logger
+from ..core.perf import perf
+from ..services.history_export import (
+    EXPORT_FORMATS,
+    HISTORY_SERIES,
+    arrow_available,
+    export_history,
+)
 from ..services.monitor_service import MonitorService
+from ..services.sampler import EVENT_LIST, Sampler, SharedSampler
 
 # 获取日志记录器
 logger = get_logger(__name__)
 
-router = APIRouter()
+
+async def register_poll():
+    """多 worker 模式下每个 HTTP 请求都算作一次轮询，使采样进程保持运行
+
+    单进程模式下模块接口在请求中直接采集，不读取采样器的结果，唤醒采样器只会
+    产生无人读取的采样周期；只有 register_sample_reader 标记的接口才算作轮询。
+    """
+    if isinstance(sampler, SharedSampler):
+        sampler.touch()
+
+
+async def register_sample_reader():
+    """读取采样器积累的数据（历史、进程事件）的请求使采样器保持运行"""
+    sampler.touch()
+
+
+router = APIRouter(dependencies=[Depends(register_poll)])
+
+TcpState = Literal[
+    "ESTABLISHED",
+    "SYN_SENT",
+    "SYN_RECV",
+    "FIN_WAIT1",
+    "FIN_WAIT2",
+    "TIME_WAIT",
+    "CLOSE",
+    "CLOSE_WAIT",
+    "LAST_ACK",
+    "CLOSING",
+]
+
+ProcessState = Literal[
+    "running",
+    "sleeping",
+    "disk-sleep",
+    "stopped",
+    "tracing-stop",
+    "zombie",
+    "dead",
+    "idle",
+    "parked",
+    "waking",
+    "wake-kill",
+]
 monitor_service = MonitorService()
+SAMPLE_INTERVAL = float(os.environ.get("SAMPLE_INTERVAL", "3"))
+# 多 worker 模式下 run.py 通过该环境变量传入采样进程写入的共享内存段
+SNAPSHOT_SEGMENT = os.environ.get("SNAPSHOT_SEGMENT")
+# 所有推送客户端共享的采样节拍
+sampler = (
+    SharedSampler(monitor_service, SNAPSHOT_SEGMENT, interval=SAMPLE_INTERVAL)
+    if SNAPSHOT_SEGMENT
+    else Sampler(monitor_service, interval=SAMPLE_INTERVAL)
+)
+
+
+def snapshot_response(topic: str) -> Response | None:
+    """多 worker 模式下直接返回共享快照中已编码的模块数据，快照过旧时返回 None"""
+    if not isinstance(sampler, SharedSampler) or not sampler.fresh:
+        return None
+    return Response(
+        content=f'{{"success": true, "data": {sampler.encoded()[topic]}}}',
+        media_type="application/json",
+    )
+
+
+def client_id(websocket: WebSocket) -> str:
+    """用于按客户端统计发送耗时的标识（地址:端口）"""
+    client = websocket.client
+    return f"{client.host}:{client.port}" if client else "unknown"
 
 
 # WebSocket连接管理器
@@ -35,6 +121,7 @@ class ConnectionManager:
         try:
             if websocket in self.active_connections:
                 self.active_connections.remove(websocket)
+            perf.drop_client(client_id(websocket))
             logger.info(
                 f"WebSocket连接已断开，当前连接数: {len(self.active_connections)}"
             )
@@ -45,7 +132,8 @@ class ConnectionManager:
         try:
             # 检查连接是否仍然活跃
             if websocket.client_state.name == "CONNECTED":
-                await websocket.send_text(message)
+                with perf.timer("ws.send", client=client_id(websocket)):
+                    await websocket.send_text(message)
             else:
                 logger.warning("尝试向已断开的连接发送消息")
                 self.disconnect(websocket)
@@ -62,7 +150,8 @@ class ConnectionManager:
             try:
                 # 检查连接是否仍然活跃
                 if connection.client_state.name == "CONNECTED":
-                    await connection.send_text(message)
+                    with perf.timer("ws.send", client=client_id(connection)):
+                        await connection.send_text(message)
                 else:
                     logger.warning("尝试向已断开的连接广播消息")
                     disconnected.append(connection)
@@ -85,6 +174,9 @@ manager = ConnectionManager()
 async def get_system_info():
     """获取系统基本信息"""
     try:
+        snapshot = snapshot_response("system")
+        if snapshot is not None:
+            return snapshot
         system_info = monitor_service.get_system_info()
         return {"success": True, "data": system_info.model_dump()}
     except Exception as e:
@@ -95,11 +187,26 @@ async def get_system_info():
 
 
 @router.get("/cpu", response_model=dict)
-async def get_cpu_info():
-    """获取CPU信息"""
+async def get_cpu_info(group_by: Literal["node"] | None = None):
+    """获取CPU信息，group_by=node 时额外返回按 NUMA 节点分组的每核使用率"""
     try:
-        cpu_info = monitor_service.get_cpu_info()
-        return {"success": True, "data": cpu_info.model_dump()}
+        if group_by is None:
+            snapshot = snapshot_response("cpu")
+            if snapshot is not None:
+                return snapshot
+            return {
+                "success": True,
+                "data": monitor_service.get_cpu_info().model_dump(),
+            }
+
+        # 多 worker 模式下使用共享快照中的每核数据，拓扑由本进程缓存
+        if isinstance(sampler, SharedSampler) and sampler.fresh:
+            data = json.loads(sampler.encoded()["cpu"])
+        else:
+            data = monitor_service.get_cpu_info().model_dump()
+        groups = monitor_service.numa_collector.group_cores(data["cores"])
+        data["coreGroups"] = [g.model_dump() for g in groups]
+        return {"success": True, "data": data}
     except Exception as e:
         logger.error(f"获取CPU信息失败: {e}")
         return JSONResponse(
@@ -111,6 +218,9 @@ async def get_cpu_info():
 async def get_memory_info():
     """获取内存信息"""
     try:
+        snapshot = snapshot_response("memory")
+        if snapshot is not None:
+            return snapshot
         memory_info = monitor_service.get_memory_info()
         return {"success": True, "data": memory_info.model_dump()}
     except Exception as e:
@@ -120,10 +230,26 @@ async def get_memory_info():
         )
 
 
+@router.get("/numa", response_model=dict)
+async def get_numa_info():
+    """获取每个 NUMA 节点的内存使用、跨节点分配速率和 CPU 拓扑"""
+    try:
+        numa_info = monitor_service.get_numa_info()
+        return {"success": True, "data": numa_info.model_dump()}
+    except Exception as e:
+        logger.error(f"获取NUMA信息失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
 @router.get("/disk", response_model=dict)
 async def get_disk_info():
     """获取磁盘信息"""
     try:
+        snapshot = snapshot_response("disk")
+        if snapshot is not None:
+            return snapshot
         disk_info = monitor_service.get_disk_info()
         return {"success": True, "data": disk_info.model_dump()}
     except Exception as e:
@@ -146,11 +272,79 @@ async def get_network_info():
         )
 
 
+@router.get("/network/interfaces", response_model=dict)
+async def get_network_interfaces(
+    name: str | None = None, up: bool = False, physical: bool = False
+):
+    """获取所有网络接口及其吞吐、包速率和错误/丢包速率"""
+    try:
+        interfaces = monitor_service.get_network_interfaces(
+            name=name, up_only=up, physical_only=physical
+        )
+        return {"success": True, "data": [i.model_dump() for i in interfaces]}
+    except Exception as e:
+        logger.error(f"获取网络接口信息失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get("/network/stack", response_model=dict)
+async def get_network_stack():
+    """获取内核网络协议栈计数：重传、监听队列溢出、RST、UDP错误和socket内存"""
+    try:
+        stack = monitor_service.get_network_stack()
+        if stack is None:
+            raise RuntimeError("无法读取 /proc/net/snmp、netstat 或 sockstat")
+        return {"success": True, "data": stack.model_dump()}
+    except Exception as e:
+        logger.error(f"获取网络协议栈计数失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get("/interrupts", response_model=dict)
+async def get_interrupts_info(limit: int = Query(10, ge=1, le=200)):
+    """获取每个 CPU 的硬中断、软中断速率和最热的中断/CPU 组合"""
+    try:
+        interrupts = monitor_service.get_interrupts_info(limit=limit)
+        return {"success": True, "data": interrupts.model_dump()}
+    except Exception as e:
+        logger.error(f"获取中断分布失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get("/network/talkers", response_model=dict)
+async def get_top_talkers(
+    k: int = Query(20, ge=1, le=500),
+    state: list[TcpState] | None = Query(None),
+    group_by: Literal["endpoint", "ip"] = "endpoint",
+):
+    """获取按远端地址聚合的Top-K连接"""
+    try:
+        talkers = monitor_service.get_top_talkers(k=k, states=state, group_by=group_by)
+        return {"success": True, "data": talkers.model_dump()}
+    except Exception as e:
+        logger.error(f"获取连接聚合信息失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
 @router.get("/processes", response_model=dict)
-async def get_processes_info():
-    """获取进程信息"""
+async def get_processes_info(
+    limit: int = Query(30, ge=1, le=1000),
+    sort: Literal["cpu", "memory"] = "cpu",
+    pid: list[int] | None = Query(None),
+):
+    """获取Top-N进程信息，可通过 pid 参数额外请求指定进程的详细信息"""
     try:
-        processes_info = monitor_service.get_processes_info()
+        processes_info = monitor_service.get_processes_info(
+            limit=limit, sort=sort, pids=pid
+        )
         return {"success": True, "data": [p.model_dump() for p in processes_info]}
     except Exception as e:
         logger.error(f"获取进程信息失败: {e}")
@@ -159,6 +353,247 @@ async def get_processes_info():
         )
 
 
+@router.get("/processes/search", response_model=dict)
+async def search_processes(
+    name: str | None = None,
+    regex: bool = False,
+    user: str | None = None,
+    state: list[ProcessState] | None = Query(None),
+    min_cpu: float | None = Query(None, ge=0),
+    min_memory: float | None = Query(None, ge=0, le=100),
+    sort: Literal["cpu", "memory", "pid", "name"] = "cpu",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """按名称（子串或正则）、用户、状态和CPU/内存阈值搜索进程"""
+    try:
+        result = monitor_service.search_processes(
+            name=name,
+            regex=regex,
+            user=user,
+            states=state,
+            min_cpu=min_cpu,
+            min_memory=min_memory,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+        )
+        return {"success": True, "data": result.model_dump()}
+    except re.error as e:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "error": f"无效的正则表达式: {e}"},
+        )
+    except Exception as e:
+        logger.error(f"搜索进程失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get(
+    "/processes/history",
+    response_model=dict,
+    dependencies=[Depends(register_sample_reader)],
+)
+async def get_processes_history(since: int | None = None):
+    """获取所有正在跟踪的Top进程的CPU/RSS历史序列"""
+    try:
+        series = monitor_service.get_processes_history(since)
+        return {"success": True, "data": [s.model_dump() for s in series]}
+    except Exception as e:
+        logger.error(f"获取进程历史失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get(
+    "/processes/events",
+    response_model=dict,
+    dependencies=[Depends(register_sample_reader)],
+)
+async def get_process_events(since: int = Query(0, ge=0)):
+    """获取序号大于 since 的进程启动/退出事件"""
+    try:
+        events = monitor_service.get_process_events(since)
+        return {
+            "success": True,
+            "data": {
+                "events": [e.model_dump() for e in events],
+                "lastSeq": monitor_service.process_events_seq,
+            },
+        }
+    except Exception as e:
+        logger.error(f"获取进程事件失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get("/processes/tree", response_model=dict)
+async def get_process_tree(
+    root: int | None = None, depth: int | None = Query(None, ge=0)
+):
+    """获取进程树及每个子树的CPU和内存汇总"""
+    try:
+        tree = monitor_service.get_process_tree(root=root, depth=depth)
+        # 直接返回编码好的 JSON，很深的进程链不受响应序列化的嵌套深度限制
+        data = ",".join(node.to_json() for node in tree)
+        return Response(
+            content=f'{{"success": true, "data": [{data}]}}',
+            media_type="application/json",
+        )
+    except Exception as e:
+        logger.error(f"获取进程树失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get("/processes/{pid}", response_model=dict)
+async def get_process_detail(pid: int):
+    """获取单个进程的详细信息"""
+    try:
+        process_info = monitor_service.get_process_detail(pid)
+        if process_info is None:
+            return JSONResponse(
+                status_code=404,
+                content={"success": False, "error": f"进程 {pid} 不存在"},
+            )
+        return {"success": True, "data": process_info.model_dump()}
+    except Exception as e:
+        logger.error(f"获取进程 {pid} 详细信息失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get(
+    "/processes/{pid}/history",
+    response_model=dict,
+    dependencies=[Depends(register_sample_reader)],
+)
+async def get_process_history(pid: int, since: int | None = None):
+    """获取单个进程的CPU/RSS历史序列"""
+    try:
+        series = monitor_service.get_process_history(pid, since)
+        if series is None:
+            return JSONResponse(
+                status_code=404,
+                content={"success": False, "error": f"进程 {pid} 不存在"},
+            )
+        return {"success": True, "data": series.model_dump()}
+    except Exception as e:
+        logger.error(f"获取进程 {pid} 历史失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.post("/processes/{pid}/pin", response_model=dict)
+async def pin_process(pid: int):
+    """固定进程，使其即使不在Top-K中也持续记录历史"""
+    try:
+        found = monitor_service.pin_process(pid)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=409, content={"success": False, "error": str(e)}
+        )
+    if not found:
+        return JSONResponse(
+            status_code=404,
+            content={"success": False, "error": f"进程 {pid} 不存在"},
+        )
+    return {"success": True, "data": {"pid": pid, "pinned": True}}
+
+
+@router.delete("/processes/{pid}/pin", response_model=dict)
+async def unpin_process(pid: int):
+    """取消固定进程"""
+    monitor_service.pin_process(pid, pinned=False)
+    return {"success": True, "data": {"pid": pid, "pinned": False}}
+
+
+@router.get("/containers", response_model=dict)
+async def get_containers_info(
+    sort: Literal["cpu", "memory"] = "cpu", limit: int = Query(10, ge=1, le=500)
+):
+    """获取按CPU或内存排序的Top-N容器资源使用"""
+    try:
+        containers_info = monitor_service.get_containers_info(sort=sort, limit=limit)
+        return {"success": True, "data": containers_info.model_dump()}
+    except Exception as e:
+        logger.error(f"获取容器信息失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get(
+    "/history", response_model=dict, dependencies=[Depends(register_sample_reader)]
+)
+async def get_history(
+    since: int | None = None, limit: int | None = None, threshold: float | None = None
+):
+    """获取指标历史及异常标注"""
+    try:
+        history = monitor_service.get_history(
+            since=since, limit=limit, threshold=threshold
+        )
+        return {"success": True, "data": history.model_dump()}
+    except Exception as e:
+        logger.error(f"获取历史数据失败: {e}")
+        return JSONResponse(
+            status_code=500, content={"success": False, "error": str(e)}
+        )
+
+
+@router.get("/history/export")
+async def export_history_data(
+    format: Literal["csv", "ndjson", "arrow"] = "csv",
+    since: int | None = Query(None, description="起始时间（毫秒时间戳）"),
+    until: int | None = Query(None, description="结束时间（毫秒时间戳）"),
+    series: list[str] | None = Query(None, description="导出的指标，默认全部"),
+    chunk_size: int = Query(1000, ge=1, le=100000),
+):
+    """分块流式导出指标历史，内存占用与导出的时间范围无关"""
+    selected = series or list(HISTORY_SERIES)
+    unknown = [name for name in selected if name not in HISTORY_SERIES]
+    if unknown:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": f"未知的指标: {', '.join(unknown)}，"
+                f"可选: {', '.join(HISTORY_SERIES)}",
+            },
+        )
+    if format == "arrow" and not arrow_available():
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "error": "Arrow 格式需要安装 pyarrow"},
+        )
+
+    chunks = monitor_service.history.iter_chunks(
+        since=since, until=until, chunk_size=chunk_size
+    )
+
+    async def stream():
+        # 在事件循环上逐块生成，与采样器追加历史不会并发
+        for part in export_history(chunks, format, selected):
+            yield part
+
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"history-{int(time.time())}.{extension}"
+    logger.info(f"导出指标历史: 格式 {format}，指标 {', '.join(selected)}")
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 # 已废弃 - 不再提供 /all 接口，请使用具体的模块接口
 # @router.get("/all", response_model=dict)
 # async def get_all_monitor_data():
@@ -174,13 +609,31 @@ async def get_processes_info():
 #         )
 
 
+# monitor_data 消息包含的模块
+MONITOR_TOPICS = ("system", "cpu", "memory", "disk", "network", "processes")
+
+
+def monitor_payload(encoded: dict[str, str], topics) -> str:
+    """用已编码的主题 JSON 拼出 monitor_data 的数据部分，不重新序列化"""
+    fields = "".join(f'"{t}": {encoded[t]}, ' for t in topics)
+    return f'{{{fields}"timestamp": {int(time.time() * 1000)}}}'
+
+
+def monitor_message(encoded: dict[str, str], topics) -> str:
+    return f'{{"type": "monitor_data", "data": {monitor_payload(encoded, topics)}}}'
+
+
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket端点，实时推送监控数据"""
     logger.info("WebSocket连接请求到达")
+    subscribed = False
     try:
         await manager.connect(websocket)
         logger.info("WebSocket连接已接受")
+        sampler.subscribe()
+        subscribed = True
+        sample_seq = 0
 
         # 发送初始数据
         try:
@@ -210,11 +663,12 @@ async def websocket_endpoint(websocket: WebSocket):
 
             try:
                 logger.info("开始获取完整监控数据...")
-                complete_data = monitor_service.get_all_monitor_data()
-                logger.info("完整监控数据获取完成")
-                message = json.dumps(
-                    {"type": "monitor_data", "data": complete_data.model_dump()}
+                # 已有采样结果时直接使用最近一次，否则等待第一次采样
+                sample_seq, encoded = await sampler.next_encoded(
+                    max(0, sampler.seq - 1)
                 )
+                logger.info("完整监控数据获取完成")
+                message = monitor_message(encoded, MONITOR_TOPICS)
                 logger.info("准备发送完整数据...")
                 await manager.send_personal_message(message, websocket)
                 logger.info("完整数据发送成功")
@@ -223,35 +677,42 @@ async def websocket_endpoint(websocket: WebSocket):
         except Exception as e:
             logger.error(f"发送初始数据失败: {str(e)}", exc_info=True)
 
-        update_interval = 3
+        # 只推送连接建立之后发生的进程事件
+        last_event_seq = monitor_service.process_events_seq
 
         while True:
             try:
-                await asyncio.sleep(update_interval)
+                # 等待共享采样器的下一次采样
+                sample_seq, encoded = await sampler.next_encoded(sample_seq)
 
                 if websocket.client_state.name != "CONNECTED":
                     logger.info("客户端已断开连接，停止发送数据")
                     break
 
-                current_timestamp = int(time.time() * 1000)
-
-                complete_data = monitor_service.get_all_monitor_data()
-                complete_data_dict = {
-                    "type": "monitor_data",
-                    "data": {
-                        "system": complete_data.system.model_dump(),
-                        "cpu": complete_data.cpu.model_dump(),
-                        "memory": complete_data.memory.model_dump(),
-                        "disk": complete_data.disk.model_dump(),
-                        "network": complete_data.network.model_dump(),
-                        "processes": [p.model_dump() for p in complete_data.processes],
-                        "timestamp": current_timestamp,
-                    },
-                }
-
-                await manager.send_personal_message(
-                    json.dumps(complete_data_dict), websocket
-                )
+                with perf.timer("ws.encode"):
+                    message = monitor_message(encoded, MONITOR_TOPICS)
+                await manager.send_personal_message(message, websocket)
+
+                # 推送本次采样检测出的异常事件
+                if encoded["anomalies"] != "[]":
+                    await manager.send_personal_message(
+                        f'{{"type": "anomaly", "data": {encoded["anomalies"]}}}',
+                        websocket,
+                    )
+
+                # 推送进程 exec/exit 事件
+                process_events = monitor_service.get_process_events(last_event_seq)
+                if process_events:
+                    last_event_seq = process_events[-1].seq
+                    await manager.send_personal_message(
+                        json.dumps(
+                            {
+                                "type": "process_events",
+                                "data": [e.model_dump() for e in process_events],
+                            }
+                        ),
+                        websocket,
+                    )
 
             except WebSocketDisconnect:
                 logger.info("WebSocket客户端断开连接")
@@ -264,12 +725,122 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket连接异常: {e}", exc_info=True)
     finally:
+        if subscribed:
+            sampler.unsubscribe()
         try:
             manager.disconnect(websocket)
         except Exception as e:
             logger.error(f"断开连接失败: {e}")
 
 
+# SSE 可订阅的主题，除 MONITOR_TOPICS 外还有异常和进程事件
+STREAM_TOPICS = (*MONITOR_TOPICS, "anomalies", "process_events")
+# 没有新采样时发送注释行的间隔（秒），防止代理因读超时断开连接
+STREAM_HEARTBEAT = 15.0
+
+
+def parse_event_id(event_id: str | None) -> tuple[int, int]:
+    """解析 Last-Event-ID（"采样序号-进程事件序号"），无法解析时从头开始"""
+    try:
+        sample_seq, _, event_seq = (event_id or "").partition("-")
+        return max(0, int(sample_seq)), max(0, int(event_seq or 0))
+    except ValueError:
+        return 0, 0
+
+
+async def event_stream(topics: set[str], last_event_id: str | None = None):
+    """SSE 事件流：每次共享采样器出新结果时推送订阅的主题
+
+    事件 id 为 "采样序号-进程事件序号"。客户端带 Last-Event-ID 重连时，
+    已经收到的采样不会重复推送，断线期间的进程事件从该序号之后补发。
+    """
+    sample_seq, event_seq = parse_event_id(last_event_id)
+    if not last_event_id:
+        # 新连接立即推送最近一次采样，进程事件只推送连接之后发生的
+        sample_seq = max(0, sampler.seq - 1)
+        event_seq = monitor_service.process_events_seq
+    else:
+        # 序号比当前还大说明后端重启过，序号已经从头开始
+        if sample_seq > sampler.seq:
+            sample_seq = max(0, sampler.seq - 1)
+        if event_seq > monitor_service.process_events_seq:
+            event_seq = 0
+    sampler.subscribe()
+    try:
+        yield f"retry: {int(sampler.interval * 1000)}\n\n"
+        while True:
+            try:
+                sample_seq, encoded = await asyncio.wait_for(
+                    sampler.next_encoded(sample_seq), STREAM_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            modules = [t for t in MONITOR_TOPICS if t in topics]
+            events = []
+            if "process_events" in topics:
+                events = monitor_service.get_process_events(event_seq)
+                if events:
+                    event_seq = events[-1].seq
+            event_id = f"{sample_seq}-{event_seq}"
+
+            chunks = []
+            if modules:
+                chunks.append(
+                    f"id: {event_id}\nevent: monitor_data\n"
+                    f"data: {monitor_payload(encoded, modules)}\n\n"
+                )
+            if "anomalies" in topics and encoded["anomalies"] != "[]":
+                chunks.append(
+                    f"id: {event_id}\nevent: anomaly\ndata: {encoded['anomalies']}\n\n"
+                )
+            if "process_events" in topics and events:
+                payload = EVENT_LIST.dump_json(events).decode()
+                chunks.append(
+                    f"id: {event_id}\nevent: process_events\ndata: {payload}\n\n"
+                )
+            if chunks:
+                yield "".join(chunks)
+    finally:
+        sampler.unsubscribe()
+
+
+@router.get("/stream")
+async def stream_monitor_data(
+    topics: str | None = Query(
+        None, description="逗号分隔的主题列表，默认订阅全部主题"
+    ),
+    last_event_id: str | None = Header(None),
+):
+    """Server-Sent Events 端点，WebSocket 不可用时的推送通道"""
+    selected = (
+        {t.strip() for t in topics.split(",") if t.strip()}
+        if topics
+        else set(STREAM_TOPICS)
+    )
+    unknown = selected - set(STREAM_TOPICS)
+    if unknown or not selected:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": f"未知的主题: {', '.join(sorted(unknown))}，"
+                f"可选: {', '.join(STREAM_TOPICS)}",
+            },
+        )
+    logger.info(f"SSE连接已建立，订阅主题: {', '.join(sorted(selected))}")
+    return StreamingResponse(
+        event_stream(selected, last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # 关闭 nginx 的响应缓冲，事件才能立即到达浏览器
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 # 后台任务：定期广播监控数据给所有连接的客户端
 async def broadcast_monitor_data():
     """后台任务：定期广播监控数据"""
@@ -277,8 +848,9 @@ async def broadcast_monitor_data():
         try:
             if manager.active_connections:
                 monitor_data = monitor_service.get_all_monitor_data()
-                message = json.dumps(
-                    {"type": "broadcast_data", "data": monitor_data.model_dump()}
+                message = (
+                    '{"type": "broadcast_data", "data": '
+                    f"{monitor_data.model_dump_json()}}}"
                 )
                 await manager.broadcast(message)
 
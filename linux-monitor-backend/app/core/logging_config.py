@@ -1,7 +1,18 @@
+import atexit
 import logging.config
 import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+
 import yaml
 
+# 后台日志线程，由 enable_queue_logging 启动
+_listener: QueueListener | None = None
+
+# 热点路径日志记录器名称的后缀，限频只作用于这些日志记录器
+HOT_PATH_SUFFIX = ".hot"
+
 
 def setup_logging(
     default_level=logging.INFO, config_path="config/logging.yaml", env_key="LOG_CONFIG"
@@ -13,18 +24,22 @@ def setup_logging(
         default_level: 默认日志级别
         config_path: 配置文件路径
         env_key: 环境变量名，用于指定配置文件路径
+
+    环境变量 LOG_ASYNC=0 时保持同步写日志；LOG_RATE_LIMIT 为热点路径日志
+    同一调用位置的最小输出间隔（秒），默认 0 表示不限制。
     """
     # 从环境变量获取配置文件路径
     path = os.getenv(env_key, config_path)
 
     # 如果配置文件存在，使用配置文件
+    configured = False
     if os.path.exists(path):
         with open(path, "rt") as f:
             try:
                 config = yaml.safe_load(f.read())
                 logging.config.dictConfig(config)
                 print(f"已加载日志配置文件: {path}")
-                return
+                configured = True
             except Exception as e:
                 print(f"加载日志配置文件失败: {e}")
                 print("使用默认日志配置")
@@ -32,15 +47,151 @@ def setup_logging(
         print(f"日志配置文件不存在: {path}")
         print("使用默认日志配置")
 
-    # 使用默认配置
-    logging.basicConfig(
-        level=default_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(),  # 控制台输出
-            logging.FileHandler("backend.log"),  # 文件输出
-        ],
-    )
+    if not configured:
+        # 使用默认配置
+        logging.basicConfig(
+            level=default_level,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            handlers=[
+                logging.StreamHandler(),  # 控制台输出
+                logging.FileHandler("backend.log"),  # 文件输出
+            ],
+        )
+
+    if os.getenv("LOG_ASYNC", "1").lower() not in ("0", "false", "no"):
+        enable_queue_logging(rate_limit=float(os.getenv("LOG_RATE_LIMIT", "0")))
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    限制热点路径日志的输出频率
+
+    同一调用位置（文件和行号）的 INFO 及以下日志在 interval 秒内只输出一次，
+    下一次输出时附带被抑制的条数。只作用于 get_hot_path_logger 返回的
+    热点路径日志记录器，其他日志和 WARNING 及以上级别始终输出。
+    """
+
+    def __init__(self, interval: float = 60.0):
+        super().__init__()
+        self.interval = interval
+        self._state: dict[tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not record.name.endswith(HOT_PATH_SUFFIX):
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        state = self._state.get(key)
+        if state is not None and now - state[0] < self.interval:
+            state[1] += 1
+            return False
+        self._state[key] = [now, 0]
+        if state is not None and state[1]:
+            record.msg = (
+                f"{record.getMessage()}"
+                f"（此前 {self.interval:g} 秒内另有 {state[1]} 条相同日志被抑制）"
+            )
+            record.args = None
+        return True
+
+
+class _RoutingQueueHandler(QueueHandler):
+    """把日志记录连同原日志记录器的处理器一起放入队列"""
+
+    def __init__(self, log_queue, targets: tuple[logging.Handler, ...]):
+        super().__init__(log_queue)
+        self.targets = targets
+
+    def enqueue(self, record: logging.LogRecord):
+        record.target_handlers = self.targets
+        self.queue.put_nowait(record)
+
+
+class _RoutingQueueListener(QueueListener):
+    """在后台线程中把日志记录交给其原日志记录器配置的处理器"""
+
+    def __init__(self, log_queue, *handlers: logging.Handler):
+        super().__init__(log_queue, *handlers)
+        # (日志记录器, 队列处理器)，停止时用于恢复原处理器
+        self.installed: list[tuple[logging.Logger, _RoutingQueueHandler]] = []
+
+    def handle(self, record: logging.LogRecord):
+        record = self.prepare(record)
+        for handler in getattr(record, "target_handlers", self.handlers):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def install_queue_handlers(
+    loggers: list[logging.Logger], rate_limit: float = 0.0
+) -> QueueListener:
+    """
+    把日志记录器上的处理器替换为队列处理器并返回已启动的后台监听器
+
+    每个日志记录器原有的处理器集合和级别保持不变，只是控制台和文件写入
+    移到了单个后台线程中，事件循环中的日志调用只需入队。
+
+    参数:
+        loggers: 需要改为异步输出的日志记录器
+        rate_limit: 热点路径日志同一调用位置的最小输出间隔（秒），0 表示不限制
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    rate_filter = RateLimitFilter(rate_limit) if rate_limit > 0 else None
+    targets: dict[int, logging.Handler] = {}
+    installed = []
+    for logger in loggers:
+        handlers = [h for h in logger.handlers if not isinstance(h, QueueHandler)]
+        if not handlers:
+            continue
+        queue_handler = _RoutingQueueHandler(log_queue, tuple(handlers))
+        if rate_filter is not None:
+            queue_handler.addFilter(rate_filter)
+        for handler in handlers:
+            logger.removeHandler(handler)
+            targets[id(handler)] = handler
+        logger.addHandler(queue_handler)
+        installed.append((logger, queue_handler))
+
+    listener = _RoutingQueueListener(log_queue, *targets.values())
+    listener.installed = installed
+    listener.start()
+    return listener
+
+
+def uninstall_queue_handlers(listener: QueueListener):
+    """停止后台监听器，输出队列中剩余的日志并恢复原处理器"""
+    listener.stop()
+    for logger, queue_handler in getattr(listener, "installed", []):
+        # 重新加载配置（dictConfig）时队列处理器可能已被替换
+        if queue_handler in logger.handlers:
+            logger.removeHandler(queue_handler)
+            for handler in queue_handler.targets:
+                logger.addHandler(handler)
+
+
+def enable_queue_logging(rate_limit: float = 0.0):
+    """把所有已配置的日志记录器改为经由队列异步输出"""
+    global _listener
+    stop_queue_logging()
+    manager = logging.Logger.manager
+    loggers = [logging.getLogger()] + [
+        logger
+        for logger in list(manager.loggerDict.values())
+        if isinstance(logger, logging.Logger)
+    ]
+    _listener = install_queue_handlers(loggers, rate_limit=rate_limit)
+
+
+def stop_queue_logging():
+    """停止后台日志线程并恢复同步输出"""
+    global _listener
+    if _listener is not None:
+        uninstall_queue_handlers(_listener)
+        _listener = None
+
+
+# 进程退出前输出队列中剩余的日志
+atexit.register(stop_queue_logging)
 
 
 def get_logger(name):
@@ -54,3 +205,19 @@ def get_logger(name):
         Logger: 日志记录器
     """
     return logging.getLogger(name)
+
+
+def get_hot_path_logger(name):
+    """
+    获取每个采样周期都会输出的热点路径日志记录器
+
+    返回 name 的子日志记录器，沿用父日志记录器的级别和处理器；
+    设置 LOG_RATE_LIMIT 后这些日志按调用位置限频。
+
+    参数:
+        name: 所属模块的日志记录器名称
+
+    返回:
+        Logger: 日志记录器
+    """
+    return logging.getLogger(f"{name}{HOT_PATH_SUFFIX}")
@@ -0,0 +1,197 @@
+import asyncio
+import functools
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# 直方图桶上界（秒）：1µs 到约 100s，每个桶放大 2^(1/4) 倍，分位数相对误差不超过约 19%
+BUCKET_BOUNDS = [1e-6 * 2 ** (i / 4) for i in range(107)]
+
+
+class Histogram:
+    """固定对数分桶的耗时直方图，记录一次只需一次二分查找和几次加法"""
+
+    __slots__ = ("counts", "count", "total", "max", "errors", "fallbacks")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.fallbacks = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """返回分位数 q（0~1）所在桶的上界，超出最大桶时返回最大值"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return (
+                    min(BUCKET_BOUNDS[i], self.max)
+                    if i < len(BUCKET_BOUNDS)
+                    else self.max
+                )
+        return self.max
+
+    def summary(self) -> dict:
+        """毫秒单位的统计摘要"""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "fallbacks": self.fallbacks,
+            "mean": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50": round(self.percentile(0.50) * 1000, 3),
+            "p95": round(self.percentile(0.95) * 1000, 3),
+            "p99": round(self.percentile(0.99) * 1000, 3),
+            "max": round(self.max * 1000, 3),
+        }
+
+
+class PerfRegistry:
+    """采集器各阶段、编码、事件循环延迟和每个客户端发送延迟的耗时统计"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._stages: dict[str, Histogram] = {}
+        self._clients: dict[str, Histogram] = {}
+
+    def _stage(self, stage: str) -> Histogram:
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            histogram = self._stages[stage] = Histogram()
+        return histogram
+
+    def record(self, stage: str, seconds: float):
+        self._stage(stage).observe(seconds)
+
+    def error(self, stage: str):
+        """记录一次采集失败"""
+        self._stage(stage).errors += 1
+
+    def fallback(self, stage: str):
+        """记录一次使用缓存数据的降级"""
+        self._stage(stage).fallbacks += 1
+
+    @contextmanager
+    def timer(self, stage: str, client: str | None = None):
+        """统计代码块耗时，抛出异常时同时计入错误数
+
+        指定 client 时耗时同时计入该客户端自己的直方图。
+        """
+        histograms = [self._stage(stage)]
+        if client is not None:
+            histograms.append(self._client(client))
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            for histogram in histograms:
+                histogram.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            for histogram in histograms:
+                histogram.observe(elapsed)
+
+    def timed(self, stage: str):
+        """方法装饰器，统计每次调用的耗时"""
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _client(self, client: str) -> Histogram:
+        histogram = self._clients.get(client)
+        if histogram is None:
+            histogram = self._clients[client] = Histogram()
+        return histogram
+
+    def drop_client(self, client: str):
+        self._clients.pop(client, None)
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime": int(time.time() - self.started),
+            "stages": {
+                name: histogram.summary()
+                for name, histogram in sorted(self._stages.items())
+            },
+            "clients": {
+                name: histogram.summary()
+                for name, histogram in sorted(self._clients.items())
+            },
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus 文本格式的指标输出"""
+        lines = [
+            "# HELP linux_monitor_stage_seconds 采集、编码和事件循环延迟等阶段耗时",
+            "# TYPE linux_monitor_stage_seconds summary",
+        ]
+        for name, histogram in sorted(self._stages.items()):
+            lines.extend(
+                _summary_lines("linux_monitor_stage_seconds", "stage", name, histogram)
+            )
+        lines.append("# TYPE linux_monitor_stage_errors_total counter")
+        for name, histogram in sorted(self._stages.items()):
+            lines.append(
+                f'linux_monitor_stage_errors_total{{stage="{name}"}} {histogram.errors}'
+            )
+        lines.append("# TYPE linux_monitor_stage_fallbacks_total counter")
+        for name, histogram in sorted(self._stages.items()):
+            lines.append(
+                f'linux_monitor_stage_fallbacks_total{{stage="{name}"}} {histogram.fallbacks}'
+            )
+        lines.append(
+            "# HELP linux_monitor_ws_send_seconds 每个 WebSocket 客户端的发送耗时"
+        )
+        lines.append("# TYPE linux_monitor_ws_send_seconds summary")
+        for name, histogram in sorted(self._clients.items()):
+            lines.extend(
+                _summary_lines(
+                    "linux_monitor_ws_send_seconds", "client", name, histogram
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _summary_lines(
+    metric: str, label: str, value: str, histogram: Histogram
+) -> list[str]:
+    lines = [
+        f'{metric}{{{label}="{value}",quantile="{q}"}} {histogram.percentile(q):.6f}'
+        for q in (0.5, 0.95, 0.99)
+    ]
+    lines.append(f'{metric}_sum{{{label}="{value}"}} {histogram.total:.6f}')
+    lines.append(f'{metric}_count{{{label}="{value}"}} {histogram.count}')
+    return lines
+
+
+async def monitor_event_loop_lag(registry: "PerfRegistry", interval: float = 0.5):
+    """后台任务：测量事件循环的调度延迟（实际唤醒时间与预期的差值）"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        registry.record("event_loop.lag", max(0.0, loop.time() - expected))
+
+
+# 全局性能统计
+perf = PerfRegistry()
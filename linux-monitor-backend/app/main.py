@@ -5,8 +5,11 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .api.debug import router as debug_router
 from .api.monitor import router as monitor_router
+from .api.monitor import sampler
 from .core.logging_config import get_logger, setup_logging
+from .core.perf import monitor_event_loop_lag, perf
 
 # 设置日志配置
 setup_logging()
@@ -31,8 +34,14 @@ async def lifespan(app: FastAPI):
     logger.info("Linux系统监控API服务启动")
     logger.info("API文档地址: http://localhost:8002/docs")
     logger.info("WebSocket端点: ws://localhost:8002/api/monitor/ws")
+    # 共享采样器在有订阅者或轮询请求时才采集，并负责订阅 proc connector
+    sampler.ensure_started()
+    # 测量事件循环调度延迟
+    lag_task = asyncio.create_task(monitor_event_loop_lag(perf))
     yield
     # 关闭事件
+    lag_task.cancel()
+    await sampler.stop()
     logger.info("Linux系统监控API服务关闭")
 
 
@@ -57,6 +66,7 @@ app.add_middleware(
 
 # 注册路由
 app.include_router(monitor_router, prefix="/api/monitor", tags=["监控"])
+app.include_router(debug_router, tags=["调试"])
 
 
 @app.get("/")
@@ -9,12 +9,99 @@ class SystemInfo(BaseModel):
     timestamp: int
 
 
+class TemperatureReading(BaseModel):
+    label: str
+    source: str
+    kind: str
+    value: float
+
+
 class CpuInfo(BaseModel):
     usage: float
     cores: list[float]
     frequency: float
     temperature: float | None = None
     timestamp: int
+    modes: dict[str, float] = {}
+    coreModes: dict[str, list[float]] = {}
+    temperatures: list[TemperatureReading] = []
+    # 每个核心所属的 NUMA 节点，与 cores 顺序相同
+    coreNodes: list[int] = []
+
+
+class CpuTopology(BaseModel):
+    cpu: int
+    node: int
+    socket: int
+    core: int
+    # 同一物理核心上的 SMT 线程（包含自身）
+    siblings: list[int]
+
+
+class CoreGroup(BaseModel):
+    node: int
+    cpus: list[int]
+    cores: list[float]
+    # 节点内核心的平均使用率
+    usage: float
+
+
+class IrqHotspot(BaseModel):
+    irq: str
+    kind: str  # hardirq / softirq
+    description: str | None = None
+    cpu: int
+    rate: float
+    # 该 CPU 占这一中断全部 CPU 速率的百分比
+    share: float
+
+
+class InterruptsInfo(BaseModel):
+    # 表头中的 CPU 编号，下面每个列表按此顺序排列
+    cpus: list[int]
+    hardirqRates: list[float]
+    softirqRates: dict[str, list[float]]
+    hotspots: list[IrqHotspot]
+    timestamp: int
+
+
+class PressureStall(BaseModel):
+    avg10: float
+    avg60: float
+    avg300: float
+    total: int
+
+
+class PressureInfo(BaseModel):
+    some: PressureStall
+    full: PressureStall | None = None
+
+
+class NumaNode(BaseModel):
+    node: int
+    cpus: list[int]
+    memTotal: int
+    memFree: int
+    memUsed: int
+    percent: float
+    filePages: int = 0
+    anonPages: int = 0
+    hugepagesTotal: int = 0
+    hugepagesFree: int = 0
+    # 每秒分配的页数，来自 node*/numastat
+    numaHit: float = 0.0
+    numaMiss: float = 0.0
+    numaForeign: float = 0.0
+    localNode: float = 0.0
+    otherNode: float = 0.0
+    # 本节点上运行的进程从其他节点分配的页占比
+    remotePercent: float = 0.0
+
+
+class NumaInfo(BaseModel):
+    nodes: list[NumaNode]
+    topology: list[CpuTopology]
+    timestamp: int
 
 
 class MemoryInfo(BaseModel):
@@ -24,6 +111,40 @@ class MemoryInfo(BaseModel):
     percent: float
     swap: dict
     timestamp: int
+    free: int = 0
+    cached: int = 0
+    buffers: int = 0
+    shared: int = 0
+    dirty: int = 0
+    writeback: int = 0
+    slab: int = 0
+    slabReclaimable: int = 0
+    hugepages: dict = {}
+    pressure: dict[str, PressureInfo] = {}
+    numa: list[NumaNode] = []
+
+
+class DiskDevice(BaseModel):
+    name: str
+    readSpeed: float
+    writeSpeed: float
+    readIops: float
+    writeIops: float
+    readBytes: int
+    writeBytes: int
+    awaitMs: float
+    utilization: float
+
+
+class DiskMount(BaseModel):
+    device: str
+    mountpoint: str
+    fstype: str
+    total: int
+    used: int
+    free: int
+    percent: float
+    responsive: bool = True
 
 
 class DiskInfo(BaseModel):
@@ -34,6 +155,8 @@ class DiskInfo(BaseModel):
     readSpeed: float
     writeSpeed: float
     timestamp: int
+    devices: list[DiskDevice] = []
+    mounts: list[DiskMount] = []
 
 
 class NetworkInterface(BaseModel):
@@ -49,6 +172,17 @@ class NetworkInterface(BaseModel):
     packetsSent: int
     errorsReceived: int
     errorsSent: int
+    dropsReceived: int = 0
+    dropsSent: int = 0
+    physical: bool = False
+    receiveRate: float = 0.0
+    sendRate: float = 0.0
+    packetsReceivedRate: float = 0.0
+    packetsSentRate: float = 0.0
+    errorsReceivedRate: float = 0.0
+    errorsSentRate: float = 0.0
+    dropsReceivedRate: float = 0.0
+    dropsSentRate: float = 0.0
 
 
 class NetworkConnections(BaseModel):
@@ -67,6 +201,49 @@ class OpenPort(BaseModel):
     pid: int | None = None
 
 
+class ConnectionAggregate(BaseModel):
+    remoteAddress: str
+    remotePort: int | None = None
+    state: str
+    pid: int | None = None
+    process: str | None = None
+    count: int
+
+
+class TopTalkers(BaseModel):
+    totalSockets: int
+    entries: list[ConnectionAggregate]
+    timestamp: int
+
+
+class NetworkStackInfo(BaseModel):
+    # 每秒速率，来自 /proc/net/snmp 和 /proc/net/netstat
+    tcpOutSegs: float = 0.0
+    tcpRetransSegs: float = 0.0
+    retransmitPercent: float = 0.0
+    tcpInErrs: float = 0.0
+    tcpOutRsts: float = 0.0
+    tcpEstabResets: float = 0.0
+    tcpAttemptFails: float = 0.0
+    tcpTimeouts: float = 0.0
+    listenOverflows: float = 0.0
+    listenDrops: float = 0.0
+    udpInErrors: float = 0.0
+    udpRcvbufErrors: float = 0.0
+    udpSndbufErrors: float = 0.0
+    udpNoPorts: float = 0.0
+    # 当前值，来自 /proc/net/sockstat，内存单位为字节
+    socketsUsed: int = 0
+    tcpInUse: int = 0
+    tcpOrphan: int = 0
+    tcpTimeWait: int = 0
+    tcpAlloc: int = 0
+    tcpMemory: int = 0
+    udpInUse: int = 0
+    udpMemory: int = 0
+    timestamp: int
+
+
 class NetworkInfo(BaseModel):
     uploadSpeed: float
     downloadSpeed: float
@@ -76,6 +253,7 @@ class NetworkInfo(BaseModel):
     interfaces: list[NetworkInterface]
     openPorts: list[OpenPort]
     timestamp: int
+    stack: NetworkStackInfo | None = None
 
 
 class ProcessInfo(BaseModel):
@@ -84,6 +262,100 @@ class ProcessInfo(BaseModel):
     cpuPercent: float
     memoryPercent: float
     status: str
+    ppid: int | None = None
+    rss: int | None = None
+    vms: int | None = None
+    threads: int | None = None
+    startTime: int | None = None
+    # 以下字段只为 Top-N 和显式请求的进程采集
+    fds: int | None = None
+    readBytes: int | None = None
+    writeBytes: int | None = None
+    readRate: float | None = None
+    writeRate: float | None = None
+    cmdline: str | None = None
+    user: str | None = None
+
+
+class ProcessSearchResult(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    processes: list[ProcessInfo]
+    timestamp: int
+
+
+class ProcessHistorySeries(BaseModel):
+    pid: int
+    name: str
+    pinned: bool
+    timestamps: list[int]
+    cpu: list[float]
+    rss: list[int]
+
+
+class ProcessEvent(BaseModel):
+    seq: int
+    kind: str
+    pid: int
+    ppid: int | None = None
+    name: str | None = None
+    cmdline: str | None = None
+    exitCode: int | None = None
+    exitSignal: int | None = None
+    source: str
+    timestamp: int
+
+
+class ProcessTreeNode(BaseModel):
+    pid: int
+    name: str
+    status: str
+    cpuPercent: float
+    memoryPercent: float
+    rss: int
+    subtreeCpuPercent: float
+    subtreeMemoryPercent: float
+    subtreeRss: int
+    subtreeProcesses: int
+    children: list["ProcessTreeNode"] = []
+
+
+class ContainerInfo(BaseModel):
+    id: str
+    path: str
+    runtime: str
+    pod: str | None = None
+    cpuPercent: float
+    cpuThrottledPercent: float
+    nrThrottled: int
+    memoryCurrent: int
+    memoryMax: int | None = None
+    ioReadBytes: int
+    ioWriteBytes: int
+    ioReadRate: float
+    ioWriteRate: float
+    pids: int
+
+
+class ContainersInfo(BaseModel):
+    total: int
+    containers: list[ContainerInfo]
+    timestamp: int
+
+
+class AnomalyAnnotation(BaseModel):
+    timestamp: int
+    series: str
+    value: float
+    baseline: float
+    score: float
+    direction: str
+
+
+class HistoryData(BaseModel):
+    samples: list[dict]
+    annotations: list[AnomalyAnnotation]
 
 
 class MonitorData(BaseModel):
@@ -93,3 +365,4 @@ class MonitorData(BaseModel):
     disk: DiskInfo
     network: NetworkInfo
     processes: list[ProcessInfo]
+    anomalies: list[AnomalyAnnotation] = []
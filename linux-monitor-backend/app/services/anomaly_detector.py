@@ -0,0 +1,164 @@
+import math
+from array import array
+from collections.abc import Sequence
+
+from ..models.monitor import AnomalyAnnotation
+
+# 默认检测的指标序列及其最小标准差（避免平稳序列上的微小波动被放大）
+DEFAULT_SERIES: dict[str, float] = {
+    "cpu": 1.0,  # 百分比
+    "diskRead": 64 * 1024.0,  # 字节/秒
+    "diskWrite": 64 * 1024.0,
+    "netUp": 16 * 1024.0,
+    "netDown": 16 * 1024.0,
+}
+
+
+class EwmaDetector:
+    """单个指标序列的EWMA z-score在线检测器
+
+    只保存均值、方差和样本数，每个序列占用O(1)内存。
+    """
+
+    __slots__ = ("alpha", "min_std", "mean", "var", "count")
+
+    def __init__(self, alpha: float = 0.1, min_std: float = 0.0):
+        self.alpha = alpha
+        self.min_std = min_std
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    @property
+    def std(self) -> float:
+        return max(math.sqrt(self.var), self.min_std)
+
+    def update(self, value: float) -> float:
+        """用新值更新基线，返回该值相对更新前基线的z-score"""
+        if self.count == 0:
+            self.mean = value
+            self.count = 1
+            return 0.0
+
+        diff = value - self.mean
+        std = self.std
+        score = diff / std if std > 0 else 0.0
+
+        # 指数加权的均值与方差增量更新
+        incr = self.alpha * diff
+        self.mean += incr
+        self.var = (1 - self.alpha) * (self.var + diff * incr)
+        self.count += 1
+        return score
+
+    def score_batch(self, values: Sequence[float]) -> tuple[array, array]:
+        """批量打分（用于从历史数据回填），同时推进检测器状态
+
+        返回 (z-score数组, 打分时的基线数组)。EWMA是递推过程，无法完全向量化；
+        这里把状态放在局部变量中，在紧凑的循环里一次处理整段序列，
+        避免逐点的方法调用和对象分配。
+        """
+        scores = array("d", bytes(8 * len(values)))
+        baselines = array("d", values)
+        alpha = self.alpha
+        min_std = self.min_std
+        mean = self.mean
+        var = self.var
+        count = self.count
+
+        for i, value in enumerate(values):
+            if count == 0:
+                mean = value
+                count = 1
+                continue
+            baselines[i] = mean
+            diff = value - mean
+            std = max(math.sqrt(var), min_std)
+            scores[i] = diff / std if std > 0 else 0.0
+            incr = alpha * diff
+            mean += incr
+            var = (1 - alpha) * (var + diff * incr)
+            count += 1
+
+        self.mean = mean
+        self.var = var
+        self.count = count
+        return scores, baselines
+
+
+class AnomalyDetector:
+    """对CPU、磁盘速率和网络速率序列进行流式异常检测"""
+
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        threshold: float = 4.0,
+        warmup: int = 20,
+        series: dict[str, float] | None = None,
+    ):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.series = dict(series or DEFAULT_SERIES)
+        self._detectors = {
+            name: EwmaDetector(alpha, min_std) for name, min_std in self.series.items()
+        }
+
+    def _annotate(
+        self,
+        name: str,
+        timestamp: int,
+        value: float,
+        baseline: float,
+        score: float,
+        count: int,
+    ) -> AnomalyAnnotation | None:
+        # 预热阶段基线尚不稳定，不产生告警
+        if count <= self.warmup or abs(score) < self.threshold:
+            return None
+        return AnomalyAnnotation(
+            timestamp=timestamp,
+            series=name,
+            value=value,
+            baseline=round(baseline, 2),
+            score=round(score, 2),
+            direction="high" if score > 0 else "low",
+        )
+
+    def observe(self, sample: dict) -> list[AnomalyAnnotation]:
+        """处理一个采样点，返回本次检测出的异常"""
+        timestamp = sample["timestamp"]
+        annotations = []
+        for name, detector in self._detectors.items():
+            value = sample.get(name)
+            if value is None:
+                continue
+            baseline = detector.mean
+            score = detector.update(float(value))
+            annotation = self._annotate(
+                name, timestamp, value, baseline, score, detector.count
+            )
+            if annotation:
+                annotations.append(annotation)
+        return annotations
+
+    def backfill(self, samples: Sequence[dict]) -> list[AnomalyAnnotation]:
+        """用历史采样批量预热检测器，并返回历史中的异常标注"""
+        annotations = []
+        for name, detector in self._detectors.items():
+            points = [
+                (s["timestamp"], s[name]) for s in samples if s.get(name) is not None
+            ]
+            if not points:
+                continue
+            start_count = detector.count
+            scores, baselines = detector.score_batch([float(v) for _, v in points])
+            for i, score in enumerate(scores):
+                timestamp, value = points[i]
+                annotation = self._annotate(
+                    name, timestamp, value, baselines[i], score, start_count + i + 1
+                )
+                if annotation:
+                    annotations.append(annotation)
+        annotations.sort(key=lambda a: a.timestamp)
+        return annotations
@@ -0,0 +1,247 @@
+import os
+import re
+import time
+
+from ..core.logging_config import get_logger
+from ..models.monitor import ContainerInfo, ContainersInfo
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# 常见容器运行时的 cgroup 目录命名：
+#   systemd 驱动: docker-<id>.scope / cri-containerd-<id>.scope / crio-<id>.scope / libpod-<id>.scope
+#   cgroupfs 驱动: .../docker/<id>、.../kubepods/burstable/pod<uid>/<id>
+_SCOPE_PATTERN = re.compile(
+    r"^(docker|cri-containerd|crio|libpod)-([0-9a-f]{64})\.scope$"
+)
+_BARE_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+_POD_PATTERN = re.compile(r"pod([0-9a-f_-]{36})(?:\.slice)?$")
+
+RUNTIME_NAMES = {"cri-containerd": "containerd", "libpod": "podman"}
+
+
+def _match_container(rel_path: str, name: str) -> tuple[str, str] | None:
+    """判断 cgroup 目录是否属于容器，返回 (运行时, 容器ID)"""
+    match = _SCOPE_PATTERN.match(name)
+    if match:
+        runtime = match.group(1)
+        return RUNTIME_NAMES.get(runtime, runtime), match.group(2)
+    if _BARE_ID_PATTERN.match(name):
+        runtime = "kubernetes" if "kubepods" in rel_path else "docker"
+        return runtime, name
+    return None
+
+
+def _read_int(path: str) -> int | None:
+    try:
+        with open(path, "rb") as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    if value == b"max":
+        return None
+    return int(value)
+
+
+def _read_keyed(path: str) -> dict[bytes, int]:
+    """读取 cpu.stat 这类 "key value" 格式的文件"""
+    with open(path, "rb") as f:
+        return {k: int(v) for k, v in (line.split() for line in f if line.strip())}
+
+
+def _read_io_stat(path: str) -> tuple[int, int]:
+    """汇总 io.stat 中所有设备的读写字节数"""
+    rbytes = wbytes = 0
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                for field in line.split()[1:]:
+                    key, _, value = field.partition(b"=")
+                    if key == b"rbytes":
+                        rbytes += int(value)
+                    elif key == b"wbytes":
+                        wbytes += int(value)
+    except OSError:
+        pass
+    return rbytes, wbytes
+
+
+class CgroupEntry:
+    """索引中的一个容器 cgroup，保存上一次采样的计数器用于计算速率"""
+
+    __slots__ = (
+        "path",
+        "rel_path",
+        "container_id",
+        "runtime",
+        "pod",
+        "last_time",
+        "last_usage",
+        "last_throttled",
+        "last_io",
+        "cpu_percent",
+        "throttled_percent",
+        "nr_throttled",
+        "memory_current",
+    )
+
+    def __init__(self, path: str, rel_path: str, runtime: str, container_id: str):
+        self.path = path
+        self.rel_path = rel_path
+        self.container_id = container_id
+        self.runtime = runtime
+        pod = _POD_PATTERN.search(os.path.dirname(rel_path))
+        self.pod = pod.group(1).replace("_", "-") if pod else None
+        self.last_time: float | None = None
+        self.last_usage = 0
+        self.last_throttled = 0
+        self.last_io: tuple[int, int, float] | None = None
+        self.cpu_percent = 0.0
+        self.throttled_percent = 0.0
+        self.nr_throttled = 0
+        self.memory_current = 0
+
+
+class CgroupCollector:
+    """cgroup v2 容器资源统计
+
+    维护一个容器 cgroup 目录的增量索引：只有根 cgroup 的
+    nr_descendants 发生变化、某个 cgroup 消失或到达全量扫描间隔时
+    才重新遍历目录树，其余采样周期直接读取已索引的 cgroup。
+    每次采样只为所有容器读取 cpu.stat 和 memory.current 用于排序，
+    io.stat、memory.max 和 pids.current 只为返回的 Top-N 读取。
+    """
+
+    def __init__(self, host_sys: str = "/sys", full_rescan_interval: float = 60.0):
+        self.root = f"{host_sys}/fs/cgroup"
+        self.full_rescan_interval = full_rescan_interval
+        self._index: dict[str, CgroupEntry] = {}
+        self._descendants: int | None = None
+        self._last_scan: float | None = None
+        self._dirty = True
+        self.available = os.path.exists(f"{self.root}/cgroup.controllers")
+        if not self.available:
+            logger.warning(f"未检测到 cgroup v2 层级: {self.root}")
+
+    def _root_descendants(self) -> int | None:
+        try:
+            return _read_keyed(f"{self.root}/cgroup.stat").get(b"nr_descendants")
+        except OSError:
+            return None
+
+    def _walk(self, path: str, rel_path: str, found: dict[str, CgroupEntry]):
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            child_rel = f"{rel_path}/{entry.name}" if rel_path else entry.name
+            match = _match_container(child_rel, entry.name)
+            if match:
+                # 复用已有条目，保留上一次的计数器
+                existing = self._index.get(child_rel)
+                found[child_rel] = existing or CgroupEntry(
+                    entry.path, child_rel, match[0], match[1]
+                )
+                # 容器内部的子 cgroup 不再继续遍历
+                continue
+            self._walk(entry.path, child_rel, found)
+
+    def _refresh_index(self):
+        now = time.monotonic()
+        descendants = self._root_descendants()
+        if (
+            not self._dirty
+            and descendants == self._descendants
+            and self._last_scan is not None
+            and now - self._last_scan < self.full_rescan_interval
+        ):
+            return
+
+        found: dict[str, CgroupEntry] = {}
+        self._walk(self.root, "", found)
+        self._index = found
+        self._descendants = descendants
+        self._last_scan = now
+        self._dirty = False
+        logger.debug(f"cgroup 索引已刷新，共 {len(found)} 个容器")
+
+    def _sample(self, entry: CgroupEntry, now: float) -> bool:
+        """读取排序所需的计数器，cgroup 已消失时返回 False"""
+        try:
+            cpu_stat = _read_keyed(f"{entry.path}/cpu.stat")
+        except OSError:
+            return False
+        usage = cpu_stat.get(b"usage_usec", 0)
+        throttled = cpu_stat.get(b"throttled_usec", 0)
+        entry.nr_throttled = cpu_stat.get(b"nr_throttled", 0)
+        entry.memory_current = _read_int(f"{entry.path}/memory.current") or 0
+
+        if entry.last_time is not None and now > entry.last_time:
+            elapsed_usec = (now - entry.last_time) * 1_000_000
+            entry.cpu_percent = max(0, usage - entry.last_usage) / elapsed_usec * 100
+            entry.throttled_percent = (
+                max(0, throttled - entry.last_throttled) / elapsed_usec * 100
+            )
+        entry.last_usage = usage
+        entry.last_throttled = throttled
+        return True
+
+    def _to_model(self, entry: CgroupEntry, now: float) -> ContainerInfo:
+        io_read, io_write = _read_io_stat(f"{entry.path}/io.stat")
+        read_rate = write_rate = 0.0
+        # io.stat 只在进入 Top-N 时读取，速率按上一次读取它的时间计算
+        if entry.last_io is not None:
+            last_read, last_write, last_time = entry.last_io
+            elapsed = now - last_time
+            if elapsed > 0:
+                read_rate = max(0, io_read - last_read) / elapsed
+                write_rate = max(0, io_write - last_write) / elapsed
+        entry.last_io = (io_read, io_write, now)
+
+        return ContainerInfo(
+            id=entry.container_id[:12],
+            path=entry.rel_path,
+            runtime=entry.runtime,
+            pod=entry.pod,
+            cpuPercent=round(entry.cpu_percent, 2),
+            cpuThrottledPercent=round(entry.throttled_percent, 2),
+            nrThrottled=entry.nr_throttled,
+            memoryCurrent=entry.memory_current,
+            memoryMax=_read_int(f"{entry.path}/memory.max"),
+            ioReadBytes=io_read,
+            ioWriteBytes=io_write,
+            ioReadRate=read_rate,
+            ioWriteRate=write_rate,
+            pids=_read_int(f"{entry.path}/pids.current") or 0,
+        )
+
+    def collect(self, sort: str = "cpu", limit: int = 10) -> ContainersInfo:
+        """采集所有容器的资源使用并返回按CPU或内存排序的Top-N"""
+        timestamp = int(time.time() * 1000)
+        if not self.available:
+            return ContainersInfo(total=0, containers=[], timestamp=timestamp)
+
+        self._refresh_index()
+
+        now = time.monotonic()
+        alive = []
+        for rel_path, entry in list(self._index.items()):
+            if self._sample(entry, now):
+                alive.append(entry)
+            else:
+                # 容器已退出，移除索引并在下次采样时重新扫描
+                del self._index[rel_path]
+                self._dirty = True
+
+        if sort == "memory":
+            alive.sort(key=lambda e: e.memory_current, reverse=True)
+        else:
+            alive.sort(key=lambda e: e.cpu_percent, reverse=True)
+
+        top = [self._to_model(entry, now) for entry in alive[:limit]]
+        for entry in alive:
+            entry.last_time = now
+        return ContainersInfo(total=len(alive), containers=top, timestamp=timestamp)
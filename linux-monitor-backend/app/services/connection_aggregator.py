@@ -0,0 +1,184 @@
+import os
+import socket
+import time
+from array import array
+from collections import Counter
+
+from ..core.logging_config import get_logger
+from ..models.monitor import ConnectionAggregate, TopTalkers
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# /proc/net/tcp 中的十六进制状态码
+TCP_STATES = {
+    b"01": "ESTABLISHED",
+    b"02": "SYN_SENT",
+    b"03": "SYN_RECV",
+    b"04": "FIN_WAIT1",
+    b"05": "FIN_WAIT2",
+    b"06": "TIME_WAIT",
+    b"07": "CLOSE",
+    b"08": "CLOSE_WAIT",
+    b"09": "LAST_ACK",
+    b"0A": "LISTEN",
+    b"0B": "CLOSING",
+}
+STATE_CODES = {name: code for code, name in TCP_STATES.items()}
+LISTEN_CODE = STATE_CODES["LISTEN"]
+
+
+def decode_address(hex_addr: bytes) -> str:
+    """把 /proc/net/tcp{,6} 中按32位小端存放的十六进制地址转换为字符串"""
+    raw = bytes.fromhex(hex_addr.decode())
+    if len(raw) == 4:
+        return socket.inet_ntop(socket.AF_INET, raw[::-1])
+    # IPv6: 4个32位字，每个字内部为小端
+    swapped = b"".join(raw[i : i + 4][::-1] for i in range(0, 16, 4))
+    return socket.inet_ntop(socket.AF_INET6, swapped)
+
+
+class SocketOwnerIndex:
+    """socket inode 到进程PID的映射
+
+    需要遍历所有 /proc/[pid]/fd，开销较大，因此带有缓存时间，
+    并且只在需要为 Top-K 结果归属进程时才构建。
+    """
+
+    def __init__(self, host_proc: str = "/proc", ttl: float = 10.0):
+        self.host_proc = host_proc
+        self.ttl = ttl
+        self._owners: dict[int, int] = {}
+        self._built_at: float | None = None
+
+    def _build(self):
+        owners = {}
+        with os.scandir(self.host_proc) as proc_entries:
+            for proc_entry in proc_entries:
+                if not proc_entry.name.isdigit():
+                    continue
+                pid = int(proc_entry.name)
+                try:
+                    with os.scandir(f"{proc_entry.path}/fd") as fds:
+                        for fd in fds:
+                            try:
+                                target = os.readlink(fd.path)
+                            except OSError:
+                                continue
+                            if target.startswith("socket:["):
+                                owners[int(target[8:-1])] = pid
+                except OSError:
+                    # 进程已退出或无权限
+                    continue
+        self._owners = owners
+        self._built_at = time.monotonic()
+
+    def lookup(self, inode: int) -> int | None:
+        if self._built_at is None or time.monotonic() - self._built_at >= self.ttl:
+            self._build()
+        return self._owners.get(inode)
+
+
+class ConnectionAggregator:
+    """按远端地址聚合 TCP 连接（Top talkers）
+
+    一次遍历 /proc/net/tcp 和 /proc/net/tcp6，按 (远端地址, 状态)
+    在哈希计数表中计数，每个分组的 socket inode 存放在紧凑的
+    array 中，不为每个 socket 创建 Python 对象；只有进入 Top-K 的
+    分组才解析地址并按所属进程拆分。
+    """
+
+    def __init__(self, host_proc: str = "/proc"):
+        self.host_proc = host_proc
+        self.owners = SocketOwnerIndex(host_proc)
+
+    def _scan(
+        self, state_codes: set[bytes] | None, by_port: bool
+    ) -> tuple[int, Counter, dict[tuple[bytes, bytes], array]]:
+        counts: Counter = Counter()
+        inodes: dict[tuple[bytes, bytes], array] = {}
+        total = 0
+        for name in ("tcp", "tcp6"):
+            try:
+                with open(f"{self.host_proc}/net/{name}", "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            lines = data.split(b"\n")
+            for line in lines[1:]:
+                fields = line.split(None, 10)
+                if len(fields) < 10:
+                    continue
+                state = fields[3]
+                if state == LISTEN_CODE:
+                    continue
+                total += 1
+                if state_codes is not None and state not in state_codes:
+                    continue
+                remote = fields[2] if by_port else fields[2][:-5]
+                key = (remote, state)
+                counts[key] += 1
+                inode = int(fields[9])
+                if inode:
+                    group = inodes.get(key)
+                    if group is None:
+                        group = inodes[key] = array("Q")
+                    group.append(inode)
+        return total, counts, inodes
+
+    def _process_name(self, pid: int) -> str | None:
+        try:
+            with open(f"{self.host_proc}/{pid}/comm", "r") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def top_talkers(
+        self,
+        k: int = 20,
+        states: list[str] | None = None,
+        by_port: bool = True,
+    ) -> TopTalkers:
+        """返回连接数最多的 K 个 (远端地址, 状态, 进程) 分组"""
+        state_codes = {STATE_CODES[s] for s in states} if states else None
+        total, counts, inodes = self._scan(state_codes, by_port)
+
+        entries = []
+        names: dict[int, str | None] = {}
+        for (remote, state), count in counts.most_common(k):
+            # 按所属进程拆分该分组（TIME_WAIT 等没有 inode 的 socket 不归属进程）
+            per_pid: Counter = Counter()
+            for inode in inodes.get((remote, state), ()):
+                per_pid[self.owners.lookup(inode)] += 1
+            unowned = count - sum(per_pid.values())
+            if unowned:
+                per_pid[None] += unowned
+
+            if by_port:
+                address, port = remote.split(b":")
+                remote_address = decode_address(address)
+                remote_port = int(port, 16)
+            else:
+                remote_address = decode_address(remote)
+                remote_port = None
+
+            for pid, pid_count in per_pid.items():
+                if pid is not None and pid not in names:
+                    names[pid] = self._process_name(pid)
+                entries.append(
+                    ConnectionAggregate(
+                        remoteAddress=remote_address,
+                        remotePort=remote_port,
+                        state=TCP_STATES.get(state, state.decode()),
+                        pid=pid,
+                        process=names.get(pid) if pid is not None else None,
+                        count=pid_count,
+                    )
+                )
+
+        entries.sort(key=lambda e: e.count, reverse=True)
+        return TopTalkers(
+            totalSockets=total,
+            entries=entries[:k],
+            timestamp=int(time.time() * 1000),
+        )
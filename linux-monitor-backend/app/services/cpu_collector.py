@@ -0,0 +1,97 @@
+from array import array
+
+from .procfs import ProcFile
+
+# /proc/stat 中cpu行的前8列（guest/guest_nice 已包含在 user/nice 中，不重复计算）
+CPU_MODES = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal")
+NUM_MODES = len(CPU_MODES)
+IDLE_INDEX = CPU_MODES.index("idle")
+IOWAIT_INDEX = CPU_MODES.index("iowait")
+
+
+class CpuTimes:
+    """一次采样计算出的CPU时间占比
+
+    所有数据按行存放在扁平数组中：第0行为总计，第i+1行为第i个核心，
+    每行 NUM_MODES 个百分比。
+    """
+
+    __slots__ = ("rows", "percents", "busy")
+
+    def __init__(self, rows: int, percents: array, busy: array):
+        self.rows = rows
+        self.percents = percents
+        self.busy = busy
+
+    @property
+    def usage(self) -> float:
+        return self.busy[0]
+
+    @property
+    def cores(self) -> list[float]:
+        return self.busy[1:].tolist()
+
+    @property
+    def modes(self) -> dict[str, float]:
+        """总计的各模式占比"""
+        return {mode: round(self.percents[i], 2) for i, mode in enumerate(CPU_MODES)}
+
+    @property
+    def core_modes(self) -> dict[str, list[float]]:
+        """每个模式对应一个按核心排列的紧凑数组"""
+        return {
+            mode: [round(v, 2) for v in self.percents[NUM_MODES + i :: NUM_MODES]]
+            for i, mode in enumerate(CPU_MODES)
+        }
+
+
+def parse_cpu_lines(data: bytes) -> tuple[int, array]:
+    """从 /proc/stat 中解析所有 cpu 行，返回 (行数, 扁平的jiffies数组)"""
+    values = array("q")
+    rows = 0
+    for line in data.split(b"\n"):
+        if not line.startswith(b"cpu"):
+            # cpu 行总是在文件开头连续出现
+            if rows:
+                break
+            continue
+        fields = line.split(None, NUM_MODES + 1)
+        values.extend(map(int, fields[1 : NUM_MODES + 1]))
+        rows += 1
+    return rows, values
+
+
+class CpuStatCollector:
+    """每个采样周期只读一次 /proc/stat，计算总计和每核的全部CPU模式占比"""
+
+    def __init__(self, host_proc: str = "/proc"):
+        self._stat = ProcFile(f"{host_proc}/stat")
+        self._last: array | None = None
+        self._last_rows = 0
+
+    def collect(self) -> CpuTimes:
+        rows, current = parse_cpu_lines(self._stat.read())
+        last = self._last
+        if last is None or rows != self._last_rows:
+            # 首次采样或CPU热插拔后，用零作为基准（与 psutil 首次返回0一致）
+            last = current
+
+        # 逐元素差分，并按行求出总时间
+        deltas = array("d", [max(0, c - p) for c, p in zip(current, last)])
+        percents = array("d", bytes(8 * len(deltas)))
+        busy = array("d", bytes(8 * rows))
+        for row in range(rows):
+            start = row * NUM_MODES
+            end = start + NUM_MODES
+            total = sum(deltas[start:end])
+            if total <= 0:
+                continue
+            scale = 100.0 / total
+            for i in range(start, end):
+                percents[i] = deltas[i] * scale
+            idle = percents[start + IDLE_INDEX] + percents[start + IOWAIT_INDEX]
+            busy[row] = round(max(0.0, 100.0 - idle), 1)
+
+        self._last = current
+        self._last_rows = rows
+        return CpuTimes(rows, percents, busy)
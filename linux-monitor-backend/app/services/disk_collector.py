@@ -0,0 +1,286 @@
+import os
+import re
+import select
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+from ..core.logging_config import get_logger
+from ..models.monitor import DiskDevice, DiskMount
+from .procfs import ProcFile
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# /proc/diskstats 中的扇区固定为512字节
+SECTOR_SIZE = 512
+
+# 不属于真实存储的伪文件系统
+PSEUDO_FS = frozenset(
+    {
+        "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs",
+        "debugfs", "devpts", "devtmpfs", "efivarfs", "fusectl", "hugetlbfs",
+        "mqueue", "nsfs", "overlay", "proc", "pstore", "ramfs", "rpc_pipefs",
+        "securityfs", "squashfs", "sysfs", "tmpfs", "tracefs",
+    }
+)  # fmt: skip
+
+# 没有块设备但需要统计用量的网络文件系统
+NETWORK_FS = frozenset({"nfs", "nfs4", "cifs", "smb3", "ceph", "glusterfs"})
+
+# 不统计I/O的虚拟块设备前缀
+EXCLUDED_DEVICE_PREFIXES = ("loop", "ram")
+
+# statvfs 线程池的线程数
+STATVFS_WORKERS = 4
+
+
+class MountEntry(NamedTuple):
+    device: str
+    dev_id: str  # major:minor
+    mountpoint: str
+    fstype: str
+
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape(path: str) -> str:
+    """还原 mountinfo 中被八进制转义的空格、制表符等字符"""
+    return _OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), path)
+
+
+def parse_mountinfo(text: str) -> list[MountEntry]:
+    """解析 mountinfo，只保留真实挂载并按设备去重（保留最短挂载点）"""
+    mounts: dict[tuple[str, str], MountEntry] = {}
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            sep = fields.index("-", 6)
+        except ValueError:
+            continue
+        dev_id, root, mountpoint = fields[2], fields[3], _unescape(fields[4])
+        fstype, source = fields[sep + 1], fields[sep + 2]
+        if fstype in PSEUDO_FS:
+            continue
+        if dev_id.startswith("0:") and fstype.split(".")[0] not in NETWORK_FS:
+            continue
+
+        key = (dev_id, root)
+        existing = mounts.get(key)
+        if existing is None or len(mountpoint) < len(existing.mountpoint):
+            mounts[key] = MountEntry(source, dev_id, mountpoint, fstype)
+    return sorted(mounts.values(), key=lambda m: m.mountpoint)
+
+
+class DiskCollector:
+    """按挂载点和块设备采集磁盘用量与I/O
+
+    - 挂载点元数据缓存在内存中，只有 mountinfo 变化时才重新解析
+    - /proc/diskstats 通过预先打开的文件描述符每周期读取一次
+    - statvfs 在线程池中执行并设置超时，挂死的NFS挂载不会阻塞采样；
+      每个挂载点同时最多只有一个未返回的调用，挂死的调用占满半数线程时
+      换用新的线程池，其余挂载点的用量继续更新
+    """
+
+    def __init__(
+        self,
+        host_proc: str = "/proc",
+        host_sys: str | None = "/sys",
+        statvfs_timeout: float = 0.5,
+    ):
+        self.host_sys = host_sys
+        self.statvfs_timeout = statvfs_timeout
+        self._mountinfo = ProcFile(f"{host_proc}/self/mountinfo")
+        self._diskstats = ProcFile(f"{host_proc}/diskstats")
+        self._poller = None
+
+        self._mounts: list[MountEntry] = []
+        self._whole_disks = self._scan_whole_disks()
+
+        self._executor = self._new_executor()
+        self._pending: dict[str, Future] = {}
+        # 已交给旧线程池、仍未返回的调用
+        self._retired: set[Future] = set()
+        # statvfs 超时未返回的挂载点，用于只在状态变化时记录日志
+        self._unresponsive: set[str] = set()
+        self._usage: dict[str, DiskMount] = {}
+
+        self._last_stats: dict[str, tuple[int, ...]] = {}
+        self._last_time: float | None = None
+
+    def _mounts_changed(self) -> bool:
+        """通过 poll 检测挂载表变化（内核在挂载变化时触发 POLLPRI）"""
+        if self._poller is None:
+            # 首次调用：注册监听并强制加载一次
+            try:
+                poller = select.poll()
+                poller.register(self._mountinfo.fd, select.POLLPRI | select.POLLERR)
+                self._poller = poller
+            except (AttributeError, OSError) as e:
+                logger.debug(f"无法监听挂载表变化，每次重新读取: {e}")
+            return True
+        return bool(self._poller.poll(0))
+
+    def _scan_whole_disks(self) -> set[str] | None:
+        """/sys/block 中列出的整盘设备，用于排除分区；不可用时返回 None"""
+        if self.host_sys and os.path.isdir(f"{self.host_sys}/block"):
+            return set(os.listdir(f"{self.host_sys}/block"))
+        return None
+
+    @staticmethod
+    def _new_executor() -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=STATVFS_WORKERS, thread_name_prefix="statvfs"
+        )
+
+    def _refresh_mounts(self):
+        self._mounts = parse_mountinfo(self._mountinfo.read_text())
+        self._whole_disks = self._scan_whole_disks()
+        # 挂载点消失后清理对应缓存
+        current = {m.mountpoint for m in self._mounts}
+        for mountpoint in list(self._usage):
+            if mountpoint not in current:
+                del self._usage[mountpoint]
+        self._unresponsive &= current
+        logger.debug(f"挂载表已刷新，共 {len(self._mounts)} 个真实挂载点")
+
+    @staticmethod
+    def _statvfs(mount: MountEntry) -> DiskMount:
+        st = os.statvfs(mount.mountpoint)
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        percent = used / (used + free) * 100 if used + free > 0 else 0.0
+        return DiskMount(
+            device=mount.device,
+            mountpoint=mount.mountpoint,
+            fstype=mount.fstype,
+            total=total,
+            used=used,
+            free=free,
+            percent=round(percent, 1),
+        )
+
+    def collect_mounts(self) -> list[DiskMount]:
+        """采集所有真实挂载点的用量"""
+        if self._mounts_changed():
+            self._refresh_mounts()
+
+        # 上一周期遗留的仍在执行的调用各占用一个线程，占满半数时换用新的线程池；
+        # 排在挂死调用之后尚未执行的调用随旧线程池取消，本周期重新提交，
+        # 旧线程池在挂死的调用返回后自行退出
+        running = [future for future in self._pending.values() if future.running()]
+        hung = sum(1 for future in running if future not in self._retired)
+        if hung >= STATVFS_WORKERS // 2:
+            logger.warning(f"{hung} 个挂载点 statvfs 未返回，启用新的线程池")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            self._retired = {future for future in running if not future.done()}
+            for mountpoint, future in list(self._pending.items()):
+                if future.cancelled():
+                    del self._pending[mountpoint]
+
+        submitted = {}
+        for mount in self._mounts:
+            pending = self._pending.get(mount.mountpoint)
+            if pending is not None and not pending.done():
+                # 上一次调用仍未返回（例如NFS挂死），不再重复提交
+                continue
+            submitted[mount.mountpoint] = self._executor.submit(self._statvfs, mount)
+        self._pending.update(submitted)
+
+        if submitted:
+            wait(submitted.values(), timeout=self.statvfs_timeout)
+
+        results = []
+        for mount in self._mounts:
+            future = self._pending.get(mount.mountpoint)
+            if future is not None and future.done():
+                del self._pending[mount.mountpoint]
+                if mount.mountpoint in self._unresponsive:
+                    self._unresponsive.discard(mount.mountpoint)
+                    logger.info(f"挂载点 {mount.mountpoint} statvfs 已恢复响应")
+                try:
+                    self._usage[mount.mountpoint] = future.result()
+                except OSError as e:
+                    logger.debug(f"获取挂载点 {mount.mountpoint} 用量失败: {e}")
+                    self._usage.pop(mount.mountpoint, None)
+                    continue
+            elif future is not None:
+                # 只在挂载点开始无响应时记录一次，之后每个周期不再重复
+                if mount.mountpoint not in self._unresponsive:
+                    self._unresponsive.add(mount.mountpoint)
+                    logger.warning(
+                        f"挂载点 {mount.mountpoint} statvfs 超时，使用缓存数据"
+                    )
+                cached = self._usage.get(mount.mountpoint)
+                if cached is not None:
+                    cached.responsive = False
+            usage = self._usage.get(mount.mountpoint)
+            if usage is not None:
+                results.append(usage)
+        return results
+
+    def _is_tracked_device(self, name: str) -> bool:
+        if name.startswith(EXCLUDED_DEVICE_PREFIXES):
+            return False
+        if self._whole_disks is not None:
+            return name in self._whole_disks
+        return True
+
+    def collect_devices(self) -> list[DiskDevice]:
+        """解析 /proc/diskstats，计算每个块设备的速率、IOPS、await和利用率"""
+        now = time.monotonic()
+        interval = now - self._last_time if self._last_time else 0.0
+
+        stats: dict[str, tuple[int, ...]] = {}
+        for line in self._diskstats.read().split(b"\n"):
+            fields = line.split()
+            if len(fields) < 14:
+                continue
+            name = fields[2].decode()
+            if not self._is_tracked_device(name):
+                continue
+            # 读次数, 读扇区, 读耗时ms, 写次数, 写扇区, 写耗时ms, I/O耗时ms
+            stats[name] = (
+                int(fields[3]),
+                int(fields[5]),
+                int(fields[6]),
+                int(fields[7]),
+                int(fields[9]),
+                int(fields[10]),
+                int(fields[12]),
+            )
+
+        devices = []
+        for name, cur in stats.items():
+            prev = self._last_stats.get(name)
+            read_speed = write_speed = read_iops = write_iops = 0.0
+            await_ms = utilization = 0.0
+            if prev is not None and interval > 0:
+                d = [max(0, c - p) for c, p in zip(cur, prev)]
+                read_speed = d[1] * SECTOR_SIZE / interval
+                write_speed = d[4] * SECTOR_SIZE / interval
+                read_iops = d[0] / interval
+                write_iops = d[3] / interval
+                ios = d[0] + d[3]
+                await_ms = (d[2] + d[5]) / ios if ios else 0.0
+                utilization = min(100.0, d[6] / (interval * 1000) * 100)
+            devices.append(
+                DiskDevice(
+                    name=name,
+                    readSpeed=read_speed,
+                    writeSpeed=write_speed,
+                    readIops=round(read_iops, 2),
+                    writeIops=round(write_iops, 2),
+                    readBytes=cur[1] * SECTOR_SIZE,
+                    writeBytes=cur[4] * SECTOR_SIZE,
+                    awaitMs=round(await_ms, 2),
+                    utilization=round(utilization, 1),
+                )
+            )
+
+        self._last_stats = stats
+        self._last_time = now
+        return devices
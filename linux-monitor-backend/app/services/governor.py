@@ -0,0 +1,119 @@
+import time
+
+from ..core.logging_config import get_logger
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+
+class CollectorGovernor:
+    """按自身CPU预算调节高开销采集器的采集间隔
+
+    每个采样周期用 time.process_time() 测量后端进程（包括所有线程）
+    自上一周期以来消耗的CPU时间占单核的比例。平滑后的占用超过预算时，
+    所有登记的高开销采集器的间隔加倍（最多 max_stretch 倍），
+    低于预算的一半时逐步恢复，两个阈值之间保持不变以避免来回振荡。
+
+    同时记录订阅者（WebSocket、SSE）数量和最近一次轮询时间，
+    两者都没有时 active 为 False，采样器据此暂停采集。
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.01,
+        intervals: dict[str, float] | None = None,
+        max_stretch: float = 8.0,
+        idle_timeout: float = 30.0,
+    ):
+        self.budget = budget
+        self.intervals = dict(intervals or {})
+        self.max_stretch = max_stretch
+        self.idle_timeout = idle_timeout
+        self.stretch = 1.0
+        self.usage: float | None = None
+        self.subscribers = 0
+        self._last_run: dict[str, float] = {}
+        self._last_cpu: float | None = None
+        self._last_wall: float | None = None
+        self._last_poll: float | None = None
+
+    def interval(self, name: str) -> float | None:
+        """采集器当前的采集间隔（秒），未登记的采集器返回 None"""
+        base = self.intervals.get(name)
+        return base * self.stretch if base is not None else None
+
+    def due(self, name: str) -> bool:
+        """采集器是否需要重新采集，未登记的采集器总是需要"""
+        interval = self.interval(name)
+        last = self._last_run.get(name)
+        if interval is None or last is None:
+            return True
+        # 留出一成余量，避免采样节拍的抖动让采集推迟整整一个周期
+        return time.monotonic() - last >= interval * 0.9
+
+    def ran(self, name: str):
+        self._last_run[name] = time.monotonic()
+
+    def observe(self):
+        """在每个采样周期结束时调用，更新CPU占用并调整间隔"""
+        cpu = time.process_time()
+        wall = time.monotonic()
+        if self._last_wall is not None and wall > self._last_wall:
+            usage = (cpu - self._last_cpu) / (wall - self._last_wall)
+            self.usage = usage if self.usage is None else 0.5 * usage + 0.5 * self.usage
+            self._adjust()
+        self._last_cpu = cpu
+        self._last_wall = wall
+
+    def _adjust(self):
+        if self.budget <= 0 or not self.intervals:
+            return
+        if self.usage > self.budget and self.stretch < self.max_stretch:
+            self.stretch = min(self.max_stretch, self.stretch * 2)
+            logger.info(
+                f"自身CPU占用 {self.usage:.2%} 超过预算 {self.budget:.2%}，"
+                f"高开销采集器间隔放大到 {self.stretch:g} 倍"
+            )
+        elif self.usage < self.budget / 2 and self.stretch > 1:
+            self.stretch = max(1.0, self.stretch / 2)
+            logger.info(
+                f"自身CPU占用 {self.usage:.2%} 低于预算，"
+                f"高开销采集器间隔恢复到 {self.stretch:g} 倍"
+            )
+
+    def reset(self):
+        """暂停后恢复采集时调用，暂停期间的空闲时间不计入CPU占用"""
+        self._last_cpu = None
+        self._last_wall = None
+
+    def subscribe(self):
+        self.subscribers += 1
+
+    def unsubscribe(self):
+        self.subscribers = max(0, self.subscribers - 1)
+
+    def touch(self, at: float | None = None):
+        """记录一次 HTTP 轮询，at 为其他进程记录的轮询时间（monotonic）"""
+        at = time.monotonic() if at is None else at
+        if self._last_poll is None or at > self._last_poll:
+            self._last_poll = at
+
+    @property
+    def active(self) -> bool:
+        """是否有订阅者或在 idle_timeout 内有过轮询"""
+        if self.subscribers > 0:
+            return True
+        return (
+            self._last_poll is not None
+            and time.monotonic() - self._last_poll < self.idle_timeout
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            "budget": self.budget,
+            "usage": round(self.usage, 5) if self.usage is not None else None,
+            "stretch": self.stretch,
+            "intervals": {name: self.interval(name) for name in self.intervals},
+            "subscribers": self.subscribers,
+            "active": self.active,
+        }
@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+
+# 历史采样中除 timestamp 外的指标
+HISTORY_SERIES = ("cpu", "memory", "diskRead", "diskWrite", "netUp", "netDown")
+
+# 导出格式对应的 Content-Type 和文件扩展名
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def export_csv(chunks: Iterable[list[dict]], series: list[str]) -> Iterator[str]:
+    """表头一行，之后每个历史分块输出一段 CSV"""
+    columns = ["timestamp", *series]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([sample.get(c) for c in columns] for sample in chunk)
+        yield buffer.getvalue()
+
+
+def export_ndjson(chunks: Iterable[list[dict]], series: list[str]) -> Iterator[str]:
+    """每个采样一行 JSON 对象"""
+    columns = ["timestamp", *series]
+    for chunk in chunks:
+        yield "".join(
+            json.dumps({c: sample.get(c) for c in columns}) + "\n" for sample in chunk
+        )
+
+
+def export_arrow(chunks: Iterable[list[dict]], series: list[str]) -> Iterator[bytes]:
+    """Arrow IPC 流格式：schema 之后每个历史分块一个 record batch
+
+    客户端可以用 pyarrow.ipc.open_stream 逐批读取，列数据直接映射为数组，
+    无需逐行解析。需要安装可选依赖 pyarrow。
+    """
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [("timestamp", pa.timestamp("ms"))] + [(name, pa.float64()) for name in series]
+    )
+    buffer = io.BytesIO()
+
+    def drain() -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    with pa.ipc.new_stream(buffer, schema) as writer:
+        yield drain()
+        for chunk in chunks:
+            columns = [pa.array([s["timestamp"] for s in chunk], pa.timestamp("ms"))]
+            columns += [
+                pa.array([s.get(name) for s in chunk], pa.float64()) for name in series
+            ]
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+            yield drain()
+    # 流结束标记
+    yield drain()
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+EXPORTERS = {"csv": export_csv, "ndjson": export_ndjson, "arrow": export_arrow}
+
+
+def export_history(
+    chunks: Iterable[list[dict]], fmt: str, series: list[str]
+) -> Iterator[str | bytes]:
+    """把历史分块按指定格式逐段编码，调用方边生成边发送，内存占用与导出范围无关"""
+    return EXPORTERS[fmt](chunks, series)
@@ -0,0 +1,340 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile
+import time
+
+from ..core.logging_config import get_logger
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+ARCHIVE_VERSION = 1
+
+# 采集器只用 os.path.exists 探测、不会触发审计事件的文件，总是一并记录
+PROBED_FILES = ("sys/fs/cgroup/cgroup.controllers",)
+
+# 当前正在记录的 HostRecorder，审计钩子只能注册不能移除，因此通过它开关
+_active_recorder: "HostRecorder | None" = None
+_hook_installed = False
+
+
+def _audit_hook(event: str, args: tuple):
+    recorder = _active_recorder
+    if recorder is None or recorder.paused:
+        return
+    if event == "open":
+        recorder.record_file(args[0])
+    elif event in ("os.listdir", "os.scandir"):
+        recorder.record_listing(args[0])
+
+
+class HostRecorder:
+    """记录采集器实际读取的 /proc 和 /sys 文件
+
+    通过审计钩子（sys.addaudithook）捕获 open、os.listdir 和 os.scandir，
+    因此无论是采集器自己的解析代码还是 psutil 读取的文件都会被记录。
+    预先打开的文件在之后的周期不会再触发 open，所以已知路径会跨周期保留，
+    每次 snapshot() 重新读取全部已知路径，读取失败（进程已退出）的路径被丢弃。
+    """
+
+    def __init__(self, host_proc: str = "/proc", host_sys: str = "/sys"):
+        self.roots = {
+            "proc": os.path.realpath(host_proc),
+            "sys": os.path.realpath(host_sys),
+        }
+        self.paused = False
+        self.ticks: list[dict] = []
+        self.blobs: dict[str, bytes] = {}
+        self._files: set[str] = set(PROBED_FILES)
+        self._listings: set[str] = set()
+        self._started: float | None = None
+
+    def _relative(self, path) -> str | None:
+        """把宿主机路径转换为归档中的相对路径（proc/... 或 sys/...）"""
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        if not isinstance(path, str):
+            return None
+        for name, root in self.roots.items():
+            if path == root or path.startswith(root + "/"):
+                return name + path[len(root) :]
+        return None
+
+    def record_file(self, path):
+        rel = self._relative(path)
+        if rel is not None:
+            self._files.add(rel)
+
+    def record_listing(self, path):
+        rel = self._relative(path)
+        if rel is not None:
+            self._listings.add(rel)
+
+    def start(self):
+        global _active_recorder, _hook_installed
+        if not _hook_installed:
+            sys.addaudithook(_audit_hook)
+            _hook_installed = True
+        self._started = time.monotonic()
+        _active_recorder = self
+
+    def stop(self):
+        global _active_recorder
+        if _active_recorder is self:
+            _active_recorder = None
+
+    def _absolute(self, rel: str) -> str:
+        name, _, rest = rel.partition("/")
+        return f"{self.roots[name]}/{rest}" if rest else self.roots[name]
+
+    def snapshot(self):
+        """读取所有已知路径的当前内容，作为一个采样周期保存"""
+        self.paused = True
+        try:
+            files: dict[str, str] = {}
+            for rel in sorted(self._files):
+                path = self._absolute(rel)
+                if os.path.isdir(path):
+                    continue
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                except OSError:
+                    self._files.discard(rel)
+                    continue
+                digest = hashlib.sha1(data).hexdigest()
+                self.blobs.setdefault(digest, data)
+                files[rel] = digest
+
+            links: dict[str, str] = {}
+            dirs: list[str] = []
+            for rel in sorted(self._listings):
+                try:
+                    entries = list(os.scandir(self._absolute(rel)))
+                except OSError:
+                    self._listings.discard(rel)
+                    continue
+                dirs.append(rel)
+                for entry in entries:
+                    child = f"{rel}/{entry.name}"
+                    try:
+                        if entry.is_symlink():
+                            links[child] = os.readlink(entry.path)
+                        elif entry.is_dir():
+                            dirs.append(child)
+                    except OSError:
+                        continue
+
+            elapsed = time.monotonic() - self._started if self._started else 0.0
+            self.ticks.append(
+                {
+                    "offset": round(elapsed, 3),
+                    "files": files,
+                    "links": links,
+                    "dirs": dirs,
+                }
+            )
+        finally:
+            self.paused = False
+
+    def write(self, path: str):
+        """写入 xz 压缩的 tar 归档：manifest.json 加按内容去重的 blobs/"""
+        manifest = {
+            "version": ARCHIVE_VERSION,
+            "created": int(time.time() * 1000),
+            "hostProc": self.roots["proc"],
+            "hostSys": self.roots["sys"],
+            "ticks": self.ticks,
+        }
+        with tarfile.open(path, "w:xz") as tar:
+            _add_bytes(tar, "manifest.json", json.dumps(manifest).encode())
+            for digest, data in self.blobs.items():
+                _add_bytes(tar, f"blobs/{digest}", data)
+        logger.info(
+            f"已保存采集输入归档 {path}：{len(self.ticks)} 个周期，"
+            f"{len(self.blobs)} 个不同的文件内容"
+        )
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, data: bytes):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def capture(
+    path: str,
+    ticks: int = 5,
+    interval: float = 3.0,
+    host_proc: str | None = None,
+    host_sys: str | None = None,
+):
+    """在本机运行若干个采样周期并把采集器读取的输入保存到归档"""
+    from .monitor_service import MonitorService
+
+    host_proc = host_proc or os.environ.get("HOST_PROC", "/proc")
+    host_sys = host_sys or os.environ.get("HOST_SYS", "/sys")
+    recorder = HostRecorder(host_proc, host_sys)
+    recorder.start()
+    try:
+        # 在记录开始后创建服务，预先打开的文件也能被捕获
+        service = MonitorService()
+        for tick in range(ticks):
+            if tick:
+                time.sleep(interval)
+            service.get_all_monitor_data()
+            service.get_containers_info()
+            service.get_top_talkers()
+            service.get_network_interfaces()
+            recorder.snapshot()
+            logger.info(f"已记录第 {tick + 1}/{ticks} 个采样周期")
+    finally:
+        recorder.stop()
+    recorder.write(path)
+
+
+def check_archive_path(rel: str):
+    """归档中的路径必须是 proc/ 或 sys/ 下规范化的相对路径，不能包含 .."""
+    parts = rel.split("/")
+    if (
+        os.path.isabs(rel)
+        or ".." in parts
+        or os.path.normpath(rel) != rel
+        or parts[0] not in ("proc", "sys")
+    ):
+        raise ValueError(f"归档中的路径不合法: {rel!r}")
+
+
+class HostArchive:
+    """读取 HostRecorder 写出的归档
+
+    归档可能来自其他主机，所有周期中的文件、链接和目录路径在加载时校验，
+    不在 proc/ 或 sys/ 之下的路径直接拒绝。
+    """
+
+    def __init__(self, path: str):
+        self.blobs: dict[str, bytes] = {}
+        manifest = None
+        with tarfile.open(path, "r:*") as tar:
+            for member in tar.getmembers():
+                if not member.isfile():
+                    continue
+                data = tar.extractfile(member).read()
+                if member.name == "manifest.json":
+                    manifest = json.loads(data)
+                elif member.name.startswith("blobs/"):
+                    self.blobs[member.name[6:]] = data
+        if manifest is None:
+            raise ValueError(f"{path} 中缺少 manifest.json，不是主机采样归档")
+        if manifest.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"不支持的归档版本: {manifest.get('version')}")
+        self.host_proc = manifest["hostProc"]
+        self.host_sys = manifest["hostSys"]
+        self.ticks: list[dict] = manifest["ticks"]
+        if not self.ticks:
+            raise ValueError("归档中没有采样周期")
+        for tick in self.ticks:
+            for rel in (*tick["files"], *tick["links"], *tick["dirs"]):
+                check_archive_path(rel)
+
+    def interval(self) -> float:
+        """记录时相邻两个周期的平均间隔（秒）"""
+        if len(self.ticks) < 2:
+            return 3.0
+        return (self.ticks[-1]["offset"] - self.ticks[0]["offset"]) / (
+            len(self.ticks) - 1
+        )
+
+
+class ReplayHost:
+    """把归档中的周期依次展开到 root/proc 和 root/sys 下
+
+    MonitorService 通过 HOST_PROC / HOST_SYS 指向这两个目录即可重放。
+    切换周期时原地覆盖文件内容（采集器预先打开的描述符保持有效），
+    并删除该周期中不存在的文件和目录（例如已退出的进程）。
+    写入或删除之前校验路径，并确认其父目录解析符号链接后仍在 root 之内，
+    归档中的链接不会被用来写入或删除重放目录之外的文件。
+    """
+
+    def __init__(self, archive: HostArchive | str, root: str):
+        self.archive = (
+            archive if isinstance(archive, HostArchive) else HostArchive(archive)
+        )
+        self.root = root
+        self.proc = os.path.join(root, "proc")
+        self.sys = os.path.join(root, "sys")
+        os.makedirs(self.proc, exist_ok=True)
+        os.makedirs(self.sys, exist_ok=True)
+        self.tick = -1
+        self._current: dict = {"files": {}, "links": {}, "dirs": []}
+        self._real_root = os.path.join(os.path.realpath(root), "")
+        # 本周期已确认在 root 之内的父目录，链接只在周期末尾创建，每个周期开始时清空
+        self._checked_dirs: set[str] = set()
+
+    def _path(self, rel: str) -> str:
+        check_archive_path(rel)
+        path = os.path.join(self.root, rel)
+        parent = os.path.dirname(path)
+        if parent not in self._checked_dirs:
+            if not os.path.join(os.path.realpath(parent), "").startswith(
+                self._real_root
+            ):
+                raise ValueError(f"归档中的路径经由符号链接指向重放目录之外: {rel!r}")
+            self._checked_dirs.add(parent)
+        return path
+
+    def advance(self):
+        """展开下一个周期，到达末尾后从第一个周期重新开始"""
+        self.tick = (self.tick + 1) % len(self.archive.ticks)
+        self._load(self.archive.ticks[self.tick])
+
+    def _load(self, tick: dict):
+        previous = self._current
+        self._checked_dirs.clear()
+        files, links, dirs = tick["files"], tick["links"], set(tick["dirs"])
+
+        # 先删除本周期不存在的文件和链接，再尝试删除变空的目录
+        stale_dirs = set(previous["dirs"]) - dirs
+        for rel in (set(previous["files"]) - set(files)) | (
+            set(previous["links"]) - set(links)
+        ):
+            try:
+                os.unlink(self._path(rel))
+            except OSError:
+                pass
+            stale_dirs.add(os.path.dirname(rel))
+        for rel in sorted(stale_dirs, key=lambda r: r.count("/"), reverse=True):
+            while rel not in ("", "proc", "sys") and rel not in dirs:
+                try:
+                    os.rmdir(self._path(rel))
+                except OSError:
+                    break
+                rel = os.path.dirname(rel)
+
+        for rel in dirs:
+            os.makedirs(self._path(rel), exist_ok=True)
+        for rel, digest in files.items():
+            path = self._path(rel)
+            if previous["files"].get(rel) == digest:
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.islink(path):
+                # 不经由同名的链接写入
+                os.unlink(path)
+            with open(path, "wb") as f:
+                f.write(self.archive.blobs[digest])
+        for rel, target in links.items():
+            path = self._path(rel)
+            if previous["links"].get(rel) == target and os.path.lexists(path):
+                continue
+            # 文件或目录优先，例如 proc/self/mountinfo 已经让 proc/self 成为目录
+            if os.path.isdir(path) and not os.path.islink(path):
+                continue
+            if os.path.lexists(path):
+                os.unlink(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.symlink(target, path)
+        self._current = tick
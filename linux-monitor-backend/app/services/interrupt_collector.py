@@ -0,0 +1,187 @@
+import heapq
+import time
+from array import array
+from operator import sub
+
+from ..core.logging_config import get_logger
+from ..models.monitor import InterruptsInfo, IrqHotspot
+from .procfs import ProcFile
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+
+class IrqLayout:
+    """/proc/interrupts 或 /proc/softirqs 的行布局
+
+    记录表头（CPU 编号）、每行的标签、计数列数和描述。布局只在表头、
+    行数或某一行的标签变化时（CPU 热插拔、驱动加载/卸载）重新计算；
+    其余周期每行只按已知列数做一次有限次数的 split，描述部分不再拆分。
+    """
+
+    __slots__ = ("header", "cpus", "labels", "widths", "descriptions", "lines")
+
+    def __init__(self, lines: list[bytes]):
+        self.header = lines[0]
+        # 离线的 CPU 不出现在表头中，列号与 CPU 编号不一定相同
+        self.cpus = [int(name[3:]) for name in lines[0].split()]
+        ncpu = len(self.cpus)
+        self.labels: list[bytes] = []
+        self.widths: list[int] = []
+        self.descriptions: list[str | None] = []
+        for line in lines[1:]:
+            fields = line.split(None, ncpu + 1)
+            if not fields:
+                continue
+            counts = 0
+            for field in fields[1 : ncpu + 1]:
+                if not field.isdigit():
+                    break
+                counts += 1
+            rest = fields[1 + counts :]
+            if counts < ncpu and rest:
+                # ERR、MIS 等只有一个计数，剩余部分重新合并为描述
+                rest = [b" ".join(rest)]
+            self.labels.append(fields[0])
+            self.widths.append(counts)
+            self.descriptions.append(
+                " ".join(rest[0].decode("utf-8", "replace").split()) if rest else None
+            )
+        self.lines = len(lines)
+
+    def matches(self, lines: list[bytes]) -> bool:
+        return len(lines) == self.lines and lines[0] == self.header
+
+    def parse(self, lines: list[bytes]) -> array | None:
+        """按布局解析计数，返回 (行 x CPU) 的扁平数组；布局不符时返回 None"""
+        ncpu = len(self.cpus)
+        counts = array("q")
+        row = 0
+        for line in lines[1:]:
+            if not line.strip():
+                continue
+            width = self.widths[row]
+            fields = line.split(None, width + 1)
+            if fields[0] != self.labels[row]:
+                return None
+            counts.extend(map(int, fields[1 : width + 1]))
+            if width < ncpu:
+                # 只有一个计数的行补齐为整行，保持 (行 x CPU) 的形状
+                counts.extend([0] * (ncpu - width))
+            row += 1
+        return counts
+
+
+class IrqTable:
+    """一个中断文件的读取和逐周期差分"""
+
+    def __init__(self, path: str, kind: str):
+        self.kind = kind
+        self._file = ProcFile(path)
+        self.layout: IrqLayout | None = None
+        self._last: array | None = None
+
+    def read(self) -> array:
+        lines = self._file.read().rstrip(b"\n").split(b"\n")
+        counts = None
+        if self.layout is not None and self.layout.matches(lines):
+            try:
+                counts = self.layout.parse(lines)
+            except (IndexError, ValueError):
+                # 某一行的列数变化，计数位置错位
+                counts = None
+        if counts is None:
+            self.layout = IrqLayout(lines)
+            self._last = None
+            logger.debug(
+                f"{self._file.path} 布局已更新：{len(self.layout.labels)} 行，"
+                f"{len(self.layout.cpus)} 个 CPU"
+            )
+            counts = self.layout.parse(lines)
+        return counts
+
+    def deltas(self) -> array:
+        """本周期与上一周期之间每个 (行, CPU) 的增量，首次读取时为 0"""
+        current = self.read()
+        last = self._last if self._last is not None else current
+        deltas = array("q", map(sub, current, last))
+        if deltas and min(deltas) < 0:
+            # 计数器回绕（32 位计数）或重置时按 0 处理
+            deltas = array("q", [d if d > 0 else 0 for d in deltas])
+        self._last = current
+        return deltas
+
+
+class InterruptCollector:
+    """读取 /proc/interrupts 和 /proc/softirqs，计算每个 CPU 每个中断的速率
+
+    两个文件都按 (行 x CPU) 存放在扁平数组中，整表一次差分；
+    汇总每个 CPU 的硬中断速率、每种软中断每个 CPU 的速率，
+    并找出速率最高的中断/CPU 组合（例如网卡队列中断集中在一个核心上）。
+    """
+
+    def __init__(self, host_proc: str = "/proc"):
+        self.hardirqs = IrqTable(f"{host_proc}/interrupts", "hardirq")
+        self.softirqs = IrqTable(f"{host_proc}/softirqs", "softirq")
+        self._last_time: float | None = None
+
+    def collect(self, limit: int = 10) -> InterruptsInfo:
+        now = time.monotonic()
+        interval = now - self._last_time if self._last_time else 0.0
+        self._last_time = now
+        scale = 1.0 / interval if interval > 0 else 0.0
+
+        hotspots = []
+        hardirq_rates: list[float] = []
+        softirq_rates: dict[str, list[float]] = {}
+        cpus: list[int] = []
+        for table in (self.hardirqs, self.softirqs):
+            try:
+                deltas = table.deltas()
+            except OSError as e:
+                logger.debug(f"读取 {table.kind} 计数失败: {e}")
+                continue
+            layout = table.layout
+            ncpu = len(layout.cpus)
+            cpus = cpus or layout.cpus
+
+            if table.kind == "hardirq":
+                # 按列求和得到每个 CPU 的硬中断总速率
+                hardirq_rates = [
+                    round(sum(deltas[column::ncpu]) * scale, 1)
+                    for column in range(ncpu)
+                ]
+            else:
+                for row, label in enumerate(layout.labels):
+                    start = row * ncpu
+                    softirq_rates[label.rstrip(b":").decode()] = [
+                        round(d * scale, 1) for d in deltas[start : start + ncpu]
+                    ]
+
+            # 只对非零增量建堆，大多数 (中断, CPU) 组合在一个周期内没有变化
+            top = heapq.nlargest(
+                limit,
+                ((d, i) for i, d in enumerate(deltas) if d),
+            )
+            for delta, index in top:
+                row, column = divmod(index, ncpu)
+                row_total = sum(deltas[row * ncpu : (row + 1) * ncpu])
+                hotspots.append(
+                    IrqHotspot(
+                        irq=layout.labels[row].rstrip(b":").decode(),
+                        kind=table.kind,
+                        description=layout.descriptions[row],
+                        cpu=layout.cpus[column],
+                        rate=round(delta * scale, 1),
+                        share=round(delta / row_total * 100, 1),
+                    )
+                )
+
+        hotspots.sort(key=lambda h: h.rate, reverse=True)
+        return InterruptsInfo(
+            cpus=cpus,
+            hardirqRates=hardirq_rates,
+            softirqRates=softirq_rates,
+            hotspots=hotspots[:limit],
+            timestamp=int(time.time() * 1000),
+        )
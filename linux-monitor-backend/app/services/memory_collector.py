@@ -0,0 +1,75 @@
+from ..core.logging_config import get_logger
+from ..models.monitor import PressureInfo, PressureStall
+from .procfs import ProcFile
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# PSI 资源类型
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+
+
+def parse_meminfo(data: bytes) -> dict[str, int]:
+    """解析 /proc/meminfo，返回字段名到字节数的映射（HugePages_* 为页数）"""
+    values = {}
+    for line in data.split(b"\n"):
+        name, sep, rest = line.partition(b":")
+        if not sep:
+            continue
+        parts = rest.split()
+        if not parts:
+            continue
+        value = int(parts[0])
+        if len(parts) > 1 and parts[1] == b"kB":
+            value *= 1024
+        values[name.decode()] = value
+    return values
+
+
+def parse_pressure(data: bytes) -> PressureInfo:
+    """解析 /proc/pressure/{cpu,memory,io} 中的 some/full 行"""
+    lines = {}
+    for line in data.split(b"\n"):
+        parts = line.split()
+        if not parts:
+            continue
+        fields = dict(p.split(b"=", 1) for p in parts[1:])
+        lines[parts[0].decode()] = PressureStall(
+            avg10=float(fields[b"avg10"]),
+            avg60=float(fields[b"avg60"]),
+            avg300=float(fields[b"avg300"]),
+            total=int(fields[b"total"]),
+        )
+    return PressureInfo(some=lines["some"], full=lines.get("full"))
+
+
+class MemoryCollector:
+    """读取 /proc/meminfo 和 PSI 压力信息
+
+    每个文件只打开一次，之后每个采样周期 seek 到开头重新读取。
+    """
+
+    def __init__(self, host_proc: str = "/proc"):
+        self._meminfo = ProcFile(f"{host_proc}/meminfo")
+        self._pressure = {
+            resource: ProcFile(f"{host_proc}/pressure/{resource}")
+            for resource in PRESSURE_RESOURCES
+        }
+
+    def read_meminfo(self) -> dict[str, int]:
+        return parse_meminfo(self._meminfo.read())
+
+    def read_pressure(self) -> dict[str, PressureInfo]:
+        """读取PSI，内核未启用PSI时对应资源会被跳过"""
+        pressure = {}
+        for resource, proc_file in list(self._pressure.items()):
+            try:
+                pressure[resource] = parse_pressure(proc_file.read())
+            except OSError as e:
+                # 内核未开启 CONFIG_PSI 或无权限，之后不再尝试
+                logger.debug(f"读取 {proc_file.path} 失败，停用该PSI资源: {e}")
+                proc_file.close()
+                del self._pressure[resource]
+            except (KeyError, ValueError) as e:
+                logger.debug(f"解析 {proc_file.path} 失败: {e}")
+        return pressure
@@ -0,0 +1,81 @@
+from collections import deque
+from collections.abc import Iterator
+from itertools import islice
+
+from ..models.monitor import AnomalyAnnotation
+
+
+class MetricHistory:
+    """固定容量的指标历史环形缓冲区
+
+    每个采样点是一个扁平的字典（timestamp + 各指标值），
+    超出容量后最旧的采样和标注会被自动丢弃。
+    """
+
+    def __init__(self, max_samples: int = 1200):
+        self.max_samples = max_samples
+        self._samples: deque[dict] = deque(maxlen=max_samples)
+        self._annotations: deque[AnomalyAnnotation] = deque(maxlen=max_samples)
+        # 累计追加的采样数，用于在分块迭代期间定位已被丢弃的旧采样
+        self._appended = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def append(self, sample: dict, annotations: list[AnomalyAnnotation] | None = None):
+        """追加一个采样点及其异常标注"""
+        self._samples.append(sample)
+        self._appended += 1
+        if annotations:
+            self._annotations.extend(annotations)
+
+    def get_samples(
+        self, since: int | None = None, limit: int | None = None
+    ) -> list[dict]:
+        """获取历史采样，since为毫秒时间戳，limit限制返回最近的条数"""
+        samples = list(self._samples)
+        if since is not None:
+            samples = [s for s in samples if s["timestamp"] >= since]
+        if limit is not None and limit >= 0:
+            samples = samples[-limit:] if limit else []
+        return samples
+
+    def get_annotations(self, since: int | None = None) -> list[AnomalyAnnotation]:
+        """获取异常标注"""
+        if since is None:
+            return list(self._annotations)
+        return [a for a in self._annotations if a.timestamp >= since]
+
+    def iter_chunks(
+        self,
+        since: int | None = None,
+        until: int | None = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[list[dict]]:
+        """按时间顺序分块返回 [since, until] 内的历史采样
+
+        每块在返回前复制，不持有整个缓冲区的副本。两块之间追加新采样或丢弃
+        旧采样都是安全的：按累计序号续读，已被丢弃的部分跳过，开始迭代之后
+        追加的采样不返回。
+        """
+        end = self._appended
+        position = end - len(self._samples)
+        while position < end:
+            first = self._appended - len(self._samples)
+            position = max(position, first)
+            start = position - first
+            count = min(chunk_size, end - position)
+            chunk = list(islice(self._samples, start, start + count))
+            if not chunk:
+                return
+            position += len(chunk)
+            if until is not None and chunk[0]["timestamp"] > until:
+                return
+            selected = [
+                s
+                for s in chunk
+                if (since is None or s["timestamp"] >= since)
+                and (until is None or s["timestamp"] <= until)
+            ]
+            if selected:
+                yield selected
@@ -1,31 +1,58 @@
+import asyncio
 import os
 import platform
 import socket
 import time
-from collections import namedtuple
 from typing import Any
 
 import psutil
 
-from ..core.logging_config import get_logger
+from ..core.logging_config import get_hot_path_logger, get_logger
+from ..core.perf import perf
 from ..models.monitor import (
+    AnomalyAnnotation,
+    ContainersInfo,
     CpuInfo,
     DiskInfo,
+    HistoryData,
+    InterruptsInfo,
     MemoryInfo,
     MonitorData,
     NetworkConnections,
     NetworkInfo,
     NetworkInterface,
+    NetworkStackInfo,
+    NumaInfo,
+    NumaNode,
     OpenPort,
+    ProcessEvent,
+    ProcessHistorySeries,
     ProcessInfo,
+    ProcessSearchResult,
     SystemInfo,
+    TopTalkers,
 )
-
-# 定义命名元组用于存储网络I/O统计
-NetIOCounters = namedtuple('NetIOCounters', ['bytes_sent', 'bytes_recv'])
+from .anomaly_detector import AnomalyDetector
+from .cgroup_collector import CgroupCollector
+from .connection_aggregator import ConnectionAggregator
+from .cpu_collector import CpuStatCollector
+from .disk_collector import DiskCollector
+from .governor import CollectorGovernor
+from .interrupt_collector import InterruptCollector
+from .memory_collector import MemoryCollector
+from .metric_history import MetricHistory
+from .netstack_collector import NetStackCollector
+from .network_collector import NetworkCollector
+from .numa_collector import NumaCollector
+from .proc_events import ProcConnector
+from .process_collector import ProcessCollector, TreeNode
+from .process_history import ProcessHistory
+from .sensor_registry import SensorRegistry
 
 # 获取日志记录器
 logger = get_logger(__name__)
+# 每个采样周期输出的日志，可按 LOG_RATE_LIMIT 限频
+hot_logger = get_hot_path_logger(__name__)
 
 
 class MonitorService:
@@ -46,10 +73,6 @@ class MonitorService:
     _last_process_update_time = 0
 
     def __init__(self):
-        self.last_network_io = None
-        self.last_disk_io = None
-        self.last_time = None
-
         # 配置 psutil 使用宿主机的 /proc 和 /sys 目录
         # 从环境变量中获取路径，如果不存在则使用默认路径
         host_proc = os.environ.get("HOST_PROC", "/proc")
@@ -83,6 +106,92 @@ class MonitorService:
         else:
             logger.warning(f"宿主机 sys 目录不存在: {host_sys}")
 
+        self.host_proc_path = host_proc if os.path.exists(host_proc) else "/proc"
+
+        # /proc/stat 每核CPU时间采集器
+        self.cpu_collector = CpuStatCollector(host_proc=self.host_proc_path)
+
+        # 温度传感器注册表（一次发现，定期重新扫描）
+        self.sensor_registry = SensorRegistry(
+            host_sys=self.host_sys_path or "/sys",
+            rescan_interval=float(os.environ.get("SENSOR_RESCAN_INTERVAL", "600")),
+        )
+
+        # /proc/meminfo 与 PSI 采集器
+        self.memory_collector = MemoryCollector(host_proc=self.host_proc_path)
+
+        # 每个 NUMA 节点的内存和 CPU 拓扑（拓扑只发现一次）
+        self.numa_collector = NumaCollector(host_sys=self.host_sys_path or "/sys")
+
+        # 按挂载点和块设备的磁盘采集器
+        self.disk_collector = DiskCollector(
+            host_proc=self.host_proc_path,
+            host_sys=self.host_sys_path,
+            statvfs_timeout=float(os.environ.get("STATVFS_TIMEOUT", "0.5")),
+        )
+
+        # cgroup v2 容器资源采集器
+        self.cgroup_collector = CgroupCollector(
+            host_sys=self.host_sys_path or "/sys",
+            full_rescan_interval=float(os.environ.get("CGROUP_RESCAN_INTERVAL", "60")),
+        )
+
+        # 网络接口采集器（接口清单只在链路变化时刷新）
+        self.network_collector = NetworkCollector(
+            host_proc=self.host_proc_path,
+            refresh_interval=float(os.environ.get("NET_INVENTORY_INTERVAL", "300")),
+        )
+
+        # 内核网络协议栈计数（重传、监听队列溢出、RST、UDP错误、socket内存）
+        self.netstack_collector = NetStackCollector(host_proc=self.host_proc_path)
+
+        # 每个 CPU 的硬中断/软中断分布
+        self.interrupt_collector = InterruptCollector(host_proc=self.host_proc_path)
+
+        # 进程采集器（详细字段按需读取）
+        self.process_collector = ProcessCollector(
+            host_proc=self.host_proc_path,
+            event_buffer=int(os.environ.get("PROCESS_EVENT_BUFFER", "1000")),
+        )
+        # Top 消耗进程的CPU/RSS历史（每个进程一个固定容量的环形缓冲区）
+        self.process_history = ProcessHistory(
+            capacity=int(os.environ.get("PROCESS_HISTORY_SIZE", "200")),
+            top_k=int(os.environ.get("PROCESS_HISTORY_TOP_K", "10")),
+            max_tracked=int(os.environ.get("PROCESS_HISTORY_MAX", "50")),
+            max_pinned=(
+                int(os.environ["PROCESS_HISTORY_MAX_PINNED"])
+                if "PROCESS_HISTORY_MAX_PINNED" in os.environ
+                else None
+            ),
+        )
+        # 内核 proc connector 进程事件源，在事件循环启动后订阅
+        self.proc_connector: ProcConnector | None = None
+
+        # 按远端地址聚合的 TCP 连接统计
+        self.connection_aggregator = ConnectionAggregator(host_proc=self.host_proc_path)
+
+        # 自身CPU预算：超出时放大进程扫描和 net_connections 等高开销采集的间隔
+        sample_interval = float(os.environ.get("SAMPLE_INTERVAL", "3"))
+        self.governor = CollectorGovernor(
+            budget=float(os.environ.get("SELF_CPU_BUDGET", "0.01")),
+            intervals={
+                "processes": sample_interval,
+                "network.connections": sample_interval,
+                "network.ports": sample_interval,
+            },
+            max_stretch=float(os.environ.get("GOVERNOR_MAX_STRETCH", "8")),
+            idle_timeout=float(os.environ.get("IDLE_TIMEOUT", "30")),
+        )
+
+        # 指标历史与流式异常检测
+        self.history = MetricHistory(int(os.environ.get("HISTORY_SIZE", "1200")))
+        self.anomaly_detector = AnomalyDetector(
+            alpha=float(os.environ.get("ANOMALY_ALPHA", "0.1")),
+            threshold=float(os.environ.get("ANOMALY_THRESHOLD", "4.0")),
+            warmup=int(os.environ.get("ANOMALY_WARMUP", "20")),
+        )
+
+    @perf.timed("system")
     def get_system_info(self) -> SystemInfo:
         """获取系统基本信息"""
         current_time = time.time()
@@ -112,10 +221,12 @@ class MonitorService:
             return system_info
         except Exception as e:
             logger.error(f"获取系统信息失败: {e}")
+            perf.error("system")
 
             # 如果有缓存数据，使用缓存数据
             if MonitorService._cached_system_info:
-                logger.info(
+                perf.fallback("system")
+                hot_logger.info(
                     f"使用缓存的系统信息，缓存时间: {int(current_time - MonitorService._last_system_update_time)}秒前"
                 )
                 # 更新时间戳
@@ -137,72 +248,44 @@ class MonitorService:
                 timestamp=int(current_time * 1000),
             )
 
+    @perf.timed("cpu")
     def get_cpu_info(self) -> CpuInfo:
         """获取CPU信息"""
         current_time = time.time()
 
         try:
-            # 移除interval参数，避免阻塞1秒
-            cpu_percent = psutil.cpu_percent(interval=None)
-            cpu_cores = psutil.cpu_percent(interval=None, percpu=True)
+            # 一次读取 /proc/stat 得到总计和每核的各模式占比
+            cpu_times = self.cpu_collector.collect()
             cpu_freq = psutil.cpu_freq()
             frequency = cpu_freq.current if cpu_freq else 0
 
-            # 尝试获取CPU温度（Linux系统）
+            # 从已发现的温度传感器读取所有封装和核心温度
+            temperatures = []
             temperature = None
             try:
-                # 检查是否支持获取温度传感器数据
-                if platform.system() == "Linux":
-                    # 尝试直接从文件读取温度信息
-                    temp_files = [
-                        "/sys/class/thermal/thermal_zone0/temp",  # 常见的温度文件
-                        "/sys/devices/platform/coretemp.0/temp1_input",  # Intel CPU
-                        "/sys/class/hwmon/hwmon0/temp1_input",  # 通用路径
-                    ]
-
-                    # 如果有宿主机路径，优先使用宿主机路径
-                    if hasattr(self, "host_sys_path") and self.host_sys_path:
-                        host_temp_files = [
-                            f"{self.host_sys_path}/class/thermal/thermal_zone0/temp",
-                            f"{self.host_sys_path}/devices/platform/coretemp.0/temp1_input",
-                            f"{self.host_sys_path}/class/hwmon/hwmon0/temp1_input",
-                        ]
-                        temp_files = host_temp_files + temp_files
-
-                    # 尝试读取温度文件
-                    for temp_file in temp_files:
-                        if os.path.exists(temp_file):
-                            try:
-                                with open(temp_file, "r") as f:
-                                    temp_str = f.read().strip()
-                                    # 温度通常以毫摄氏度存储
-                                    temp_value = int(temp_str) / 1000.0
-                                    if 10 <= temp_value <= 120:  # 合理的温度范围
-                                        temperature = temp_value
-                                        logger.info(
-                                            f"从文件读取CPU温度: {temperature}°C ({temp_file})"
-                                        )
-                                        break
-                            except Exception as e:
-                                logger.debug(f"从文件 {temp_file} 读取温度失败: {e}")
-
-                # 如果文件读取失败，尝试使用 psutil（如果支持）
-                if temperature is None and hasattr(psutil, "sensors_temperatures"):
-                    temps = psutil.sensors_temperatures()
-                    if temps and "coretemp" in temps:
-                        temperature = temps["coretemp"][0].current
-                    elif temps and "cpu_thermal" in temps:
-                        temperature = temps["cpu_thermal"][0].current
+                with perf.timer("cpu.sensors"):
+                    temperatures = self.sensor_registry.read()
+                temperature = self.sensor_registry.cpu_temperature(temperatures)
+            except Exception as e:
+                hot_logger.debug(f"获取CPU温度失败: {e}")
+
+            cores = cpu_times.cores
+            core_nodes = []
+            try:
+                core_nodes = self.numa_collector.core_nodes(len(cores))
             except Exception as e:
-                print(f"获取CPU温度失败: {e}")
-                pass
+                logger.debug(f"获取CPU拓扑失败: {e}")
 
             cpu_info = CpuInfo(
-                usage=cpu_percent,
-                cores=cpu_cores,
+                usage=cpu_times.usage,
+                cores=cores,
                 frequency=frequency,
                 temperature=temperature,
                 timestamp=int(current_time * 1000),
+                modes=cpu_times.modes,
+                coreModes=cpu_times.core_modes,
+                temperatures=[t for t in temperatures if t.kind != "other"],
+                coreNodes=core_nodes,
             )
 
             # 更新缓存
@@ -212,10 +295,12 @@ class MonitorService:
             return cpu_info
         except Exception as e:
             logger.error(f"获取CPU信息失败: {e}")
+            perf.error("cpu")
 
             # 如果有缓存数据，使用缓存数据
             if MonitorService._cached_cpu_info:
-                logger.info(
+                perf.fallback("cpu")
+                hot_logger.info(
                     f"使用缓存的CPU信息，缓存时间: {int(current_time - MonitorService._last_cpu_update_time)}秒前"
                 )
                 # 更新时间戳
@@ -232,21 +317,55 @@ class MonitorService:
                 timestamp=int(current_time * 1000),
             )
 
+    @perf.timed("memory")
     def get_memory_info(self) -> MemoryInfo:
         """获取内存信息"""
         current_time = time.time()
 
         try:
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
-
+            meminfo = self.memory_collector.read_meminfo()
+            pressure = self.memory_collector.read_pressure()
+
+            # 与 psutil.virtual_memory() 相同的口径计算
+            total = meminfo["MemTotal"]
+            free = meminfo.get("MemFree", 0)
+            buffers = meminfo.get("Buffers", 0)
+            cached = meminfo.get("Cached", 0) + meminfo.get("SReclaimable", 0)
+            available = meminfo.get("MemAvailable", free + buffers + cached)
+            used = total - available
+            percent = used / total * 100 if total else 0.0
+
+            swap_total = meminfo.get("SwapTotal", 0)
+            swap_used = swap_total - meminfo.get("SwapFree", 0)
+            swap_percent = swap_used / swap_total * 100 if swap_total else 0.0
+
+            hugepage_size = meminfo.get("Hugepagesize", 0)
             memory_info = MemoryInfo(
-                total=memory.total,
-                used=memory.used,
-                available=memory.available,
-                percent=memory.percent,
-                swap={"total": swap.total, "used": swap.used, "percent": swap.percent},
+                total=total,
+                used=used,
+                available=available,
+                percent=round(percent, 1),
+                swap={
+                    "total": swap_total,
+                    "used": swap_used,
+                    "percent": round(swap_percent, 1),
+                },
                 timestamp=int(current_time * 1000),
+                free=free,
+                cached=cached,
+                buffers=buffers,
+                shared=meminfo.get("Shmem", 0),
+                dirty=meminfo.get("Dirty", 0),
+                writeback=meminfo.get("Writeback", 0),
+                slab=meminfo.get("Slab", 0),
+                slabReclaimable=meminfo.get("SReclaimable", 0),
+                hugepages={
+                    "total": meminfo.get("HugePages_Total", 0),
+                    "free": meminfo.get("HugePages_Free", 0),
+                    "size": hugepage_size,
+                },
+                pressure=pressure,
+                numa=self.get_numa_nodes(),
             )
 
             # 更新缓存
@@ -256,10 +375,12 @@ class MonitorService:
             return memory_info
         except Exception as e:
             logger.error(f"获取内存信息失败: {e}")
+            perf.error("memory")
 
             # 如果有缓存数据，使用缓存数据
             if MonitorService._cached_memory_info:
-                logger.info(
+                perf.fallback("memory")
+                hot_logger.info(
                     f"使用缓存的内存信息，缓存时间: {int(current_time - MonitorService._last_memory_update_time)}秒前"
                 )
                 # 更新时间戳
@@ -277,6 +398,7 @@ class MonitorService:
                 timestamp=int(current_time * 1000),
             )
 
+    @perf.timed("disk")
     def get_disk_info(self) -> DiskInfo:
         """获取磁盘信息"""
         current_time = time.time()
@@ -285,24 +407,13 @@ class MonitorService:
             # 获取根分区磁盘使用情况
             disk_usage = psutil.disk_usage("/")
 
-            # 获取磁盘I/O统计
-            disk_io = psutil.disk_io_counters()
-
-            read_speed = 0.0
-            write_speed = 0.0
-
-            if self.last_disk_io and self.last_time and disk_io:
-                time_delta = current_time - self.last_time
-                if time_delta > 0:
-                    read_speed = (
-                        disk_io.read_bytes - self.last_disk_io.read_bytes
-                    ) / time_delta
-                    write_speed = (
-                        disk_io.write_bytes - self.last_disk_io.write_bytes
-                    ) / time_delta
+            # 每个挂载点的用量和每个块设备的I/O
+            mounts = self.disk_collector.collect_mounts()
+            devices = self.disk_collector.collect_devices()
 
-            self.last_disk_io = disk_io
-            self.last_time = current_time
+            # 汇总读写速率（只统计整盘设备，避免分区重复计算）
+            read_speed = sum(d.readSpeed for d in devices)
+            write_speed = sum(d.writeSpeed for d in devices)
 
             disk_info = DiskInfo(
                 total=disk_usage.total,
@@ -312,6 +423,8 @@ class MonitorService:
                 readSpeed=read_speed,
                 writeSpeed=write_speed,
                 timestamp=int(current_time * 1000),
+                devices=devices,
+                mounts=mounts,
             )
 
             # 更新缓存
@@ -321,10 +434,12 @@ class MonitorService:
             return disk_info
         except Exception as e:
             logger.error(f"获取磁盘信息失败: {e}")
+            perf.error("disk")
 
             # 如果有缓存数据，使用缓存数据
             if MonitorService._cached_disk_info:
-                logger.info(
+                perf.fallback("disk")
+                hot_logger.info(
                     f"使用缓存的磁盘信息，缓存时间: {int(current_time - MonitorService._last_disk_update_time)}秒前"
                 )
                 # 更新时间戳
@@ -343,56 +458,79 @@ class MonitorService:
                 timestamp=int(current_time * 1000),
             )
 
-    def get_network_interfaces(self) -> list[NetworkInterface]:
-        """获取网络接口信息"""
-        interfaces = []
+    @perf.timed("network.interfaces")
+    def get_network_interfaces(
+        self,
+        name: str | None = None,
+        up_only: bool = False,
+        physical_only: bool = False,
+    ) -> list[NetworkInterface]:
+        """获取网络接口信息及每个接口的吞吐、包速率和错误/丢包速率"""
         try:
-            # 只获取主要网络接口信息
-            net_if_addrs = psutil.net_if_addrs()
-            net_if_stats = psutil.net_if_stats()
-            net_io_counters = psutil.net_io_counters(pernic=True)
-
-            # 过滤掉虚拟接口和不活跃的接口
-            active_interfaces = []
-            for interface_name, stats in net_if_stats.items():
-                if stats.isup and interface_name in net_io_counters:
-                    active_interfaces.append(interface_name)
-
-            # 只处理活跃的接口，最多3个
-            for interface_name in active_interfaces[:3]:
-                if interface_name in net_if_addrs and interface_name in net_if_stats:
-                    addresses = net_if_addrs[interface_name]
-                    stats = net_if_stats[interface_name]
-                    io_counters = net_io_counters.get(interface_name)
-
-                    # 获取IP和MAC地址
-                    ip_address = "N/A"
-                    mac_address = "N/A"
-
-                    for addr in addresses:
-                        if addr.family == socket.AF_INET:
-                            ip_address = addr.address
-                        elif addr.family == psutil.AF_LINK:
-                            mac_address = addr.address
-
-                    interface = NetworkInterface(
-                        name=interface_name,
-                        isUp=stats.isup,
-                        speed=stats.speed,
-                        mtu=stats.mtu,
-                        ipAddress=ip_address,
-                        macAddress=mac_address,
-                        bytesReceived=io_counters.bytes_recv if io_counters else 0,
-                        bytesSent=io_counters.bytes_sent if io_counters else 0,
-                        packetsReceived=io_counters.packets_recv if io_counters else 0,
-                        packetsSent=io_counters.packets_sent if io_counters else 0,
-                        errorsReceived=io_counters.errin if io_counters else 0,
-                        errorsSent=io_counters.errout if io_counters else 0,
-                    )
-                    interfaces.append(interface)
+            interfaces = self.network_collector.collect()
         except Exception as e:
             logger.error(f"获取网络接口信息失败: {e}")
+            perf.error("network.interfaces")
+            return []
+        return self._filter_interfaces(interfaces, name, up_only, physical_only)
 
+    @perf.timed("memory.numa")
+    def get_numa_nodes(self) -> list[NumaNode]:
+        """获取每个 NUMA 节点的内存使用和跨节点分配速率"""
+        try:
+            return self.numa_collector.collect_nodes()
+        except Exception as e:
+            logger.error(f"获取NUMA节点信息失败: {e}")
+            perf.error("memory.numa")
+            return []
+
+    def get_numa_info(self) -> NumaInfo:
+        """获取 NUMA 节点内存和 CPU 拓扑（封装、物理核心、SMT 兄弟线程）"""
+        return NumaInfo(
+            nodes=self.get_numa_nodes(),
+            topology=self.numa_collector.topology(),
+            timestamp=int(time.time() * 1000),
+        )
+
+    @perf.timed("network.stack")
+    def get_network_stack(self) -> NetworkStackInfo | None:
+        """获取内核网络协议栈计数的每秒速率和 socket 内存占用"""
+        try:
+            return self.netstack_collector.collect()
+        except Exception as e:
+            logger.error(f"获取网络协议栈计数失败: {e}")
+            perf.error("network.stack")
+            return None
+
+    @perf.timed("interrupts")
+    def get_interrupts_info(self, limit: int = 10) -> InterruptsInfo:
+        """获取每个 CPU 的硬中断、软中断速率和最热的中断/CPU 组合"""
+        try:
+            return self.interrupt_collector.collect(limit=limit)
+        except Exception as e:
+            logger.error(f"获取中断分布失败: {e}")
+            perf.error("interrupts")
+            return InterruptsInfo(
+                cpus=[],
+                hardirqRates=[],
+                softirqRates={},
+                hotspots=[],
+                timestamp=int(time.time() * 1000),
+            )
+
+    @staticmethod
+    def _filter_interfaces(
+        interfaces: list[NetworkInterface],
+        name: str | None = None,
+        up_only: bool = False,
+        physical_only: bool = False,
+    ) -> list[NetworkInterface]:
+        if name:
+            interfaces = [i for i in interfaces if name in i.name]
+        if up_only:
+            interfaces = [i for i in interfaces if i.isUp]
+        if physical_only:
+            interfaces = [i for i in interfaces if i.physical]
         return interfaces
 
     # 缓存网络连接数据
@@ -401,10 +539,18 @@ class MonitorService:
     )
     _last_connections_update_time = 0
 
+    @perf.timed("network.connections")
     def get_network_connections(self) -> NetworkConnections:
         """获取网络连接统计"""
         current_time = time.time()
 
+        # 未到采集间隔时沿用上一次的统计
+        if (
+            not self.governor.due("network.connections")
+            and MonitorService._last_connections_update_time
+        ):
+            return MonitorService._cached_network_connections
+
         try:
             # 尝试获取实际的网络连接数据
             connections = psutil.net_connections()
@@ -439,14 +585,17 @@ class MonitorService:
             # 更新缓存
             MonitorService._cached_network_connections = network_connections
             MonitorService._last_connections_update_time = current_time
+            self.governor.ran("network.connections")
 
             return network_connections
         except Exception as e:
             logger.error(f"获取网络连接统计失败: {e}")
+            perf.error("network.connections")
 
             # 如果有缓存数据，使用缓存数据
             if MonitorService._cached_network_connections:
-                logger.info(
+                perf.fallback("network.connections")
+                hot_logger.info(
                     f"使用缓存的网络连接数据，缓存时间: {int(current_time - MonitorService._last_connections_update_time)}秒前"
                 )
                 return MonitorService._cached_network_connections
@@ -460,10 +609,31 @@ class MonitorService:
     _cached_open_ports: list[OpenPort] = []
     _last_ports_update_time = 0
 
+    @perf.timed("network.talkers")
+    def get_top_talkers(
+        self, k: int = 20, states: list[str] | None = None, group_by: str = "endpoint"
+    ) -> TopTalkers:
+        """获取连接数最多的远端地址（按状态和所属进程拆分）"""
+        try:
+            return self.connection_aggregator.top_talkers(
+                k=k, states=states, by_port=group_by == "endpoint"
+            )
+        except Exception as e:
+            logger.error(f"获取连接聚合信息失败: {e}")
+            perf.error("network.talkers")
+            return TopTalkers(
+                totalSockets=0, entries=[], timestamp=int(time.time() * 1000)
+            )
+
+    @perf.timed("network.ports")
     def get_open_ports(self) -> list[OpenPort]:
         """获取开放端口列表"""
         current_time = time.time()
 
+        # 未到采集间隔时沿用上一次的端口列表
+        if not self.governor.due("network.ports") and MonitorService._cached_open_ports:
+            return MonitorService._cached_open_ports
+
         try:
             # 尝试获取实际的开放端口数据
             # 这里使用 psutil 的 net_connections 方法获取网络连接信息
@@ -531,16 +701,19 @@ class MonitorService:
             if open_ports:
                 MonitorService._cached_open_ports = open_ports
                 MonitorService._last_ports_update_time = current_time
+                self.governor.ran("network.ports")
                 return open_ports
             else:
                 raise Exception("未获取到开放端口数据")
 
         except Exception as e:
             logger.error(f"获取开放端口列表失败: {e}")
+            perf.error("network.ports")
 
             # 如果有缓存数据，使用缓存数据
             if MonitorService._cached_open_ports:
-                logger.info(
+                perf.fallback("network.ports")
+                hot_logger.info(
                     f"使用缓存的开放端口数据，共 {len(MonitorService._cached_open_ports)} 个端口，"
                     f"缓存时间: {int(current_time - MonitorService._last_ports_update_time)}秒前"
                 )
@@ -549,54 +722,26 @@ class MonitorService:
             # 如果没有缓存数据，返回空列表
             return []
 
+    @perf.timed("network")
     def get_network_info(self) -> NetworkInfo:
         """获取网络信息"""
         current_time = time.time()
 
         try:
+            # 一次解析 /proc/net/dev 得到所有接口的计数和速率
+            interfaces = self.network_collector.collect()
+
             # 只统计物理网卡的流量，排除回环和虚拟接口
-            net_io = psutil.net_io_counters(pernic=True)
-            
-            # 需要排除的接口前缀
-            excluded_prefixes = ('lo', 'docker', 'veth', 'br-', 'cni', 'flannel', 'calico')
-            
-            # 累计物理网卡的流量
-            total_bytes_sent = 0
-            total_bytes_recv = 0
-            
-            for iface_name, iface_stats in net_io.items():
-                # 跳过回环接口和虚拟接口
-                if any(iface_name.startswith(prefix) for prefix in excluded_prefixes):
-                    continue
-                # 跳过没有IP地址的接口（通常是未使用的虚拟接口）
-                try:
-                    addrs = psutil.net_if_addrs().get(iface_name, [])
-                    has_ip = any(addr.family == psutil.AF_INET for addr in addrs)
-                    if not has_ip:
-                        continue
-                except Exception:
-                    continue
-                    
-                total_bytes_sent += iface_stats.bytes_sent
-                total_bytes_recv += iface_stats.bytes_recv
-
-            upload_speed = 0.0
-            download_speed = 0.0
-
-            if self.last_network_io and self.last_time:
-                time_delta = current_time - self.last_time
-                if time_delta > 0:
-                    upload_speed = max(0, (total_bytes_sent - self.last_network_io.bytes_sent)) / time_delta
-                    download_speed = max(0, (total_bytes_recv - self.last_network_io.bytes_recv)) / time_delta
-
-            # 使用模块级定义的命名元组存储累计值
-            self.last_network_io = NetIOCounters(bytes_sent=total_bytes_sent, bytes_recv=total_bytes_recv)
-            self.last_time = current_time
-
-            # 获取网络接口、连接统计和开放端口
-            interfaces = self.get_network_interfaces()
+            physical = [i for i in interfaces if i.physical]
+            total_bytes_sent = sum(i.bytesSent for i in physical)
+            total_bytes_recv = sum(i.bytesReceived for i in physical)
+            upload_speed = sum(i.sendRate for i in physical)
+            download_speed = sum(i.receiveRate for i in physical)
+
+            # 获取连接统计和开放端口
             connections = self.get_network_connections()
             open_ports = self.get_open_ports()
+            stack = self.get_network_stack()
 
             network_info = NetworkInfo(
                 uploadSpeed=upload_speed,
@@ -607,6 +752,7 @@ class MonitorService:
                 interfaces=interfaces,
                 openPorts=open_ports,
                 timestamp=int(current_time * 1000),
+                stack=stack,
             )
 
             # 更新缓存
@@ -616,10 +762,12 @@ class MonitorService:
             return network_info
         except Exception as e:
             logger.error(f"获取网络信息失败: {e}")
+            perf.error("network")
 
             # 如果有缓存数据，使用缓存数据
             if MonitorService._cached_network_info:
-                logger.info(
+                perf.fallback("network")
+                hot_logger.info(
                     f"使用缓存的网络信息，缓存时间: {int(current_time - MonitorService._last_network_update_time)}秒前"
                 )
                 # 更新时间戳
@@ -645,74 +793,52 @@ class MonitorService:
     _cached_processes: list[ProcessInfo] = []
     _last_process_update_time = 0
 
-    def get_processes_info(self) -> list[ProcessInfo]:
-        """获取进程信息"""
+    @perf.timed("processes")
+    def get_processes_info(
+        self, limit: int = 30, sort: str = "cpu", pids: list[int] | None = None
+    ) -> list[ProcessInfo]:
+        """获取按CPU或内存排序的Top-N进程，以及显式请求的进程"""
         current_time = time.time()
         processes = []
 
         try:
-            # 先获取所有进程对象
-            all_processes = list(psutil.process_iter())
-
-            # 第一次获取CPU使用率，这会初始化CPU计数器
-            for proc in all_processes:
-                try:
-                    proc.cpu_percent(interval=0)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-
-            # 等待一小段时间，让CPU使用率计算有意义
-            time.sleep(0.1)
-
-            # 再次获取进程信息，这次CPU使用率将会有实际值
-            for proc in all_processes[:30]:  # 限制只处理前30个进程
-                try:
-                    # 获取进程详细信息
-                    pid = proc.pid
-                    name = proc.name()
-                    cpu_percent = proc.cpu_percent(
-                        interval=0
-                    )  # 不再等待，使用之前初始化的值
-                    memory_percent = proc.memory_percent()
-                    status = proc.status()
-
-                    process_info = ProcessInfo(
-                        pid=pid,
-                        name=name,
-                        cpuPercent=cpu_percent or 0.0,
-                        memoryPercent=memory_percent or 0.0,
-                        status=status,
-                    )
-                    processes.append(process_info)
-                except (
-                    psutil.NoSuchProcess,
-                    psutil.AccessDenied,
-                    psutil.ZombieProcess,
-                ):
-                    continue
-
-            # 按CPU使用率排序
-            processes.sort(key=lambda p: p.cpuPercent, reverse=True)
+            first_scan = not self.process_collector.table
+            # 未到采集间隔时直接使用现有的进程表
+            if first_scan or self.governor.due("processes"):
+                with perf.timer("processes.scan"):
+                    self.process_collector.scan()
+                self.governor.ran("processes")
+            if first_scan:
+                # 第一次采集时等待一小段时间，让CPU使用率计算有意义
+                time.sleep(0.1)
+                self.process_collector.scan()
+
+            # 只为返回的进程读取 fd、io、命令行等详细字段
+            processes = self.process_collector.top(limit=limit, sort=sort, pids=pids)
 
             # 如果成功获取了进程数据，更新缓存
             if processes:
                 MonitorService._cached_processes = processes
                 MonitorService._last_process_update_time = current_time
-                logger.info(f"进程数据已更新，缓存了 {len(processes)} 个进程")
+                hot_logger.info(f"进程数据已更新，缓存了 {len(processes)} 个进程")
             else:
                 logger.warning("获取进程数据失败，进程列表为空")
+                perf.error("processes")
                 # 如果有缓存数据，使用缓存数据
                 if MonitorService._cached_processes:
-                    logger.info(
+                    perf.fallback("processes")
+                    hot_logger.info(
                         f"使用缓存的进程数据，共 {len(MonitorService._cached_processes)} 个进程，"
                         f"缓存时间: {int(current_time - MonitorService._last_process_update_time)}秒前"
                     )
                     processes = MonitorService._cached_processes
         except Exception as e:
             logger.error(f"获取进程信息失败: {e}")
+            perf.error("processes")
             # 如果有缓存数据，使用缓存数据
             if MonitorService._cached_processes:
-                logger.info(
+                perf.fallback("processes")
+                hot_logger.info(
                     f"使用缓存的进程数据，共 {len(MonitorService._cached_processes)} 个进程，"
                     f"缓存时间: {int(current_time - MonitorService._last_process_update_time)}秒前"
                 )
@@ -720,6 +846,152 @@ class MonitorService:
 
         return processes
 
+    def get_process_detail(self, pid: int) -> ProcessInfo | None:
+        """获取单个进程的详细信息，进程不存在时返回 None"""
+        if pid not in self.process_collector.table:
+            self.process_collector.scan()
+        return self.process_collector.detail(pid)
+
+    def get_process_tree(
+        self, root: int | None = None, depth: int | None = None
+    ) -> list[TreeNode]:
+        """获取带子树CPU和内存汇总的进程树，节点在接口层用 to_json() 编码"""
+        self._ensure_process_table()
+        return self.process_collector.tree_view(root=root, depth=depth)
+
+    def search_processes(
+        self,
+        name: str | None = None,
+        regex: bool = False,
+        user: str | None = None,
+        states: list[str] | None = None,
+        min_cpu: float | None = None,
+        min_memory: float | None = None,
+        sort: str = "cpu",
+        offset: int = 0,
+        limit: int = 50,
+    ) -> ProcessSearchResult:
+        """按名称、用户、状态和CPU/内存阈值搜索进程，支持分页"""
+        self._ensure_process_table()
+        return self.process_collector.search(
+            name=name,
+            regex=regex,
+            user=user,
+            states=states,
+            min_cpu=min_cpu,
+            min_memory=min_memory,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+        )
+
+    def _ensure_process_table(self, max_age: float = 3.0):
+        """进程表和索引由采样周期及进程事件持续维护，只有过期时才重新扫描"""
+        last_scan = self.process_collector.last_scan
+        if last_scan is None or time.monotonic() - last_scan >= max_age:
+            self.process_collector.scan()
+
+    def get_process_history(
+        self, pid: int, since: int | None = None
+    ) -> ProcessHistorySeries | None:
+        """获取单个进程的CPU/RSS历史，进程不存在时返回 None"""
+        self._ensure_process_table()
+        entry = self.process_collector.table.get(pid)
+        if entry is None:
+            return None
+        series = self.process_history.get(entry, since)
+        if series is None:
+            # 尚未被跟踪的进程返回空序列
+            series = ProcessHistorySeries(
+                pid=pid,
+                name=entry.name,
+                pinned=self.process_history.is_pinned(entry),
+                timestamps=[],
+                cpu=[],
+                rss=[],
+            )
+        return series
+
+    def get_processes_history(
+        self, since: int | None = None
+    ) -> list[ProcessHistorySeries]:
+        """获取所有正在跟踪的进程的历史序列，用于绘制迷你趋势图"""
+        return self.process_history.all(since)
+
+    def pin_process(self, pid: int, pinned: bool = True) -> bool:
+        """固定或取消固定进程，固定的进程即使不在 Top-K 中也会持续记录历史
+
+        进程不存在时返回 False，固定数量已达上限时抛出 ValueError。
+        """
+        if not pinned:
+            self.process_history.unpin(pid)
+            return True
+        self._ensure_process_table()
+        entry = self.process_collector.table.get(pid)
+        if entry is None:
+            return False
+        if not self.process_history.pin(entry):
+            raise ValueError(
+                f"固定的进程已达上限 {self.process_history.max_pinned} 个，"
+                "请先取消固定其他进程"
+            )
+        return True
+
+    def start_process_events(self, loop: asyncio.AbstractEventLoop):
+        """订阅 proc connector 进程事件，在事件循环上实时更新进程表
+
+        不可用（未授予 CAP_NET_ADMIN 或被 PROC_CONNECTOR=0 关闭）时
+        进程变化由相邻两次扫描的对比得到。
+        """
+        if os.environ.get("PROC_CONNECTOR", "1").lower() in ("0", "false", "no"):
+            logger.info("proc connector 已关闭，使用扫描对比检测进程变化")
+            return
+        # 先建立完整的进程表，之后的事件在其基础上增量更新
+        if self.process_collector.last_scan is None:
+            self.process_collector.scan()
+        connector = ProcConnector()
+        if not connector.available:
+            return
+        self.proc_connector = connector
+        loop.add_reader(connector.fileno(), self._on_process_events)
+
+    def stop_process_events(self, loop: asyncio.AbstractEventLoop):
+        """取消 proc connector 订阅"""
+        if self.proc_connector is None:
+            return
+        loop.remove_reader(self.proc_connector.fileno())
+        self.proc_connector.close()
+        self.proc_connector = None
+
+    def _on_process_events(self):
+        events, overflowed = self.proc_connector.read_events()
+        for event in events:
+            self.process_collector.handle_event(event)
+        if overflowed:
+            logger.warning("proc connector 事件丢失，执行一次全量扫描")
+            self.process_collector.scan()
+
+    def get_process_events(self, since: int = 0) -> list[ProcessEvent]:
+        """获取序号大于 since 的进程启动/退出事件"""
+        return self.process_collector.events.since(since)
+
+    @property
+    def process_events_seq(self) -> int:
+        return self.process_collector.events.last_seq
+
+    @perf.timed("containers")
+    def get_containers_info(self, sort: str = "cpu", limit: int = 10) -> ContainersInfo:
+        """获取按CPU或内存排序的Top-N容器资源使用"""
+        try:
+            return self.cgroup_collector.collect(sort=sort, limit=limit)
+        except Exception as e:
+            logger.error(f"获取容器信息失败: {e}")
+            perf.error("containers")
+            return ContainersInfo(
+                total=0, containers=[], timestamp=int(time.time() * 1000)
+            )
+
+    @perf.timed("tick")
     def get_all_monitor_data(self) -> MonitorData:
         """获取所有监控数据"""
         # 获取基本监控数据
@@ -744,6 +1016,8 @@ class MonitorService:
         if len(network_info.openPorts) > 5:
             network_info.openPorts = network_info.openPorts[:5]
 
+        anomalies = self.record_history(cpu_info, memory_info, disk_info, network_info)
+
         return MonitorData(
             system=system_info,
             cpu=cpu_info,
@@ -751,4 +1025,71 @@ class MonitorService:
             disk=disk_info,
             network=network_info,
             processes=top_processes,
+            anomalies=anomalies,
         )
+
+    @perf.timed("history")
+    def record_history(
+        self,
+        cpu_info: CpuInfo,
+        memory_info: MemoryInfo,
+        disk_info: DiskInfo,
+        network_info: NetworkInfo,
+    ) -> list[AnomalyAnnotation]:
+        """记录一个采样点到历史并执行异常检测，返回本次检测出的异常"""
+        sample = {
+            "timestamp": int(time.time() * 1000),
+            "cpu": cpu_info.usage,
+            "memory": memory_info.percent,
+            "diskRead": disk_info.readSpeed,
+            "diskWrite": disk_info.writeSpeed,
+            "netUp": network_info.uploadSpeed,
+            "netDown": network_info.downloadSpeed,
+        }
+        try:
+            anomalies = self.anomaly_detector.observe(sample)
+        except Exception as e:
+            logger.error(f"异常检测失败: {e}")
+            perf.error("history")
+            anomalies = []
+
+        for anomaly in anomalies:
+            logger.warning(
+                f"检测到指标异常: {anomaly.series}={anomaly.value:.2f} "
+                f"(基线 {anomaly.baseline:.2f}, z={anomaly.score})"
+            )
+
+        self.history.append(sample, anomalies)
+        try:
+            self.process_history.record(
+                self.process_collector.table, sample["timestamp"]
+            )
+        except Exception as e:
+            logger.error(f"记录进程历史失败: {e}")
+            perf.error("history")
+        return anomalies
+
+    def get_history(
+        self,
+        since: int | None = None,
+        limit: int | None = None,
+        threshold: float | None = None,
+    ) -> HistoryData:
+        """获取指标历史及异常标注
+
+        指定threshold时，使用新的阈值对返回窗口内的历史批量重新打分。
+        """
+        samples = self.history.get_samples(since=since, limit=limit)
+        if not samples:
+            annotations = []
+        elif threshold is None:
+            annotations = self.history.get_annotations(since=samples[0]["timestamp"])
+        else:
+            detector = AnomalyDetector(
+                alpha=self.anomaly_detector.alpha,
+                threshold=threshold,
+                warmup=self.anomaly_detector.warmup,
+                series=self.anomaly_detector.series,
+            )
+            annotations = detector.backfill(samples)
+        return HistoryData(samples=samples, annotations=annotations)
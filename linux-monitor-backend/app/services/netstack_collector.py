@@ -0,0 +1,186 @@
+import os
+import time
+
+from ..core.logging_config import get_logger
+from ..models.monitor import NetworkStackInfo
+from .procfs import ProcFile
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# 累计计数器：输出字段 -> (文件, 段名, 字段名)，以每秒速率输出
+COUNTERS = {
+    "tcpOutSegs": ("snmp", b"Tcp:", b"OutSegs"),
+    "tcpRetransSegs": ("snmp", b"Tcp:", b"RetransSegs"),
+    "tcpInErrs": ("snmp", b"Tcp:", b"InErrs"),
+    "tcpOutRsts": ("snmp", b"Tcp:", b"OutRsts"),
+    "tcpEstabResets": ("snmp", b"Tcp:", b"EstabResets"),
+    "tcpAttemptFails": ("snmp", b"Tcp:", b"AttemptFails"),
+    "udpInErrors": ("snmp", b"Udp:", b"InErrors"),
+    "udpRcvbufErrors": ("snmp", b"Udp:", b"RcvbufErrors"),
+    "udpSndbufErrors": ("snmp", b"Udp:", b"SndbufErrors"),
+    "udpNoPorts": ("snmp", b"Udp:", b"NoPorts"),
+    "listenOverflows": ("netstat", b"TcpExt:", b"ListenOverflows"),
+    "listenDrops": ("netstat", b"TcpExt:", b"ListenDrops"),
+    "tcpTimeouts": ("netstat", b"TcpExt:", b"TCPTimeouts"),
+}
+
+# 瞬时值：输出字段 -> (段名, 键名)，来自 /proc/net/sockstat
+GAUGES = {
+    "socketsUsed": (b"sockets:", b"used"),
+    "tcpInUse": (b"TCP:", b"inuse"),
+    "tcpOrphan": (b"TCP:", b"orphan"),
+    "tcpTimeWait": (b"TCP:", b"tw"),
+    "tcpAlloc": (b"TCP:", b"alloc"),
+    "tcpMemory": (b"TCP:", b"mem"),
+    "udpInUse": (b"UDP:", b"inuse"),
+    "udpMemory": (b"UDP:", b"mem"),
+}
+
+# sockstat 中 mem 的单位是页
+MEMORY_GAUGES = ("tcpMemory", "udpMemory")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def header_offsets(tokens: list[bytes]) -> dict[tuple[bytes, bytes], int]:
+    """根据 /proc/net/snmp、netstat 的表头计算每个字段的值在 split() 结果中的位置
+
+    这两个文件由成对的行组成：表头行 "Tcp: A B C" 之后紧跟取值行 "Tcp: 1 2 3"。
+    段名是以冒号结尾的词，字段名和取值都不含空白，因此整个文件 split() 后
+    每个值的位置在内核不变的情况下是固定的。
+    """
+    offsets = {}
+    i = 0
+    while i < len(tokens):
+        label = tokens[i]
+        j = i + 1
+        while j < len(tokens) and not tokens[j].endswith(b":"):
+            j += 1
+        fields = tokens[i + 1 : j]
+        for k, field in enumerate(fields):
+            offsets[(label, field)] = j + 1 + k
+        i = j + 1 + len(fields)
+    return offsets
+
+
+def pair_offsets(tokens: list[bytes]) -> dict[tuple[bytes, bytes], int]:
+    """计算 /proc/net/sockstat 中 "TCP: inuse 5 orphan 0 ..." 每个键的值的位置"""
+    offsets = {}
+    label = None
+    i = 0
+    while i < len(tokens):
+        if tokens[i].endswith(b":"):
+            label = tokens[i]
+            i += 1
+            continue
+        offsets[(label, tokens[i])] = i + 1
+        i += 2
+    return offsets
+
+
+class TokenLayout:
+    """文件 split() 后所需字段的位置，只在首次读取或结构变化时计算
+
+    同时记录每个段名的位置用于校验，段名不在原位置时（例如加载了新的
+    协议模块导致 sockstat 多出一行）重新计算。
+    """
+
+    def __init__(self, build, wanted: dict[str, tuple[bytes, bytes]]):
+        self._build = build
+        self._wanted = wanted
+        self.fields: dict[str, int] = {}
+        self._labels: list[tuple[int, bytes]] = []
+        self._size = -1
+
+    def _rebuild(self, tokens: list[bytes]):
+        offsets = self._build(tokens)
+        self.fields = {
+            name: offsets[key] for name, key in self._wanted.items() if key in offsets
+        }
+        missing = set(self._wanted) - set(self.fields)
+        if missing:
+            logger.debug(f"内核未提供以下网络协议栈计数: {', '.join(sorted(missing))}")
+        self._labels = [(i, t) for i, t in enumerate(tokens) if t.endswith(b":")]
+        self._size = len(tokens)
+
+    def extract(self, tokens: list[bytes]) -> dict[str, int]:
+        if len(tokens) != self._size or any(
+            tokens[i] != label for i, label in self._labels
+        ):
+            self._rebuild(tokens)
+        return {name: int(tokens[i]) for name, i in self.fields.items()}
+
+
+class NetStackCollector:
+    """读取 /proc/net/snmp、/proc/net/netstat 和 /proc/net/sockstat
+
+    文件只打开一次，每个采样周期每个文件一次读取和一次 split()，
+    按预先计算的位置取出重传、监听队列溢出、RST、UDP 错误等计数和
+    socket 内存占用，累计计数转换为每秒速率。
+    """
+
+    def __init__(self, host_proc: str = "/proc"):
+        self._files = {
+            "snmp": ProcFile(f"{host_proc}/net/snmp"),
+            "netstat": ProcFile(f"{host_proc}/net/netstat"),
+            "sockstat": ProcFile(f"{host_proc}/net/sockstat"),
+        }
+        self._layouts = {
+            source: TokenLayout(
+                header_offsets,
+                {
+                    name: (label, field)
+                    for name, (src, label, field) in COUNTERS.items()
+                    if src == source
+                },
+            )
+            for source in ("snmp", "netstat")
+        }
+        self._layouts["sockstat"] = TokenLayout(pair_offsets, GAUGES)
+        self._last_counters: dict[str, int] = {}
+        self._last_time: float | None = None
+
+    def read(self) -> dict[str, int]:
+        """读取所有计数的当前值，无法读取的文件被跳过"""
+        values = {}
+        for source, proc_file in self._files.items():
+            try:
+                tokens = proc_file.read().split()
+            except OSError as e:
+                logger.debug(f"读取 {proc_file.path} 失败: {e}")
+                continue
+            values.update(self._layouts[source].extract(tokens))
+        return values
+
+    def collect(self) -> NetworkStackInfo:
+        now = time.monotonic()
+        values = self.read()
+        interval = now - self._last_time if self._last_time else 0.0
+
+        rates = {}
+        for name in COUNTERS:
+            cur = values.get(name)
+            prev = self._last_counters.get(name)
+            if cur is None or prev is None or interval <= 0:
+                rates[name] = 0.0
+            else:
+                # 计数器回绕或重置时按 0 处理
+                rates[name] = round(max(0, cur - prev) / interval, 2)
+        self._last_counters = {
+            name: values[name] for name in COUNTERS if name in values
+        }
+        self._last_time = now
+
+        gauges = {name: values.get(name, 0) for name in GAUGES}
+        for name in MEMORY_GAUGES:
+            gauges[name] *= PAGE_SIZE
+
+        out_segs = rates["tcpOutSegs"]
+        return NetworkStackInfo(
+            **rates,
+            **gauges,
+            retransmitPercent=(
+                round(rates["tcpRetransSegs"] / out_segs * 100, 2) if out_segs else 0.0
+            ),
+            timestamp=int(time.time() * 1000),
+        )
@@ -0,0 +1,217 @@
+import socket
+import time
+
+import psutil
+
+from ..core.logging_config import get_logger
+from ..models.monitor import NetworkInterface
+from .procfs import ProcFile
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# 不计入总流量的回环和虚拟接口前缀
+EXCLUDED_PREFIXES = ("lo", "docker", "veth", "br-", "cni", "flannel", "calico")
+
+# rtnetlink 多播组：链路变化、IPv4/IPv6 地址变化
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+# /proc/net/dev 中需要的列：收 bytes/packets/errs/drop，发 bytes/packets/errs/drop
+_DEV_COLUMNS = (0, 1, 2, 3, 8, 9, 10, 11)
+
+
+class InterfaceMeta:
+    """接口的静态信息，只在链路或地址变化时刷新"""
+
+    __slots__ = (
+        "name",
+        "is_up",
+        "speed",
+        "mtu",
+        "ip_address",
+        "mac_address",
+        "physical",
+    )
+
+    def __init__(self, name, is_up, speed, mtu, ip_address, mac_address, physical):
+        self.name = name
+        self.is_up = is_up
+        self.speed = speed
+        self.mtu = mtu
+        self.ip_address = ip_address
+        self.mac_address = mac_address
+        self.physical = physical
+
+
+class LinkWatcher:
+    """订阅 rtnetlink 链路/地址变化通知，每个采样周期只需一次非阻塞 recv"""
+
+    def __init__(self):
+        self._sock: socket.socket | None = None
+        try:
+            sock = socket.socket(
+                socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE
+            )
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+            sock.setblocking(False)
+            self._sock = sock
+        except (AttributeError, OSError) as e:
+            logger.debug(f"无法订阅 rtnetlink 通知，使用定时刷新: {e}")
+
+    @property
+    def available(self) -> bool:
+        return self._sock is not None
+
+    def changed(self) -> bool:
+        """取出所有待处理的通知，有通知则表示链路或地址发生了变化"""
+        if self._sock is None:
+            return False
+        changed = False
+        while True:
+            try:
+                if not self._sock.recv(65536):
+                    break
+                changed = True
+            except BlockingIOError:
+                break
+            except OSError:
+                # 通知过多导致缓冲区溢出（ENOBUFS）也视为发生了变化
+                changed = True
+                break
+        return changed
+
+
+class InterfaceInventory:
+    """网络接口清单
+
+    IP/MAC、速率上限、MTU 和启用状态只有在接口集合变化、收到 rtnetlink
+    通知或超过刷新间隔时才通过 psutil 重新获取。
+    """
+
+    def __init__(self, refresh_interval: float = 300.0):
+        self.refresh_interval = refresh_interval
+        self._watcher = LinkWatcher()
+        self._interfaces: dict[str, InterfaceMeta] = {}
+        self._last_refresh: float | None = None
+        self._known_names: frozenset[str] = frozenset()
+
+    def refresh(self):
+        net_if_addrs = psutil.net_if_addrs()
+        net_if_stats = psutil.net_if_stats()
+
+        interfaces = {}
+        for name in set(net_if_addrs) | set(net_if_stats):
+            ip_address = "N/A"
+            mac_address = "N/A"
+            for addr in net_if_addrs.get(name, []):
+                if addr.family == socket.AF_INET:
+                    ip_address = addr.address
+                elif addr.family == psutil.AF_LINK:
+                    mac_address = addr.address
+            stats = net_if_stats.get(name)
+            # 物理接口：排除回环/虚拟接口前缀，且配置了IPv4地址
+            physical = not name.startswith(EXCLUDED_PREFIXES) and ip_address != "N/A"
+            interfaces[name] = InterfaceMeta(
+                name=name,
+                is_up=stats.isup if stats else False,
+                speed=stats.speed if stats else 0,
+                mtu=stats.mtu if stats else 0,
+                ip_address=ip_address,
+                mac_address=mac_address,
+                physical=physical,
+            )
+
+        self._interfaces = interfaces
+        self._last_refresh = time.monotonic()
+        logger.debug(f"网络接口清单已刷新，共 {len(interfaces)} 个接口")
+
+    def get(self, names) -> dict[str, InterfaceMeta]:
+        """返回接口元数据，接口集合变化、链路变化或过期时刷新"""
+        names = frozenset(names)
+        expired = (
+            self._last_refresh is None
+            or time.monotonic() - self._last_refresh >= self.refresh_interval
+        )
+        if self._watcher.changed() or expired or names != self._known_names:
+            self.refresh()
+            self._known_names = names
+        return self._interfaces
+
+
+def parse_net_dev(data: bytes) -> dict[str, tuple[int, ...]]:
+    """解析 /proc/net/dev
+
+    返回接口名到 (收bytes, 收包, 收错, 收丢, 发bytes, 发包, 发错, 发丢) 的映射
+    """
+    counters = {}
+    for line in data.split(b"\n")[2:]:
+        name, sep, rest = line.partition(b":")
+        if not sep:
+            continue
+        fields = rest.split()
+        counters[name.strip().decode()] = tuple(int(fields[i]) for i in _DEV_COLUMNS)
+    return counters
+
+
+class NetworkCollector:
+    """网络接口采集器
+
+    每个采样周期只解析一次 /proc/net/dev，计算每个接口的吞吐、
+    包速率和错误/丢包速率。
+    """
+
+    def __init__(self, host_proc: str = "/proc", refresh_interval: float = 300.0):
+        self._net_dev = ProcFile(f"{host_proc}/net/dev")
+        self.inventory = InterfaceInventory(refresh_interval=refresh_interval)
+        self._last_counters: dict[str, tuple[int, ...]] = {}
+        self._last_time: float | None = None
+
+    def collect(self) -> list[NetworkInterface]:
+        now = time.monotonic()
+        counters = parse_net_dev(self._net_dev.read())
+        inventory = self.inventory.get(counters.keys())
+        interval = now - self._last_time if self._last_time else 0.0
+
+        interfaces = []
+        for name, cur in counters.items():
+            meta = inventory.get(name)
+            prev = self._last_counters.get(name)
+            if prev is not None and interval > 0:
+                rates = [max(0, c - p) / interval for c, p in zip(cur, prev)]
+            else:
+                rates = [0.0] * len(cur)
+            interfaces.append(
+                NetworkInterface(
+                    name=name,
+                    isUp=meta.is_up if meta else False,
+                    speed=meta.speed if meta else 0,
+                    mtu=meta.mtu if meta else 0,
+                    ipAddress=meta.ip_address if meta else "N/A",
+                    macAddress=meta.mac_address if meta else "N/A",
+                    bytesReceived=cur[0],
+                    bytesSent=cur[4],
+                    packetsReceived=cur[1],
+                    packetsSent=cur[5],
+                    errorsReceived=cur[2],
+                    errorsSent=cur[6],
+                    dropsReceived=cur[3],
+                    dropsSent=cur[7],
+                    physical=meta.physical if meta else False,
+                    receiveRate=rates[0],
+                    sendRate=rates[4],
+                    packetsReceivedRate=round(rates[1], 2),
+                    packetsSentRate=round(rates[5], 2),
+                    errorsReceivedRate=round(rates[2], 2),
+                    errorsSentRate=round(rates[6], 2),
+                    dropsReceivedRate=round(rates[3], 2),
+                    dropsSentRate=round(rates[7], 2),
+                )
+            )
+
+        self._last_counters = counters
+        self._last_time = now
+        # 物理接口优先，其次是已启用的接口
+        interfaces.sort(key=lambda i: (not i.physical, not i.isUp, i.name))
+        return interfaces
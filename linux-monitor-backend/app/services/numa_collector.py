@@ -0,0 +1,236 @@
+import glob
+import os
+import re
+import time
+
+from ..core.logging_config import get_logger
+from ..models.monitor import CoreGroup, CpuTopology, NumaNode
+from .procfs import ProcFile
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# numastat 中的累计计数（单位为页），以每秒速率输出
+NUMASTAT_FIELDS = {
+    b"numa_hit": "numaHit",
+    b"numa_miss": "numaMiss",
+    b"numa_foreign": "numaForeign",
+    b"local_node": "localNode",
+    b"other_node": "otherNode",
+}
+
+_NODE_DIR = re.compile(r"node(\d+)$")
+
+
+def _read_text(path: str) -> str | None:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def parse_cpulist(text: str | None) -> list[int]:
+    """解析 "0-3,8-11" 格式的 CPU 列表"""
+    cpus = []
+    for part in (text or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        cpus.extend(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def parse_node_meminfo(data: bytes) -> dict[str, int]:
+    """解析 node*/meminfo（"Node 0 MemTotal: 4816632 kB"），返回字节数（HugePages_* 为页数）"""
+    values = {}
+    for line in data.split(b"\n"):
+        parts = line.split()
+        if len(parts) < 4:
+            continue
+        value = int(parts[3])
+        if len(parts) > 4 and parts[4] == b"kB":
+            value *= 1024
+        values[parts[2].rstrip(b":").decode()] = value
+    return values
+
+
+def parse_numastat(data: bytes) -> dict[str, int]:
+    values = {}
+    for line in data.split(b"\n"):
+        name, _, value = line.partition(b" ")
+        field = NUMASTAT_FIELDS.get(name)
+        if field:
+            values[field] = int(value)
+    return values
+
+
+class NodeFiles:
+    __slots__ = ("node", "cpus", "meminfo", "numastat")
+
+    def __init__(self, node_dir: str, node: int):
+        self.node = node
+        self.cpus = parse_cpulist(_read_text(f"{node_dir}/cpulist"))
+        self.meminfo = ProcFile(f"{node_dir}/meminfo")
+        self.numastat = ProcFile(f"{node_dir}/numastat", bufsize=512)
+
+
+class NumaCollector:
+    """读取每个 NUMA 节点的内存和跨节点分配计数，以及 CPU 拓扑
+
+    节点目录和 CPU 拓扑（封装、物理核心、SMT 兄弟线程、所属节点）只在启动时
+    发现一次并缓存，之后每个采样周期只重新读取每个节点的 meminfo 和 numastat；
+    在线 CPU 列表变化（CPU 热插拔）时重新发现。没有 NUMA 的内核上
+    /sys/devices/system/node 不存在，节点列表为空。
+    """
+
+    def __init__(self, host_sys: str = "/sys"):
+        self.host_sys = host_sys
+        self._online = ProcFile(f"{host_sys}/devices/system/cpu/online", bufsize=256)
+        self._online_text: bytes | None = None
+        self._nodes: list[NodeFiles] = []
+        self._topology: list[CpuTopology] = []
+        self._last_counters: dict[int, dict[str, int]] = {}
+        self._last_time: float | None = None
+
+    def _discover(self):
+        nodes = []
+        for node_dir in glob.glob(f"{self.host_sys}/devices/system/node/node*"):
+            match = _NODE_DIR.search(node_dir)
+            if match and os.path.isdir(node_dir):
+                nodes.append(NodeFiles(node_dir, int(match.group(1))))
+        nodes.sort(key=lambda n: n.node)
+        for node in self._nodes:
+            node.meminfo.close()
+            node.numastat.close()
+        self._nodes = nodes
+        self._last_counters = {}
+
+        cpu_nodes = {cpu: node.node for node in nodes for cpu in node.cpus}
+        online = parse_cpulist(self._online_text.decode()) if self._online_text else []
+        if not online:
+            online = sorted(
+                int(os.path.basename(path)[3:])
+                for path in glob.glob(f"{self.host_sys}/devices/system/cpu/cpu[0-9]*")
+            )
+        topology = []
+        for cpu in online:
+            base = f"{self.host_sys}/devices/system/cpu/cpu{cpu}/topology"
+            socket = _read_text(f"{base}/physical_package_id")
+            core = _read_text(f"{base}/core_id")
+            siblings = parse_cpulist(_read_text(f"{base}/thread_siblings_list"))
+            topology.append(
+                CpuTopology(
+                    cpu=cpu,
+                    node=cpu_nodes.get(cpu, 0),
+                    socket=int(socket) if socket else 0,
+                    core=int(core) if core else cpu,
+                    siblings=siblings or [cpu],
+                )
+            )
+        self._topology = topology
+        logger.info(
+            f"发现 {len(nodes)} 个 NUMA 节点、{len({t.socket for t in topology})} 个 CPU 封装、"
+            f"{len(topology)} 个在线 CPU"
+        )
+
+    def _refresh(self):
+        try:
+            online = self._online.read()
+        except OSError:
+            online = b""
+        if online != self._online_text or not self._topology:
+            self._online_text = online
+            self._discover()
+
+    def topology(self) -> list[CpuTopology]:
+        """在线 CPU 的拓扑，顺序与 /proc/stat 中的每核数据相同"""
+        self._refresh()
+        return self._topology
+
+    def core_nodes(self, count: int) -> list[int]:
+        """每个核心所属的 NUMA 节点，核心数与拓扑不一致时返回空列表"""
+        topology = self.topology()
+        if len(topology) != count:
+            return []
+        return [t.node for t in topology]
+
+    def group_cores(self, cores: list[float]) -> list[CoreGroup]:
+        """把按核心排列的使用率按 NUMA 节点分组"""
+        topology = self.topology()
+        if len(topology) != len(cores):
+            return []
+        groups: dict[int, CoreGroup] = {}
+        for t, usage in zip(topology, cores):
+            group = groups.get(t.node)
+            if group is None:
+                group = groups[t.node] = CoreGroup(
+                    node=t.node, cpus=[], cores=[], usage=0.0
+                )
+            group.cpus.append(t.cpu)
+            group.cores.append(usage)
+        for group in groups.values():
+            group.usage = round(sum(group.cores) / len(group.cores), 1)
+        return [groups[node] for node in sorted(groups)]
+
+    def collect_nodes(self) -> list[NumaNode]:
+        """读取每个节点的内存使用和跨节点分配速率"""
+        self._refresh()
+        now = time.monotonic()
+        interval = now - self._last_time if self._last_time else 0.0
+        self._last_time = now
+
+        nodes = []
+        for node in self._nodes:
+            try:
+                meminfo = parse_node_meminfo(node.meminfo.read())
+                counters = parse_numastat(node.numastat.read())
+            except OSError as e:
+                logger.debug(f"读取 NUMA 节点 {node.node} 失败: {e}")
+                continue
+            last = self._last_counters.get(node.node)
+            self._last_counters[node.node] = counters
+            if last is None or interval <= 0:
+                deltas = dict.fromkeys(counters, 0)
+            else:
+                # 计数器重置时按 0 处理
+                deltas = {
+                    name: max(0, value - last.get(name, value))
+                    for name, value in counters.items()
+                }
+            rates = {
+                name: round(delta / interval, 1) if interval > 0 else 0.0
+                for name, delta in deltas.items()
+            }
+            # 在本节点上运行的进程从其他节点分配到的内存占比，首次采样使用累计值
+            local = deltas.get("localNode", 0)
+            other = deltas.get("otherNode", 0)
+            if last is None:
+                local = counters.get("localNode", 0)
+                other = counters.get("otherNode", 0)
+
+            total = meminfo.get("MemTotal", 0)
+            free = meminfo.get("MemFree", 0)
+            used = meminfo.get("MemUsed", total - free)
+            nodes.append(
+                NumaNode(
+                    node=node.node,
+                    cpus=node.cpus,
+                    memTotal=total,
+                    memFree=free,
+                    memUsed=used,
+                    percent=round(used / total * 100, 1) if total else 0.0,
+                    filePages=meminfo.get("FilePages", 0),
+                    anonPages=meminfo.get("AnonPages", 0),
+                    hugepagesTotal=meminfo.get("HugePages_Total", 0),
+                    hugepagesFree=meminfo.get("HugePages_Free", 0),
+                    remotePercent=(
+                        round(other / (local + other) * 100, 2)
+                        if local + other
+                        else 0.0
+                    ),
+                    **rates,
+                )
+            )
+        return nodes
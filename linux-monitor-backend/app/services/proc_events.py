@@ -0,0 +1,191 @@
+import socket
+import struct
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from ..core.logging_config import get_logger
+from ..models.monitor import ProcessEvent
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# 内核 proc connector（linux/connector.h、linux/cn_proc.h）
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+NLMSG_DONE = 3
+
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+# nlmsghdr: len, type, flags, seq, pid
+_NLMSGHDR = struct.Struct("=IHHII")
+# cn_msg: idx, val, seq, ack, len, flags
+_CN_MSG = struct.Struct("=IIIIHH")
+# proc_event 头部: what, cpu, timestamp_ns
+_PROC_EVENT = struct.Struct("=IIQ")
+_FORK = struct.Struct("=IIII")
+_EXEC = struct.Struct("=II")
+_EXIT = struct.Struct("=IIII")
+_EVENT_OFFSET = _NLMSGHDR.size + _CN_MSG.size
+_DATA_OFFSET = _EVENT_OFFSET + _PROC_EVENT.size
+
+
+class ConnectorEvent(NamedTuple):
+    """proc connector 上报的一个进程事件，pid/tgid 为事件主体（fork 时为子进程）"""
+
+    what: int
+    pid: int
+    tgid: int
+    ppid: int = 0
+    exit_code: int = 0
+
+
+def parse_proc_events(data: bytes) -> list[ConnectorEvent]:
+    """解析一次 recv 得到的 netlink 数据，其中可能包含多条消息"""
+    events = []
+    offset = 0
+    while offset + _DATA_OFFSET <= len(data):
+        msg_len = _NLMSGHDR.unpack_from(data, offset)[0]
+        if msg_len < _DATA_OFFSET:
+            break
+        what = _PROC_EVENT.unpack_from(data, offset + _EVENT_OFFSET)[0]
+        body = offset + _DATA_OFFSET
+        if what == PROC_EVENT_FORK:
+            _, parent_tgid, child_pid, child_tgid = _FORK.unpack_from(data, body)
+            events.append(ConnectorEvent(what, child_pid, child_tgid, parent_tgid))
+        elif what == PROC_EVENT_EXEC:
+            pid, tgid = _EXEC.unpack_from(data, body)
+            events.append(ConnectorEvent(what, pid, tgid))
+        elif what == PROC_EVENT_EXIT:
+            pid, tgid, exit_code, _ = _EXIT.unpack_from(data, body)
+            events.append(ConnectorEvent(what, pid, tgid, exit_code=exit_code))
+        # 按4字节对齐跳到下一条消息
+        offset += (msg_len + 3) & ~3
+    return events
+
+
+class ProcConnector:
+    """订阅内核 proc connector 的 fork/exec/exit 事件
+
+    需要 CAP_NET_ADMIN，不可用时 available 为 False，由调用方退回到
+    对比相邻两次扫描结果的方式。
+    """
+
+    def __init__(self):
+        self._sock: socket.socket | None = None
+        try:
+            sock = socket.socket(
+                socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR
+            )
+            sock.bind((0, CN_IDX_PROC))
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+            sock.send(self._control_message(sock, PROC_CN_MCAST_LISTEN))
+            sock.setblocking(False)
+            self._sock = sock
+            logger.info("已订阅 proc connector 进程事件")
+        except (AttributeError, OSError) as e:
+            logger.warning(f"无法订阅 proc connector，使用扫描对比检测进程变化: {e}")
+
+    @staticmethod
+    def _control_message(sock: socket.socket, op: int) -> bytes:
+        payload = struct.pack("=I", op)
+        cn_msg = _CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0)
+        length = _NLMSGHDR.size + len(cn_msg) + len(payload)
+        header = _NLMSGHDR.pack(length, NLMSG_DONE, 0, 0, sock.getsockname()[0])
+        return header + cn_msg + payload
+
+    @property
+    def available(self) -> bool:
+        return self._sock is not None
+
+    def fileno(self) -> int:
+        return self._sock.fileno() if self._sock else -1
+
+    def read_events(self) -> tuple[list[ConnectorEvent], bool]:
+        """取出所有待处理的事件，第二个返回值表示是否因缓冲区溢出丢失了事件"""
+        events: list[ConnectorEvent] = []
+        if self._sock is None:
+            return events, False
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except BlockingIOError:
+                return events, False
+            except OSError:
+                # ENOBUFS：事件过多导致丢失，需要一次全量扫描补齐
+                return events, True
+            if not data:
+                return events, False
+            events.extend(parse_proc_events(data))
+
+    def close(self):
+        if self._sock is None:
+            return
+        try:
+            self._sock.send(self._control_message(self._sock, PROC_CN_MCAST_IGNORE))
+        except OSError:
+            pass
+        self._sock.close()
+        self._sock = None
+
+
+class ProcessEventLog:
+    """最近的进程启动/退出事件，按序号增量读取"""
+
+    def __init__(self, maxlen: int = 1000):
+        self._events: deque[ProcessEvent] = deque(maxlen=maxlen)
+        self._seq = 0
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def append(
+        self,
+        kind: str,
+        pid: int,
+        source: str,
+        ppid: int | None = None,
+        name: str | None = None,
+        cmdline: str | None = None,
+        exit_code: int | None = None,
+    ):
+        self._seq += 1
+        exit_status = exit_signal = None
+        if exit_code is not None:
+            # 与 wait() 的状态格式相同：高8位为退出码，低7位为信号
+            exit_status = (exit_code >> 8) & 0xFF
+            exit_signal = (exit_code & 0x7F) or None
+        self._events.append(
+            ProcessEvent(
+                seq=self._seq,
+                kind=kind,
+                pid=pid,
+                ppid=ppid,
+                name=name,
+                cmdline=cmdline,
+                exitCode=exit_status,
+                exitSignal=exit_signal,
+                source=source,
+                timestamp=int(time.time() * 1000),
+            )
+        )
+
+    def extend(self, events: Iterable[ProcessEvent]):
+        """按原序号合并其他进程记录的事件，已有的序号被跳过"""
+        for event in events:
+            if event.seq > self._seq:
+                self._events.append(event)
+                self._seq = event.seq
+
+    def since(self, seq: int) -> list[ProcessEvent]:
+        """返回序号大于 seq 的事件"""
+        if seq >= self._seq:
+            return []
+        return [e for e in self._events if e.seq > seq]
@@ -0,0 +1,727 @@
+import os
+import pwd
+import re
+import time
+from json.encoder import encode_basestring
+from typing import NamedTuple
+
+from ..core.logging_config import get_logger
+from ..models.monitor import ProcessInfo, ProcessSearchResult
+from .proc_events import (
+    PROC_EVENT_EXEC,
+    PROC_EVENT_EXIT,
+    PROC_EVENT_FORK,
+    ConnectorEvent,
+    ProcessEventLog,
+)
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# /proc/[pid]/stat 中的状态字母，与 psutil 的状态名保持一致
+PROC_STATES = {
+    b"R": "running",
+    b"S": "sleeping",
+    b"D": "disk-sleep",
+    b"T": "stopped",
+    b"t": "tracing-stop",
+    b"Z": "zombie",
+    b"X": "dead",
+    b"x": "dead",
+    b"I": "idle",
+    b"P": "parked",
+    b"W": "waking",
+    b"K": "wake-kill",
+}
+
+
+def parse_stat(data: bytes) -> tuple | None:
+    """解析 /proc/[pid]/stat
+
+    返回 (名称, 状态, 父进程PID, CPU ticks, 线程数, 启动ticks, 虚拟内存, RSS页数)
+    """
+    # 进程名可能包含空格和括号，以最后一个 ')' 分隔
+    head, sep, rest = data.rpartition(b")")
+    if not sep:
+        return None
+    name = head.partition(b"(")[2].decode(errors="replace")
+    fields = rest.split()
+    return (
+        name,
+        fields[0],
+        int(fields[1]),
+        int(fields[11]) + int(fields[12]),
+        int(fields[17]),
+        int(fields[19]),
+        int(fields[20]),
+        int(fields[21]),
+    )
+
+
+def _read_io(path: str) -> tuple[int, int] | None:
+    """读取 /proc/[pid]/io 中落到存储层的读写字节数"""
+    read_bytes = write_bytes = None
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                key, _, value = line.partition(b":")
+                if key == b"read_bytes":
+                    read_bytes = int(value)
+                elif key == b"write_bytes":
+                    write_bytes = int(value)
+    except OSError:
+        return None
+    if read_bytes is None or write_bytes is None:
+        return None
+    return read_bytes, write_bytes
+
+
+class ProcessEntry:
+    """进程表中的一个进程，(pid, start_ticks) 唯一标识一个进程实例"""
+
+    __slots__ = (
+        "pid",
+        "start_ticks",
+        "name",
+        "state",
+        "ppid",
+        "cpu_ticks",
+        "cpu_percent",
+        "threads",
+        "vms",
+        "rss",
+        "last_time",
+        "last_io",
+        "cmdline",
+        "uid",
+    )
+
+    def __init__(self, pid: int, start_ticks: int):
+        self.pid = pid
+        self.start_ticks = start_ticks
+        self.name = ""
+        self.state = b"?"
+        self.ppid = 0
+        self.cpu_ticks = 0
+        self.cpu_percent = 0.0
+        self.threads = 0
+        self.vms = 0
+        self.rss = 0
+        self.last_time: float | None = None
+        self.last_io: tuple[int, int, float] | None = None
+        self.cmdline: str | None = None
+        self.uid: int | None = None
+
+
+def _subtree_cpu(node: "TreeNode") -> float:
+    return node.subtreeCpuPercent
+
+
+class TreeNode:
+    """进程树中的一个节点，字段与公开模型 ProcessTreeNode 相同
+
+    整棵树每个进程一个节点，上万个进程时逐个构造 pydantic 模型并校验的开销
+    远大于遍历本身。采集器直接填充这些轻量对象，接口层用 to_json() 编码。
+    """
+
+    __slots__ = (
+        "pid",
+        "name",
+        "status",
+        "cpuPercent",
+        "memoryPercent",
+        "rss",
+        "subtreeCpuPercent",
+        "subtreeMemoryPercent",
+        "subtreeRss",
+        "subtreeProcesses",
+        "children",
+    )
+
+    def __init__(
+        self,
+        pid: int,
+        name: str,
+        status: str,
+        cpuPercent: float,
+        memoryPercent: float,
+        rss: int,
+        subtreeCpuPercent: float,
+        subtreeMemoryPercent: float,
+        subtreeRss: int,
+        subtreeProcesses: int,
+        children: list["TreeNode"],
+    ):
+        self.pid = pid
+        self.name = name
+        self.status = status
+        self.cpuPercent = cpuPercent
+        self.memoryPercent = memoryPercent
+        self.rss = rss
+        self.subtreeCpuPercent = subtreeCpuPercent
+        self.subtreeMemoryPercent = subtreeMemoryPercent
+        self.subtreeRss = subtreeRss
+        self.subtreeProcesses = subtreeProcesses
+        self.children = children
+
+    def _head(self) -> str:
+        """节点自身字段的 JSON，以未闭合的 children 数组结尾"""
+        return (
+            f'{{"pid":{self.pid},"name":{encode_basestring(self.name)},'
+            f'"status":{encode_basestring(self.status)},'
+            f'"cpuPercent":{self.cpuPercent!r},'
+            f'"memoryPercent":{self.memoryPercent!r},'
+            f'"rss":{self.rss},'
+            f'"subtreeCpuPercent":{self.subtreeCpuPercent!r},'
+            f'"subtreeMemoryPercent":{self.subtreeMemoryPercent!r},'
+            f'"subtreeRss":{self.subtreeRss},'
+            f'"subtreeProcesses":{self.subtreeProcesses},'
+            f'"children":['
+        )
+
+    def to_json(self) -> str:
+        """按 ProcessTreeNode 的结构把整棵子树编码为 JSON
+
+        迭代遍历直接拼接字符串，不生成嵌套字典，也不经过 json 或 pydantic 的
+        序列化器（两者都有嵌套深度限制），很深的进程链同样可以编码。
+        """
+        parts = []
+        stack: list = [self]
+        while stack:
+            item = stack.pop()
+            if item.__class__ is str:
+                parts.append(item)
+                continue
+            parts.append(item._head())
+            stack.append("]}")
+            children = item.children
+            for i in range(len(children) - 1, -1, -1):
+                stack.append(children[i])
+                if i:
+                    stack.append(",")
+        return "".join(parts)
+
+
+class ProcessDiff(NamedTuple):
+    """两次扫描之间的进程变化"""
+
+    started: list[ProcessEntry]
+    exited: list[ProcessEntry]
+    # (进程, 原父进程PID)
+    reparented: list[tuple[ProcessEntry, int]]
+
+
+_NO_CHILDREN: frozenset[int] = frozenset()
+
+
+class ProcessTree:
+    """父进程到子进程的索引，根据每次扫描的进程变化增量更新"""
+
+    def __init__(self):
+        self._children: dict[int, set[int]] = {}
+
+    def add(self, ppid: int, pid: int):
+        self._children.setdefault(ppid, set()).add(pid)
+
+    def remove(self, ppid: int, pid: int):
+        children = self._children.get(ppid)
+        if children is not None:
+            children.discard(pid)
+            if not children:
+                del self._children[ppid]
+
+    def apply(self, diff: ProcessDiff):
+        for entry in diff.exited:
+            self.remove(entry.ppid, entry.pid)
+        for entry, old_ppid in diff.reparented:
+            self.remove(old_ppid, entry.pid)
+            self.add(entry.ppid, entry.pid)
+        for entry in diff.started:
+            self.add(entry.ppid, entry.pid)
+
+    def children(self, pid: int) -> set[int] | frozenset[int]:
+        return self._children.get(pid, _NO_CHILDREN)
+
+    def roots(self, table: dict[int, ProcessEntry]) -> list[int]:
+        """父进程不在进程表中的进程（如 init、kthreadd 或容器内的 1 号进程）"""
+        return [
+            pid
+            for ppid, children in self._children.items()
+            if ppid not in table
+            for pid in children
+        ]
+
+
+class ProcessIndex:
+    """按进程名和状态的倒排索引，随进程表增量维护
+
+    不同的进程名远少于进程数，按名称搜索只需遍历名称集合。
+    """
+
+    def __init__(self):
+        self.by_name: dict[str, set[int]] = {}
+        self.by_state: dict[bytes, set[int]] = {}
+
+    @staticmethod
+    def _move(index: dict, pid: int, old, new):
+        if old is not None:
+            pids = index.get(old)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del index[old]
+        if new is not None:
+            index.setdefault(new, set()).add(pid)
+
+    def move_name(self, pid: int, old: str | None, new: str | None):
+        self._move(self.by_name, pid, old, new)
+
+    def move_state(self, pid: int, old: bytes | None, new: bytes | None):
+        self._move(self.by_state, pid, old, new)
+
+    def remove(self, entry: ProcessEntry):
+        self._move(self.by_name, entry.pid, entry.name, None)
+        self._move(self.by_state, entry.pid, entry.state, None)
+
+    def match_names(self, pattern: str, regex: bool = False) -> set[int]:
+        """返回名称包含 pattern（不区分大小写）或匹配正则的进程PID"""
+        if regex:
+            compiled = re.compile(pattern, re.IGNORECASE)
+            names = [name for name in self.by_name if compiled.search(name)]
+        else:
+            needle = pattern.lower()
+            names = [name for name in self.by_name if needle in name.lower()]
+        return set().union(*(self.by_name[name] for name in names))
+
+
+class ProcessCollector:
+    """进程采集器
+
+    每个采样周期只为每个进程读取一次 /proc/[pid]/stat，得到名称、状态、
+    父进程、CPU时间、线程数和内存，用于排序。打开的文件描述符数、
+    /proc/[pid]/io 读写字节及速率、命令行和用户等开销较大的字段
+    只为进入 Top-N 的进程和客户端显式请求的进程读取。
+    """
+
+    def __init__(self, host_proc: str = "/proc", event_buffer: int = 1000):
+        self.host_proc = host_proc
+        self._table: dict[int, ProcessEntry] = {}
+        self.tree = ProcessTree()
+        self.index = ProcessIndex()
+        self.last_scan: float | None = None
+        self.events = ProcessEventLog(event_buffer)
+        # 已收到退出事件、/proc 中可能仍残留的进程: pid -> 启动ticks
+        self._exited: dict[int, int] = {}
+        self._users: dict[int, str] = {}
+        self._boot_time = self._read_boot_time()
+
+    def _read_boot_time(self) -> float:
+        try:
+            with open(f"{self.host_proc}/stat", "rb") as f:
+                for line in f:
+                    if line.startswith(b"btime "):
+                        return float(line.split()[1])
+        except OSError:
+            pass
+        return 0.0
+
+    def _memory_total(self) -> int:
+        try:
+            with open(f"{self.host_proc}/meminfo", "rb") as f:
+                # 第一行为 MemTotal
+                return int(f.readline().split()[1]) * 1024
+        except (OSError, IndexError, ValueError):
+            return 0
+
+    @property
+    def table(self) -> dict[int, ProcessEntry]:
+        return self._table
+
+    def _read_stat(self, pid: int) -> tuple | None:
+        try:
+            with open(f"{self.host_proc}/{pid}/stat", "rb") as f:
+                return parse_stat(f.read())
+        except OSError:
+            # 进程已退出
+            return None
+
+    def _update(self, entry: ProcessEntry, parsed: tuple, now: float):
+        name, state, ppid, cpu_ticks, threads, _, vms, rss = parsed
+        if entry.last_time is not None and now > entry.last_time:
+            elapsed_ticks = (now - entry.last_time) * CLOCK_TICKS
+            entry.cpu_percent = (
+                max(0, cpu_ticks - entry.cpu_ticks) / elapsed_ticks * 100
+            )
+        if entry.name != name:
+            # exec 之后命令行也会变化
+            entry.cmdline = None
+            self.index.move_name(entry.pid, entry.name, name)
+        if entry.state != state:
+            self.index.move_state(entry.pid, entry.state, state)
+        entry.name = name
+        entry.state = state
+        entry.ppid = ppid
+        entry.cpu_ticks = cpu_ticks
+        entry.threads = threads
+        entry.vms = vms
+        entry.rss = rss * PAGE_SIZE
+        entry.last_time = now
+
+    def scan(self) -> ProcessDiff:
+        """扫描所有进程并更新进程表，返回与上一次扫描相比的变化
+
+        proc connector 已经处理过的启动和退出不会再出现在结果中，
+        因此扫描只补充事件源遗漏的变化（或在事件源不可用时提供全部变化）。
+        """
+        now = time.monotonic()
+        table: dict[int, ProcessEntry] = {}
+        started: list[ProcessEntry] = []
+        reparented: list[tuple[ProcessEntry, int]] = []
+        exiting: dict[int, int] = {}
+        with os.scandir(self.host_proc) as entries:
+            for dir_entry in entries:
+                if not dir_entry.name.isdigit():
+                    continue
+                pid = int(dir_entry.name)
+                parsed = self._read_stat(pid)
+                if parsed is None:
+                    continue
+                start_ticks = parsed[5]
+                if self._exited.get(pid) == start_ticks:
+                    # 已收到退出事件但尚未被父进程回收的僵尸进程
+                    exiting[pid] = start_ticks
+                    continue
+
+                entry = self._table.get(pid)
+                if entry is None or entry.start_ticks != start_ticks:
+                    # 新进程或PID被复用
+                    if entry is not None:
+                        self.index.remove(entry)
+                    entry = ProcessEntry(pid, start_ticks)
+                    started.append(entry)
+                elif entry.ppid != parsed[2]:
+                    # 父进程退出后被 init 或 subreaper 收养
+                    reparented.append((entry, entry.ppid))
+                self._update(entry, parsed, now)
+                table[pid] = entry
+
+        # 已退出或PID被复用的旧进程实例
+        exited = [e for pid, e in self._table.items() if table.get(pid) is not e]
+        for entry in exited:
+            if entry.pid not in table:
+                self.index.remove(entry)
+        self._table = table
+        self._exited = exiting
+        first_scan = self.last_scan is None
+        self.last_scan = now
+
+        diff = ProcessDiff(started, exited, reparented)
+        self.tree.apply(diff)
+        if not first_scan:
+            for entry in started:
+                self.events.append(
+                    "start", entry.pid, "scan", ppid=entry.ppid, name=entry.name
+                )
+            for entry in exited:
+                self.events.append(
+                    "exit", entry.pid, "scan", ppid=entry.ppid, name=entry.name
+                )
+        return diff
+
+    def _load(self, pid: int) -> ProcessEntry | None:
+        """立即读取单个进程并更新进程表和父子进程索引"""
+        parsed = self._read_stat(pid)
+        if parsed is None:
+            return None
+        entry = self._table.get(pid)
+        if entry is None or entry.start_ticks != parsed[5]:
+            if entry is not None:
+                self.tree.remove(entry.ppid, pid)
+                self.index.remove(entry)
+            entry = ProcessEntry(pid, parsed[5])
+            self.tree.add(parsed[2], pid)
+        elif entry.ppid != parsed[2]:
+            self.tree.remove(entry.ppid, pid)
+            self.tree.add(parsed[2], pid)
+        self._update(entry, parsed, time.monotonic())
+        self._table[pid] = entry
+        return entry
+
+    def handle_event(self, event: ConnectorEvent):
+        """根据 proc connector 事件实时更新进程表，只处理进程级（非线程）事件"""
+        if event.pid != event.tgid:
+            return
+        if event.what == PROC_EVENT_FORK:
+            self._load(event.pid)
+        elif event.what == PROC_EVENT_EXEC:
+            entry = self._load(event.pid)
+            if entry is None:
+                self.events.append("exec", event.pid, "netlink")
+                return
+            # 短命进程可能很快退出，exec 时立即读取命令行
+            entry.cmdline = self._read_cmdline(event.pid)
+            self.events.append(
+                "exec",
+                event.pid,
+                "netlink",
+                ppid=entry.ppid,
+                name=entry.name,
+                cmdline=entry.cmdline,
+            )
+        elif event.what == PROC_EVENT_EXIT:
+            entry = self._table.pop(event.pid, None)
+            if entry is not None:
+                self.tree.remove(entry.ppid, entry.pid)
+                self.index.remove(entry)
+                self._exited[entry.pid] = entry.start_ticks
+            self.events.append(
+                "exit",
+                event.pid,
+                "netlink",
+                ppid=entry.ppid if entry else None,
+                name=entry.name if entry else None,
+                cmdline=entry.cmdline if entry else None,
+                exit_code=event.exit_code,
+            )
+
+    def _user(self, uid: int) -> str:
+        user = self._users.get(uid)
+        if user is None:
+            try:
+                user = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                user = str(uid)
+            self._users[uid] = user
+        return user
+
+    def _uid(self, entry: ProcessEntry) -> int | None:
+        """进程的属主UID，每个进程实例只读取一次"""
+        if entry.uid is None:
+            try:
+                entry.uid = os.stat(f"{self.host_proc}/{entry.pid}").st_uid
+            except OSError:
+                pass
+        return entry.uid
+
+    def _count_fds(self, pid: int) -> int | None:
+        try:
+            return len(os.listdir(f"{self.host_proc}/{pid}/fd"))
+        except OSError:
+            # 没有权限读取其他用户的 fd 目录
+            return None
+
+    def _read_cmdline(self, pid: int) -> str:
+        try:
+            with open(f"{self.host_proc}/{pid}/cmdline", "rb") as f:
+                return (
+                    f.read().rstrip(b"\0").replace(b"\0", b" ").decode(errors="replace")
+                )
+        except OSError:
+            return ""
+
+    def _to_model(
+        self, entry: ProcessEntry, memory_total: int, detailed: bool
+    ) -> ProcessInfo:
+        info = ProcessInfo(
+            pid=entry.pid,
+            name=entry.name,
+            cpuPercent=round(entry.cpu_percent, 2),
+            memoryPercent=entry.rss / memory_total * 100 if memory_total else 0.0,
+            status=PROC_STATES.get(entry.state, entry.state.decode()),
+            ppid=entry.ppid,
+            rss=entry.rss,
+            vms=entry.vms,
+            threads=entry.threads,
+            startTime=int((self._boot_time + entry.start_ticks / CLOCK_TICKS) * 1000),
+        )
+        if not detailed:
+            if entry.uid is not None:
+                info.user = self._user(entry.uid)
+            return info
+
+        now = time.monotonic()
+        uid = self._uid(entry)
+        if entry.cmdline is None:
+            entry.cmdline = self._read_cmdline(entry.pid)
+        info.user = self._user(uid) if uid is not None else None
+        info.cmdline = entry.cmdline
+        info.fds = self._count_fds(entry.pid)
+
+        io = _read_io(f"{self.host_proc}/{entry.pid}/io")
+        if io is not None:
+            info.readBytes, info.writeBytes = io
+            # io 只在进程进入 Top-N 或被请求时读取，速率按上一次读取的时间计算
+            if entry.last_io is not None:
+                last_read, last_write, last_time = entry.last_io
+                elapsed = now - last_time
+                if elapsed > 0:
+                    info.readRate = max(0, io[0] - last_read) / elapsed
+                    info.writeRate = max(0, io[1] - last_write) / elapsed
+            entry.last_io = (io[0], io[1], now)
+        return info
+
+    def top(
+        self,
+        limit: int = 30,
+        sort: str = "cpu",
+        pids: list[int] | None = None,
+    ) -> list[ProcessInfo]:
+        """返回按CPU或内存排序的Top-N进程及显式请求的进程，均附带详细字段"""
+        memory_total = self._memory_total()
+        entries = list(self._table.values())
+        if sort == "memory":
+            entries.sort(key=lambda e: e.rss, reverse=True)
+        else:
+            entries.sort(key=lambda e: e.cpu_percent, reverse=True)
+
+        selected = entries[:limit]
+        seen = {e.pid for e in selected}
+        for pid in pids or ():
+            entry = self._table.get(pid)
+            if entry is not None and pid not in seen:
+                selected.append(entry)
+                seen.add(pid)
+        return [self._to_model(e, memory_total, detailed=True) for e in selected]
+
+    def detail(self, pid: int) -> ProcessInfo | None:
+        """返回单个进程的详细信息"""
+        entry = self._table.get(pid)
+        if entry is None:
+            return None
+        return self._to_model(entry, self._memory_total(), detailed=True)
+
+    def search(
+        self,
+        name: str | None = None,
+        regex: bool = False,
+        user: str | None = None,
+        states: list[str] | None = None,
+        min_cpu: float | None = None,
+        min_memory: float | None = None,
+        sort: str = "cpu",
+        offset: int = 0,
+        limit: int = 50,
+    ) -> ProcessSearchResult:
+        """在当前进程表中搜索进程，不触发新的扫描
+
+        名称和状态条件先通过倒排索引缩小候选集合，再按用户、CPU和内存过滤。
+        regex 为 True 时 name 按正则表达式匹配，非法的正则会抛出 re.error。
+        """
+        table = self._table
+        candidates: set[int] | None = None
+        if name:
+            candidates = self.index.match_names(name, regex)
+        if states:
+            codes = [code for code, state in PROC_STATES.items() if state in states]
+            by_state = set().union(*(self.index.by_state.get(c, ()) for c in codes))
+            candidates = by_state if candidates is None else candidates & by_state
+
+        if candidates is None:
+            entries = list(table.values())
+        else:
+            entries = [table[pid] for pid in candidates if pid in table]
+
+        memory_total = self._memory_total()
+        if min_cpu is not None:
+            entries = [e for e in entries if e.cpu_percent >= min_cpu]
+        if min_memory is not None and memory_total:
+            min_rss = min_memory / 100 * memory_total
+            entries = [e for e in entries if e.rss >= min_rss]
+        if user is not None:
+            uid = self._resolve_uid(user)
+            entries = [e for e in entries if uid is not None and self._uid(e) == uid]
+
+        if sort == "memory":
+            entries.sort(key=lambda e: e.rss, reverse=True)
+        elif sort == "pid":
+            entries.sort(key=lambda e: e.pid)
+        elif sort == "name":
+            entries.sort(key=lambda e: (e.name.lower(), e.pid))
+        else:
+            entries.sort(key=lambda e: e.cpu_percent, reverse=True)
+
+        page = entries[offset : offset + limit]
+        return ProcessSearchResult(
+            total=len(entries),
+            offset=offset,
+            limit=limit,
+            processes=[self._to_model(e, memory_total, detailed=False) for e in page],
+            timestamp=int(time.time() * 1000),
+        )
+
+    def _resolve_uid(self, user: str) -> int | None:
+        if user.isdigit():
+            return int(user)
+        try:
+            return pwd.getpwnam(user).pw_uid
+        except KeyError:
+            return None
+
+    def tree_view(
+        self, root: int | None = None, depth: int | None = None
+    ) -> list[TreeNode]:
+        """根据父子进程索引构建进程树，每个节点附带子树的CPU和内存汇总
+
+        未指定 root 时返回所有顶层进程；depth 只限制返回的层数，
+        子树汇总始终包含全部后代进程。
+        """
+        table = self._table
+        memory_total = self._memory_total()
+        roots = [root] if root is not None else self.tree.roots(table)
+
+        # 迭代遍历，避免很深的进程链超出递归限制
+        order: list[tuple[int, int]] = []
+        visited: set[int] = set()
+        stack = [(pid, 0) for pid in roots if pid in table]
+        while stack:
+            pid, level = stack.pop()
+            if pid in visited:
+                continue
+            visited.add(pid)
+            order.append((pid, level))
+            for child in self.tree.children(pid):
+                if child in table:
+                    stack.append((child, level + 1))
+
+        totals: dict[int, tuple[float, int, int]] = {}
+        nodes: dict[int, TreeNode] = {}
+        children_of = self.tree.children
+        for pid, level in reversed(order):
+            entry = table[pid]
+            cpu, rss, count = entry.cpu_percent, entry.rss, 1
+            children = []
+            for child in children_of(pid):
+                child_totals = totals.get(child)
+                if child_totals is None:
+                    continue
+                cpu += child_totals[0]
+                rss += child_totals[1]
+                count += child_totals[2]
+                if child in nodes:
+                    children.append(nodes[child])
+            totals[pid] = (cpu, rss, count)
+            if depth is not None and level > depth:
+                continue
+
+            if len(children) > 1:
+                children.sort(key=_subtree_cpu, reverse=True)
+            nodes[pid] = TreeNode(
+                pid=pid,
+                name=entry.name,
+                status=PROC_STATES.get(entry.state) or entry.state.decode(),
+                cpuPercent=round(entry.cpu_percent, 2),
+                memoryPercent=entry.rss / memory_total * 100 if memory_total else 0.0,
+                rss=entry.rss,
+                subtreeCpuPercent=round(cpu, 2),
+                subtreeMemoryPercent=rss / memory_total * 100 if memory_total else 0.0,
+                subtreeRss=rss,
+                subtreeProcesses=count,
+                children=children,
+            )
+
+        result = [nodes[pid] for pid in roots if pid in nodes]
+        result.sort(key=_subtree_cpu, reverse=True)
+        return result
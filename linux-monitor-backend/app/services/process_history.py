@@ -0,0 +1,178 @@
+import heapq
+from array import array
+from collections import OrderedDict
+
+from ..core.logging_config import get_logger
+from ..models.monitor import ProcessHistorySeries
+from .process_collector import ProcessEntry
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+
+class ProcessSeries:
+    """单个进程实例的固定容量环形缓冲区（时间戳、CPU%、RSS）"""
+
+    __slots__ = (
+        "pid",
+        "start_ticks",
+        "name",
+        "timestamps",
+        "cpu",
+        "rss",
+        "_next",
+        "_size",
+    )
+
+    def __init__(self, pid: int, start_ticks: int, capacity: int):
+        self.pid = pid
+        self.start_ticks = start_ticks
+        self.name = ""
+        self.timestamps = array("q", bytes(8 * capacity))
+        self.cpu = array("d", bytes(8 * capacity))
+        self.rss = array("Q", bytes(8 * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: int, cpu: float, rss: int):
+        i = self._next
+        self.timestamps[i] = timestamp
+        self.cpu[i] = cpu
+        self.rss[i] = rss
+        capacity = len(self.timestamps)
+        self._next = (i + 1) % capacity
+        self._size = min(self._size + 1, capacity)
+
+    def _ordered(self, column: array) -> list:
+        """按时间顺序返回某一列"""
+        if self._size < len(column):
+            return column[: self._size].tolist()
+        return column[self._next :].tolist() + column[: self._next].tolist()
+
+    def to_model(self, pinned: bool, since: int | None = None) -> ProcessHistorySeries:
+        timestamps = self._ordered(self.timestamps)
+        cpu = self._ordered(self.cpu)
+        rss = self._ordered(self.rss)
+        if since is not None:
+            # 时间戳单调递增，找到第一个不早于 since 的位置
+            start = next(
+                (i for i, t in enumerate(timestamps) if t >= since), len(timestamps)
+            )
+            timestamps, cpu, rss = timestamps[start:], cpu[start:], rss[start:]
+        return ProcessHistorySeries(
+            pid=self.pid,
+            name=self.name,
+            pinned=pinned,
+            timestamps=timestamps,
+            cpu=[round(c, 2) for c in cpu],
+            rss=rss,
+        )
+
+
+class ProcessHistory:
+    """Top 消耗进程的历史序列
+
+    每个采样周期为CPU和RSS的 Top-K 进程以及被固定的进程追加一个采样，
+    序列按 (pid, 启动时间) 区分进程实例。进程退出时立即丢弃其序列；
+    离开 Top 集合的序列保留到总数超过 max_tracked 时按最近最少使用淘汰。
+    固定的进程最多 max_pinned 个（默认为 max_tracked 减去两个 Top-K 集合），
+    它们占用 max_tracked 的名额，因此内存上限约为 max_tracked × capacity × 24 字节。
+    """
+
+    def __init__(
+        self,
+        capacity: int = 200,
+        top_k: int = 10,
+        max_tracked: int = 50,
+        max_pinned: int | None = None,
+    ):
+        self.capacity = capacity
+        self.top_k = top_k
+        max_tracked = max(max_tracked, 2 * top_k)
+        if max_pinned is None:
+            max_pinned = max_tracked - 2 * top_k
+        self.max_pinned = max(max_pinned, 0)
+        # 每个周期两个 Top-K 集合加上所有固定的进程都能同时保留
+        self.max_tracked = max(max_tracked, 2 * top_k + self.max_pinned)
+        self._series: OrderedDict[tuple[int, int], ProcessSeries] = OrderedDict()
+        self._pinned: set[tuple[int, int]] = set()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def pin(self, entry: ProcessEntry) -> bool:
+        """固定进程，固定数量已达 max_pinned 时返回 False"""
+        key = (entry.pid, entry.start_ticks)
+        if key not in self._pinned and len(self._pinned) >= self.max_pinned:
+            return False
+        self._pinned.add(key)
+        return True
+
+    def is_pinned(self, entry: ProcessEntry) -> bool:
+        return (entry.pid, entry.start_ticks) in self._pinned
+
+    def unpin(self, pid: int):
+        self._pinned = {key for key in self._pinned if key[0] != pid}
+
+    def record(self, table: dict[int, ProcessEntry], timestamp: int):
+        """根据当前进程表记录一个采样周期"""
+        values = table.values()
+        tracked = heapq.nlargest(self.top_k, values, key=lambda e: e.cpu_percent)
+        tracked += heapq.nlargest(self.top_k, values, key=lambda e: e.rss)
+
+        # 固定的进程退出后取消固定
+        alive_pins = set()
+        for pid, start_ticks in self._pinned:
+            entry = table.get(pid)
+            if entry is not None and entry.start_ticks == start_ticks:
+                alive_pins.add((pid, start_ticks))
+                tracked.append(entry)
+        self._pinned = alive_pins
+
+        # 同时进入CPU和RSS Top-K 的进程只记录一次
+        for key, entry in {(e.pid, e.start_ticks): e for e in tracked}.items():
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ProcessSeries(
+                    entry.pid, entry.start_ticks, self.capacity
+                )
+            series.name = entry.name
+            series.append(timestamp, entry.cpu_percent, entry.rss)
+            self._series.move_to_end(key)
+
+        self._evict(table)
+
+    def _evict(self, table: dict[int, ProcessEntry]):
+        for key in list(self._series):
+            entry = table.get(key[0])
+            if entry is None or entry.start_ticks != key[1]:
+                del self._series[key]
+
+        # 固定的序列同样占用 max_tracked 的名额但不会被淘汰，超出的部分从
+        # OrderedDict 头部（最久未进入 Top 集合的序列）开始淘汰
+        excess = len(self._series) - self.max_tracked
+        for key in list(self._series):
+            if excess <= 0:
+                break
+            if key not in self._pinned:
+                del self._series[key]
+                excess -= 1
+
+    def get(
+        self, entry: ProcessEntry, since: int | None = None
+    ) -> ProcessHistorySeries | None:
+        key = (entry.pid, entry.start_ticks)
+        series = self._series.get(key)
+        if series is None:
+            return None
+        return series.to_model(key in self._pinned, since)
+
+    def all(self, since: int | None = None) -> list[ProcessHistorySeries]:
+        """返回所有正在跟踪的序列，最近进入 Top 集合的在前"""
+        return [
+            series.to_model(key in self._pinned, since)
+            for key, series in reversed(self._series.items())
+        ]
@@ -0,0 +1,62 @@
+import os
+
+
+class ProcFile:
+    """预先打开的 /proc 或 /sys 文件
+
+    文件描述符只打开一次，每次读取时seek到开头重新读取，
+    避免每个采样周期都重复 open/close。读取失败时会自动重新打开一次。
+    """
+
+    __slots__ = ("path", "_fd", "_bufsize")
+
+    def __init__(self, path: str, bufsize: int = 4096):
+        self.path = path
+        self._fd: int | None = None
+        self._bufsize = bufsize
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+        return self._fd
+
+    @property
+    def fd(self) -> int:
+        return self._open()
+
+    def _read_all(self) -> bytes:
+        fd = self._open()
+        os.lseek(fd, 0, os.SEEK_SET)
+        chunks = []
+        while True:
+            chunk = os.read(fd, self._bufsize)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            # 下次直接用足够大的缓冲区一次读完
+            if len(chunk) == self._bufsize:
+                self._bufsize *= 2
+        return b"".join(chunks)
+
+    def read(self) -> bytes:
+        """从头重新读取文件的全部内容"""
+        try:
+            return self._read_all()
+        except OSError:
+            # 文件被替换或描述符失效时重新打开
+            self.close()
+            return self._read_all()
+
+    def read_text(self) -> str:
+        return self.read().decode("utf-8", "replace")
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import time
+
+from pydantic import TypeAdapter
+
+from ..core.logging_config import get_logger, setup_logging
+from ..core.perf import perf
+from ..models.monitor import AnomalyAnnotation, MonitorData, ProcessEvent, ProcessInfo
+from .monitor_service import MonitorService
+from .shared_snapshot import SnapshotSegment
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# 随每次采样发布给 worker 的最近进程事件条数
+PUBLISHED_EVENTS = 256
+
+
+# 列表主题的序列化器，与模型的 model_dump_json() 一样直接编码为 JSON
+PROCESS_LIST = TypeAdapter(list[ProcessInfo])
+ANOMALY_LIST = TypeAdapter(list[AnomalyAnnotation])
+EVENT_LIST = TypeAdapter(list[ProcessEvent])
+
+
+def encode_topics(data: MonitorData) -> dict[str, str]:
+    """把一次采样按主题编码为 JSON，WebSocket 和 SSE 推送时直接拼接
+
+    直接由 pydantic 的序列化器输出 JSON，不经过 model_dump() 生成的中间字典。
+    """
+    with perf.timer("sample.encode"):
+        return {
+            "system": data.system.model_dump_json(),
+            "cpu": data.cpu.model_dump_json(),
+            "memory": data.memory.model_dump_json(),
+            "disk": data.disk.model_dump_json(),
+            "network": data.network.model_dump_json(),
+            "processes": PROCESS_LIST.dump_json(data.processes).decode(),
+            "anomalies": ANOMALY_LIST.dump_json(data.anomalies).decode(),
+        }
+
+
+class Sampler:
+    """所有推送客户端共享的采样节拍
+
+    每个周期只调用一次 get_all_monitor_data()，WebSocket 等订阅者
+    通过 next() 等待新的采样结果，而不是每个连接各自采集一次。
+    没有订阅者且 idle_timeout 内没有 HTTP 轮询时暂停采集并取消
+    proc connector 订阅，有新的订阅或轮询时恢复。
+    """
+
+    def __init__(self, service: MonitorService, interval: float = 3.0):
+        self.service = service
+        self.governor = service.governor
+        self.interval = interval
+        self.latest: MonitorData | None = None
+        self.seq = 0
+        self._encoded: tuple[int, dict[str, str]] = (0, {})
+        self.paused = True
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+        self._changed: asyncio.Condition | None = None
+
+    def ensure_started(self):
+        """在当前事件循环上启动采样任务（已在运行时不做任何事）"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is loop
+        ):
+            return
+        # 同步原语绑定到创建它们的事件循环，随任务一起重新创建
+        self._wake = asyncio.Event()
+        self._changed = asyncio.Condition()
+        self.paused = True
+        self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if not self.paused:
+            self.service.stop_process_events(asyncio.get_running_loop())
+            self.paused = True
+
+    def _notify_activity(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    def touch(self, at: float | None = None):
+        """记录一次 HTTP 轮询，采样器处于暂停状态时将其唤醒"""
+        self.governor.touch(at)
+        self._notify_activity()
+
+    def subscribe(self):
+        self.governor.subscribe()
+        self.ensure_started()
+        self._notify_activity()
+
+    def unsubscribe(self):
+        self.governor.unsubscribe()
+
+    async def _wait(self, seq: int) -> int:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.seq > seq)
+            return self.seq
+
+    async def next(self, seq: int) -> tuple[int, MonitorData]:
+        """等待序号大于 seq 的采样结果"""
+        seq = await self._wait(seq)
+        return seq, self.latest_data()
+
+    async def next_encoded(self, seq: int) -> tuple[int, dict[str, str]]:
+        """等待序号大于 seq 的采样结果，返回按主题编码好的 JSON"""
+        seq = await self._wait(seq)
+        return seq, self.encoded()
+
+    def latest_data(self) -> MonitorData | None:
+        return self.latest
+
+    def encoded(self) -> dict[str, str]:
+        """最近一次采样按主题编码的 JSON，同一序号只编码一次"""
+        if self._encoded[0] != self.seq:
+            self._encoded = (self.seq, encode_topics(self.latest))
+        return self._encoded[1]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.governor.active:
+                if not self.paused:
+                    logger.info("没有订阅者和轮询请求，暂停采集")
+                    self.service.stop_process_events(loop)
+                    self.paused = True
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            if self.paused:
+                logger.info("恢复采集")
+                self.governor.reset()
+                self.service.start_process_events(loop)
+                self.paused = False
+
+            started = loop.time()
+            try:
+                data = self.service.get_all_monitor_data()
+                self.governor.observe()
+                self.latest = data
+                self.seq += 1
+                async with self._changed:
+                    self._changed.notify_all()
+            except Exception as e:
+                logger.error(f"采样失败: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+
+class SharedSampler(Sampler):
+    """多 worker 模式下跟随共享内存快照的采样器
+
+    采样由单独的采样进程（run_publisher）完成，这里只轮询共享内存段的序号，
+    有新采样时读出按主题编码好的 JSON 并通知订阅者，同时把进程事件和指标
+    历史同步到本 worker 的 MonitorService，使 /processes/events 和 /history
+    与单进程模式一致。本 worker 的轮询和订阅写入段内的活动时间，采样进程据此
+    决定是否暂停采集。
+
+    本 worker 的序号与段内序号分开计数，采样进程重启（段内代数变化）后
+    从头读取段内序号，同步的进程事件序号接在已有事件之后，订阅者不受影响。
+    """
+
+    def __init__(self, service: MonitorService, segment: str, interval: float = 3.0):
+        super().__init__(service, interval)
+        self.segment = SnapshotSegment.attach(segment)
+        # 采样进程代数、已读取的段内序号和同步进程事件时的序号偏移
+        self._epoch = self.segment.epoch
+        self._cursor = 0
+        self._event_offset = 0
+        self._decoded: tuple[int, MonitorData | None] = (0, None)
+        self._sections: dict[str, str] = {}
+        self._updated = 0.0
+        # 轮询间隔远小于采样间隔，新采样最多延迟一个轮询周期
+        self._poll = min(0.1, interval / 10)
+
+    def touch(self, at: float | None = None):
+        self.governor.touch(at)
+        self.segment.touch()
+
+    def subscribe(self):
+        self.governor.subscribe()
+        self.segment.touch()
+        self.ensure_started()
+
+    @property
+    def fresh(self) -> bool:
+        """最近两个采样周期内是否读到过新采样（采样进程可能因空闲而暂停）"""
+        return bool(self.seq) and time.monotonic() - self._updated < 2 * self.interval
+
+    def encoded(self) -> dict[str, str]:
+        return self._sections
+
+    def latest_data(self) -> MonitorData | None:
+        """按需把共享快照解码为 MonitorData，同一序号只解码一次"""
+        if self._decoded[0] != self.seq:
+            fields = ", ".join(
+                f'"{name}": {self._sections[name]}'
+                for name in MonitorData.model_fields
+                if name in self._sections
+            )
+            self._decoded = (self.seq, MonitorData.model_validate_json(f"{{{fields}}}"))
+        return self._decoded[1]
+
+    def _mirror(self, sections: dict[str, str]):
+        offset = self._event_offset
+        self.service.process_collector.events.extend(
+            ProcessEvent(**{**item, "seq": item["seq"] + offset})
+            for item in json.loads(sections.get("process_events", "[]"))
+        )
+        history = json.loads(sections.get("history", "null"))
+        if history is not None:
+            anomalies = [
+                AnomalyAnnotation(**item)
+                for item in json.loads(sections.get("anomalies", "[]"))
+            ]
+            self.service.history.append(history, anomalies)
+
+    async def _run(self):
+        while True:
+            try:
+                epoch = self.segment.epoch
+                if epoch != self._epoch:
+                    if self._cursor:
+                        logger.info("采样进程已重启，序号从头开始")
+                    self._epoch = epoch
+                    self._cursor = 0
+                    self._event_offset = self.service.process_events_seq
+                result = self.segment.read(self._cursor)
+                if result is not None:
+                    self._cursor, self._sections = result
+                    self._updated = time.monotonic()
+                    self.seq += 1
+                    self._mirror(self._sections)
+                    async with self._changed:
+                        self._changed.notify_all()
+                    # 有订阅者时持续标记活动，采样进程不会暂停
+                    if self.governor.subscribers:
+                        self.segment.touch()
+            except Exception as e:
+                logger.error(f"读取共享采样快照失败: {e}")
+            await asyncio.sleep(self._poll)
+
+
+async def publish(segment_name: str, interval: float = 3.0):
+    """采样进程主循环：采样并把每次结果写入共享内存段"""
+    service = MonitorService()
+    sampler = Sampler(service, interval)
+    segment = SnapshotSegment.attach(segment_name)
+    segment.restart()
+    sampler.ensure_started()
+    logger.info(f"采样进程已启动，写入共享内存段 {segment_name}")
+    seq = 0
+    last_activity = 0.0
+    # 发布最近两个周期的进程事件，worker 偶尔错过一次读取也不会丢事件
+    event_marks = [0, 0]
+    try:
+        while True:
+            # 把 worker 记录的最近一次轮询或订阅活动同步给本进程的调节器
+            activity = segment.last_activity
+            if activity > last_activity:
+                last_activity = activity
+                sampler.touch(activity)
+            try:
+                seq, encoded = await asyncio.wait_for(sampler.next_encoded(seq), 1.0)
+            except asyncio.TimeoutError:
+                continue
+            events = service.get_process_events(event_marks[0])[-PUBLISHED_EVENTS:]
+            samples = service.history.get_samples(limit=1)
+            sections = dict(encoded)
+            sections["process_events"] = EVENT_LIST.dump_json(events).decode()
+            sections["history"] = json.dumps(samples[-1] if samples else None)
+            segment.write(seq, sections)
+            event_marks = [event_marks[1], service.process_events_seq]
+    finally:
+        await sampler.stop()
+        segment.close()
+
+
+def run_publisher(segment_name: str, interval: float = 3.0):
+    """采样进程入口（multiprocessing 的 target）"""
+    setup_logging()
+    try:
+        asyncio.run(publish(segment_name, interval))
+    except KeyboardInterrupt:
+        pass
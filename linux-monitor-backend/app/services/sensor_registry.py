@@ -0,0 +1,150 @@
+import glob
+import os
+import re
+import time
+
+from ..core.logging_config import get_logger
+from ..models.monitor import TemperatureReading
+from .procfs import ProcFile
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# 合理的温度范围（摄氏度），超出范围的读数视为无效
+MIN_VALID_TEMP = 10.0
+MAX_VALID_TEMP = 120.0
+
+# 属于CPU的 hwmon 驱动
+CPU_HWMON_DRIVERS = frozenset({"coretemp", "k10temp", "zenpower", "cpu_thermal"})
+
+# 代表CPU封装温度的 thermal zone 类型
+PACKAGE_ZONE_TYPES = frozenset({"x86_pkg_temp", "cpu-thermal", "cpu_thermal"})
+
+_TEMP_INPUT = re.compile(r"temp(\d+)_input$")
+
+
+def _read_text(path: str) -> str | None:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _classify_hwmon(driver: str, label: str) -> str:
+    """根据驱动名和标签判断传感器类别：package / core / other"""
+    if driver not in CPU_HWMON_DRIVERS:
+        return "other"
+    if label.startswith(("Package id", "Tctl", "Tdie", "Physical id")):
+        return "package"
+    if label.startswith(("Core ", "Tccd")):
+        return "core"
+    # cpu_thermal 等只有一个输入的驱动，直接视为封装温度
+    return "package" if driver == "cpu_thermal" else "core"
+
+
+class Sensor:
+    __slots__ = ("file", "label", "source", "kind")
+
+    def __init__(self, path: str, label: str, source: str, kind: str):
+        self.file = ProcFile(path, bufsize=32)
+        self.label = label
+        self.source = source
+        self.kind = kind
+
+
+class SensorRegistry:
+    """温度传感器注册表
+
+    启动时一次性发现所有 thermal zone 和 hwmon 温度输入及其标签，
+    之后每个采样周期只重新读取已知的文件描述符；只有到达重新扫描间隔
+    时才重新扫描 sysfs，读取失败的传感器在下次扫描前会被跳过。
+    """
+
+    def __init__(self, host_sys: str = "/sys", rescan_interval: float = 600.0):
+        self.host_sys = host_sys
+        self.rescan_interval = rescan_interval
+        self._sensors: list[Sensor] = []
+        self._last_scan: float | None = None
+
+    def _discover_hwmon(self) -> list[Sensor]:
+        sensors = []
+        for hwmon_dir in sorted(glob.glob(f"{self.host_sys}/class/hwmon/hwmon*")):
+            driver = _read_text(f"{hwmon_dir}/name") or os.path.basename(hwmon_dir)
+            # 部分驱动把输入放在 device 子目录下
+            for base in (hwmon_dir, f"{hwmon_dir}/device"):
+                for input_path in sorted(glob.glob(f"{base}/temp*_input")):
+                    match = _TEMP_INPUT.search(input_path)
+                    if not match:
+                        continue
+                    index = match.group(1)
+                    label = _read_text(f"{base}/temp{index}_label") or f"temp{index}"
+                    kind = _classify_hwmon(driver, label)
+                    sensors.append(Sensor(input_path, label, driver, kind))
+        return sensors
+
+    def _discover_thermal_zones(self) -> list[Sensor]:
+        sensors = []
+        pattern = f"{self.host_sys}/class/thermal/thermal_zone*"
+        for zone_dir in sorted(glob.glob(pattern)):
+            zone_type = _read_text(f"{zone_dir}/type") or os.path.basename(zone_dir)
+            kind = "package" if zone_type in PACKAGE_ZONE_TYPES else "zone"
+            sensors.append(
+                Sensor(f"{zone_dir}/temp", os.path.basename(zone_dir), zone_type, kind)
+            )
+        return sensors
+
+    def discover(self):
+        """扫描 sysfs，重建传感器列表"""
+        for sensor in self._sensors:
+            sensor.file.close()
+        self._sensors = self._discover_hwmon() + self._discover_thermal_zones()
+        self._last_scan = time.monotonic()
+        logger.debug(f"发现 {len(self._sensors)} 个温度传感器")
+
+    def read(self) -> list[TemperatureReading]:
+        """读取所有已知传感器的当前温度"""
+        if (
+            self._last_scan is None
+            or time.monotonic() - self._last_scan >= self.rescan_interval
+        ):
+            self.discover()
+
+        readings = []
+        failed = []
+        for sensor in self._sensors:
+            try:
+                # 温度以毫摄氏度存储
+                value = int(sensor.file.read()) / 1000.0
+            except (OSError, ValueError):
+                failed.append(sensor)
+                continue
+            if MIN_VALID_TEMP <= value <= MAX_VALID_TEMP:
+                readings.append(
+                    TemperatureReading(
+                        label=sensor.label,
+                        source=sensor.source,
+                        kind=sensor.kind,
+                        value=value,
+                    )
+                )
+
+        if failed:
+            # 读取失败的传感器（被移除或不支持读取）在下次重新扫描前不再读取
+            for sensor in failed:
+                sensor.file.close()
+                self._sensors.remove(sensor)
+            logger.debug(f"移除 {len(failed)} 个无法读取的温度传感器")
+        return readings
+
+    @staticmethod
+    def cpu_temperature(readings: list[TemperatureReading]) -> float | None:
+        """从读数中选出代表CPU的温度：优先封装温度，否则取核心温度最大值"""
+        for reading in readings:
+            if reading.kind == "package":
+                return reading.value
+        cores = [r.value for r in readings if r.kind == "core"]
+        if cores:
+            return max(cores)
+        zones = [r.value for r in readings if r.kind == "zone"]
+        return zones[0] if zones else None
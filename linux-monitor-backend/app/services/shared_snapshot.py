@@ -0,0 +1,181 @@
+import mmap
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+
+from ..core.logging_config import get_logger
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+MAGIC = b"LMSNAP01"
+# 段头：magic、槽容量、最新序号、最新槽位、最近活动时间（monotonic）、采样进程代数
+HEADER = struct.Struct("<8sQQQdQ")
+HEADER_SIZE = 64
+# 槽头：seqlock 计数（写入期间为奇数）、采样序号、主题数
+SLOT_HEADER = struct.Struct("<QQI")
+SLOT_HEADER_SIZE = 24
+# 主题索引：名称、数据偏移（相对槽起始）、长度
+INDEX_ENTRY = struct.Struct("<16sII")
+SLOTS = 2
+DEFAULT_SLOT_SIZE = 4 << 20
+
+
+class SnapshotSegment:
+    """多个进程共享的最新采样结果
+
+    采样进程把每次采样按主题编码好的 JSON 写入共享内存，所有 worker 直接读取，
+    不需要各自采集和编码。段内有两个槽位轮流写入，每个槽位用 seqlock 保护：
+    写入前把计数加一（奇数），写完再加一（偶数）。读取方复制数据前后计数相同且为
+    偶数才算读到完整的一份，否则重试；由于写入的总是另一个槽位，正常情况下
+    读取方不会与写入方冲突。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        buf: memoryview,
+        shm: shared_memory.SharedMemory | None = None,
+        mapping: mmap.mmap | None = None,
+    ):
+        self.name = name
+        self.buf = buf
+        self._shm = shm
+        self._mapping = mapping
+        magic, self.slot_size, _, _, _, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"共享内存段 {name} 不是采样快照")
+
+    @classmethod
+    def create(
+        cls, name: str | None = None, slot_size: int = DEFAULT_SLOT_SIZE
+    ) -> "SnapshotSegment":
+        """创建共享内存段，创建者退出时负责删除"""
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=HEADER_SIZE + SLOTS * slot_size
+        )
+        HEADER.pack_into(shm.buf, 0, MAGIC, slot_size, 0, 0, 0.0, 0)
+        for slot in range(SLOTS):
+            SLOT_HEADER.pack_into(shm.buf, HEADER_SIZE + slot * slot_size, 0, 0, 0)
+        return cls(shm.name, shm.buf, shm=shm)
+
+    @classmethod
+    def attach(cls, name: str) -> "SnapshotSegment":
+        """附加到已有的共享内存段
+
+        直接映射 /dev/shm 下的文件而不是使用 SharedMemory，后者会把段登记到
+        resource_tracker，附加进程退出时段会被删除。
+        """
+        fd = os.open(os.path.join("/dev/shm", name.lstrip("/")), os.O_RDWR)
+        try:
+            mapping = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+        return cls(name, memoryview(mapping), mapping=mapping)
+
+    @property
+    def seq(self) -> int:
+        return struct.unpack_from("<Q", self.buf, 16)[0]
+
+    @property
+    def epoch(self) -> int:
+        """采样进程代数，每次采样进程启动时加一"""
+        return struct.unpack_from("<Q", self.buf, 40)[0]
+
+    def restart(self):
+        """采样进程启动时调用：序号从头开始，并递增代数通知 worker
+
+        先清零序号再递增代数，worker 看到新的代数时不会再读到上一代的采样。
+        """
+        struct.pack_into("<QQ", self.buf, 16, 0, 0)
+        struct.pack_into("<Q", self.buf, 40, self.epoch + 1)
+
+    def _slot_offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self.slot_size
+
+    def write(self, seq: int, sections: dict[str, str]) -> bool:
+        """写入一次采样，超出槽容量时丢弃并返回 False"""
+        encoded = [(name.encode(), data.encode()) for name, data in sections.items()]
+        index_size = INDEX_ENTRY.size * len(encoded)
+        total = SLOT_HEADER_SIZE + index_size + sum(len(d) for _, d in encoded)
+        if total > self.slot_size:
+            logger.error(
+                f"采样数据 {total} 字节超过共享内存槽容量 {self.slot_size} 字节，已丢弃"
+            )
+            return False
+
+        latest_slot = struct.unpack_from("<Q", self.buf, 24)[0]
+        slot = (latest_slot + 1) % SLOTS if self.seq else 0
+        base = self._slot_offset(slot)
+        generation = struct.unpack_from("<Q", self.buf, base)[0]
+
+        struct.pack_into("<Q", self.buf, base, generation + 1)
+        offset = SLOT_HEADER_SIZE + index_size
+        for i, (name, data) in enumerate(encoded):
+            INDEX_ENTRY.pack_into(
+                self.buf,
+                base + SLOT_HEADER_SIZE + i * INDEX_ENTRY.size,
+                name,
+                offset,
+                len(data),
+            )
+            self.buf[base + offset : base + offset + len(data)] = data
+            offset += len(data)
+        struct.pack_into("<QI", self.buf, base + 8, seq, len(encoded))
+        struct.pack_into("<Q", self.buf, base, generation + 2)
+
+        # 先切换槽位再发布序号，读取方看到新序号时新槽位已经可读
+        struct.pack_into("<Q", self.buf, 24, slot)
+        struct.pack_into("<Q", self.buf, 16, seq)
+        return True
+
+    def read(
+        self, after: int = 0, retries: int = 8
+    ) -> tuple[int, dict[str, str]] | None:
+        """读取序号大于 after 的最新采样，没有新采样时返回 None"""
+        for _ in range(retries):
+            if self.seq <= after:
+                return None
+            slot = struct.unpack_from("<Q", self.buf, 24)[0]
+            base = self._slot_offset(slot)
+            generation, seq, count = SLOT_HEADER.unpack_from(self.buf, base)
+            if generation % 2:
+                time.sleep(0)
+                continue
+            sections = {}
+            for i in range(count):
+                name, offset, length = INDEX_ENTRY.unpack_from(
+                    self.buf, base + SLOT_HEADER_SIZE + i * INDEX_ENTRY.size
+                )
+                # 从共享内存直接解码为 str，只复制一次
+                sections[name.rstrip(b"\0").decode()] = str(
+                    self.buf[base + offset : base + offset + length], "utf-8"
+                )
+            if struct.unpack_from("<Q", self.buf, base)[0] == generation:
+                return seq, sections
+        logger.warning("读取共享采样快照时与写入冲突，稍后重试")
+        return None
+
+    def touch(self):
+        """记录一次客户端活动，采样进程据此决定是否暂停采集"""
+        struct.pack_into("<d", self.buf, 32, time.monotonic())
+
+    @property
+    def last_activity(self) -> float:
+        return struct.unpack_from("<d", self.buf, 32)[0]
+
+    def close(self):
+        self.buf.release()
+        if self._mapping is not None:
+            self._mapping.close()
+        if self._shm is not None:
+            self._shm.close()
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def default_segment_name() -> str:
+    return f"linux-monitor-{os.getpid()}"
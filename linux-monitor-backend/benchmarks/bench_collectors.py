@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+采集器基准测试
+
+在合成的 /proc 和 /sys 目录树（见 synthetic_host.py）上运行 MonitorService，
+测量每个采集器和完整采样周期的耗时、单个采样周期（含推送编码）占用的CPU时间、
+WebSocket 消息编码耗时以及内存占用，
+并与 baseline.json 中同一规模的基线比较，任何一项超过基线 --tolerance 倍时
+以非零状态退出。
+
+基线与运行机器有关，更换机器或有意改变性能特征后用 --update-baseline 重新生成。
+
+用法:
+    python benchmarks/bench_collectors.py --processes 2000 --sockets 5000
+    python benchmarks/bench_collectors.py --processes 10000
+    python benchmarks/bench_collectors.py --update-baseline
+    python benchmarks/bench_collectors.py --replay capture.tar.xz
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.host_capture import ReplayHost  # noqa: E402
+from app.services.sampler import encode_topics  # noqa: E402
+from benchmarks.synthetic_host import SyntheticHost  # noqa: E402
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+# 分别计时的采集阶段
+STAGES = {
+    "system": lambda service: service.get_system_info(),
+    "cpu": lambda service: service.get_cpu_info(),
+    "memory": lambda service: service.get_memory_info(),
+    "disk": lambda service: service.get_disk_info(),
+    "network": lambda service: service.get_network_info(),
+    "network.talkers": lambda service: service.get_top_talkers(),
+    "interrupts": lambda service: service.get_interrupts_info(),
+    "processes": lambda service: service.get_processes_info(),
+    "processes.search": lambda service: service.search_processes(name="java"),
+    # 包含接口层的编码，整棵树每个进程一个节点
+    "processes.tree": lambda service: [
+        node.to_json() for node in service.get_process_tree()
+    ],
+    "containers": lambda service: service.get_containers_info(),
+}
+
+# 低于该差值（毫秒）的变化视为噪声，不判定为退化
+MIN_DELTA_MS = 0.1
+# 低于该差值（KB）的内存变化视为噪声
+MIN_DELTA_KB = 256
+
+
+def encode(data) -> dict[str, str]:
+    """与 WebSocket、SSE 推送时相同的编码方式：每个采样周期按主题编码一次"""
+    return encode_topics(data)
+
+
+def run_tick(
+    service, host: SyntheticHost | ReplayHost, durations: dict[str, list[float]]
+):
+    host.advance()
+    for name, stage in STAGES.items():
+        start = time.perf_counter()
+        stage(service)
+        durations[name].append((time.perf_counter() - start) * 1000)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    data = service.get_all_monitor_data()
+    durations["tick"].append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    encode(data)
+    durations["ws.encode"].append((time.perf_counter() - start) * 1000)
+    durations["tick.cpu"].append((time.process_time() - cpu_start) * 1000)
+
+
+def measure_time(
+    host: SyntheticHost | ReplayHost, ticks: int, warmup: int
+) -> dict[str, dict]:
+    from app.services.monitor_service import MonitorService
+
+    service = MonitorService()
+    durations: dict[str, list[float]] = {
+        name: [] for name in [*STAGES, "tick", "ws.encode", "tick.cpu"]
+    }
+    for _ in range(warmup):
+        run_tick(service, host, durations)
+    for values in durations.values():
+        values.clear()
+    for _ in range(ticks):
+        run_tick(service, host, durations)
+
+    results = {}
+    for name, values in durations.items():
+        values.sort()
+        results[name] = {
+            "median": round(statistics.median(values), 3),
+            "p95": round(values[max(0, int(len(values) * 0.95) - 1)], 3),
+        }
+    return results
+
+
+def measure_memory(host: SyntheticHost | ReplayHost, warmup: int) -> dict[str, int]:
+    """返回预热后服务常驻的内存和单个采样周期的临时内存峰值（KB）"""
+    from app.services.monitor_service import MonitorService
+
+    durations: dict[str, list[float]] = {
+        name: [] for name in [*STAGES, "tick", "ws.encode", "tick.cpu"]
+    }
+    tracemalloc.start()
+    try:
+        service = MonitorService()
+        for _ in range(warmup):
+            run_tick(service, host, durations)
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run_tick(service, host, durations)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"retained": retained // 1024, "tickPeak": max(0, peak - retained) // 1024}
+
+
+def compare(
+    results: dict, baseline: dict, tolerance: float
+) -> list[tuple[str, float, float]]:
+    """返回超过基线 tolerance 倍的指标 (名称, 基线, 当前值)"""
+    regressions = []
+    for name, current in results["time"].items():
+        expected = baseline.get("time", {}).get(name)
+        if expected is None:
+            continue
+        value, limit = current["median"], expected["median"]
+        if value > limit * tolerance and value - limit > MIN_DELTA_MS:
+            regressions.append((f"{name} (ms)", limit, value))
+    for name, value in results["memory"].items():
+        limit = baseline.get("memory", {}).get(name)
+        if limit is None:
+            continue
+        if value > limit * tolerance and value - limit > MIN_DELTA_KB:
+            regressions.append((f"memory.{name} (KB)", limit, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="采集器基准测试")
+    parser.add_argument("--processes", type=int, default=2000, help="进程数")
+    parser.add_argument("--sockets", type=int, default=5000, help="TCP socket 数")
+    parser.add_argument("--interfaces", type=int, default=16, help="网络接口数")
+    parser.add_argument("--disks", type=int, default=8, help="块设备数")
+    parser.add_argument("--cgroups", type=int, default=100, help="容器 cgroup 数")
+    parser.add_argument("--cpus", type=int, default=16, help="CPU 核心数")
+    parser.add_argument("--ticks", type=int, default=20, help="计时的采样周期数")
+    parser.add_argument("--warmup", type=int, default=3, help="预热的采样周期数")
+    parser.add_argument(
+        "--tolerance", type=float, default=1.5, help="超过基线多少倍判定为退化"
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="基线文件路径")
+    parser.add_argument(
+        "--replay",
+        metavar="ARCHIVE",
+        help="使用 run.py --capture 记录的归档代替合成数据（忽略规模参数）",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="用本次结果更新基线"
+    )
+    args = parser.parse_args()
+
+    scale = (
+        f"p{args.processes}-s{args.sockets}-i{args.interfaces}"
+        f"-d{args.disks}-c{args.cgroups}-cpu{args.cpus}"
+    )
+
+    if args.replay:
+        scale = f"replay-{os.path.basename(args.replay)}"
+
+    with tempfile.TemporaryDirectory() as root:
+        if args.replay:
+            host = ReplayHost(args.replay, root)
+            host.advance()
+        else:
+            host = SyntheticHost(
+                root,
+                processes=args.processes,
+                sockets=args.sockets,
+                interfaces=args.interfaces,
+                disks=args.disks,
+                cgroups=args.cgroups,
+                cpus=args.cpus,
+            ).build()
+        # MonitorService 在构造时读取这两个环境变量
+        os.environ["HOST_PROC"] = host.proc
+        os.environ["HOST_SYS"] = host.sys
+
+        results = {
+            "time": measure_time(host, args.ticks, args.warmup),
+            "memory": measure_memory(host, args.warmup),
+        }
+
+    print(f"规模 {scale}，{args.ticks} 个采样周期")
+    for name, values in results["time"].items():
+        print(
+            f"  {name:<18} 中位数 {values['median']:9.3f} ms  p95 {values['p95']:9.3f} ms"
+        )
+    print(
+        f"  {'内存':<16} 常驻 {results['memory']['retained']} KB  "
+        f"单周期峰值 {results['memory']['tickPeak']} KB"
+    )
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        baselines[scale] = results
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"基线已更新: {args.baseline}")
+        return
+
+    baseline = baselines.get(scale)
+    if baseline is None:
+        print(f"没有规模 {scale} 的基线，使用 --update-baseline 生成")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"性能退化（超过基线 {args.tolerance:g} 倍）:")
+        for name, expected, value in regressions:
+            print(f"  {name}: 基线 {expected} -> 当前 {value}")
+        sys.exit(1)
+    print("未发现性能退化")
+
+
+if __name__ == "__main__":
+    main()
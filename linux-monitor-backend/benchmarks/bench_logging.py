@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+日志开销基准测试
+
+模拟一个采样周期内监控服务在事件循环中输出的 INFO 日志，
+对比同步写控制台和两个 RotatingFileHandler 与队列异步输出（可选限频）
+时每个周期的耗时。
+
+用法:
+    python benchmarks/bench_logging.py --ticks 2000 --messages 8
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logging_config import (  # noqa: E402
+    get_hot_path_logger,
+    install_queue_handlers,
+    uninstall_queue_handlers,
+)
+
+
+def build_logger(name: str, log_dir: str) -> logging.Logger:
+    """按 config/logging.yaml 的结构创建处理器：控制台 + 普通日志文件 + 错误日志文件"""
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    console = logging.StreamHandler(open(os.devnull, "w"))
+    file = RotatingFileHandler(
+        os.path.join(log_dir, f"{name}.log"), maxBytes=10485760, backupCount=5
+    )
+    error_file = RotatingFileHandler(
+        os.path.join(log_dir, f"{name}-error.log"), maxBytes=10485760, backupCount=5
+    )
+    error_file.setLevel(logging.ERROR)
+    logger = logging.getLogger(f"app.bench.{name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in (console, file, error_file):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
+
+def run_ticks(logger: logging.Logger, ticks: int, messages: int) -> list[float]:
+    """返回每个周期的耗时（微秒），日志经由热点路径子日志记录器输出"""
+    hot_logger = get_hot_path_logger(logger.name)
+    durations = []
+    for tick in range(ticks):
+        start = time.perf_counter()
+        for i in range(messages):
+            hot_logger.info(f"进程数据已更新，缓存了 {tick + i} 个进程")
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return durations
+
+
+def report(label: str, durations: list[float]):
+    durations = sorted(durations)
+    p99 = durations[int(len(durations) * 0.99) - 1]
+    print(
+        f"{label:<12} 平均 {statistics.mean(durations):8.1f} µs/周期  "
+        f"p50 {statistics.median(durations):8.1f} µs  p99 {p99:8.1f} µs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志开销基准测试")
+    parser.add_argument("--ticks", type=int, default=2000, help="采样周期数")
+    parser.add_argument("--messages", type=int, default=8, help="每个周期的日志条数")
+    parser.add_argument(
+        "--rate-limit", type=float, default=60.0, help="限频模式的最小输出间隔（秒）"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        sync_logger = build_logger("sync", log_dir)
+        report("同步", run_ticks(sync_logger, args.ticks, args.messages))
+
+        queue_logger = build_logger("queue", log_dir)
+        listener = install_queue_handlers([queue_logger])
+        report("队列", run_ticks(queue_logger, args.ticks, args.messages))
+        uninstall_queue_handlers(listener)
+
+        limited_logger = build_logger("limited", log_dir)
+        listener = install_queue_handlers([limited_logger], rate_limit=args.rate_limit)
+        report("队列+限频", run_ticks(limited_logger, args.ticks, args.messages))
+        uninstall_queue_handlers(listener)
+
+
+if __name__ == "__main__":
+    main()
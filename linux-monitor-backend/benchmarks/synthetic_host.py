@@ -0,0 +1,379 @@
+"""
+合成的 /proc 和 /sys 目录树
+
+按给定规模生成监控服务各采集器读取的文件（进程、TCP socket、网络接口、
+块设备、cgroup v2 容器和温度传感器），通过 HOST_PROC / HOST_SYS 让
+MonitorService 读取它们，基准测试和测试因此不依赖运行机器上的真实负载。
+"""
+
+import os
+import random
+
+# 生成的进程 pid 从这里开始，1 为 init
+FIRST_PID = 100
+# 合成主机的启动时间（/proc/stat 的 btime）
+BOOT_TIME = 1_700_000_000
+
+PROCESS_NAMES = ("nginx", "postgres", "python3", "java", "node", "sshd", "bash")
+TCP_STATES = ("01", "01", "01", "06", "08", "0A")
+# /proc/[pid]/stat 中 rss 之后的字段，采集器不使用
+STAT_TAIL = " 0" * 28
+
+
+class SyntheticHost:
+    """在 root 下生成 proc/ 和 sys/，advance() 推进所有计数器模拟一个采样周期"""
+
+    def __init__(
+        self,
+        root: str,
+        processes: int = 1000,
+        sockets: int = 2000,
+        interfaces: int = 8,
+        disks: int = 4,
+        cgroups: int = 50,
+        cpus: int = 8,
+        seed: int = 0,
+    ):
+        self.root = root
+        self.proc = os.path.join(root, "proc")
+        self.sys = os.path.join(root, "sys")
+        self.processes = processes
+        self.sockets = sockets
+        self.interfaces = interfaces
+        self.disks = disks
+        self.cgroups = cgroups
+        self.cpus = cpus
+        self.tick = 0
+        self._random = random.Random(seed)
+        self._pids = [1] + list(range(FIRST_PID, FIRST_PID + processes - 1))
+        self._ppids: dict[int, int] = {}
+        self._cgroup_paths: list[str] = []
+
+    def build(self) -> "SyntheticHost":
+        for path in ("net", "pressure", "self", "sys"):
+            os.makedirs(os.path.join(self.proc, path), exist_ok=True)
+        os.makedirs(os.path.join(self.sys, "block"), exist_ok=True)
+
+        self._write(
+            "proc/meminfo",
+            "MemTotal:       65536000 kB\n"
+            "MemFree:        16384000 kB\n"
+            "MemAvailable:   32768000 kB\n"
+            "Buffers:          512000 kB\n"
+            "Cached:         12288000 kB\n"
+            "SwapTotal:       8192000 kB\n"
+            "SwapFree:        8000000 kB\n"
+            "Shmem:            256000 kB\n"
+            "Slab:             800000 kB\n"
+            "SReclaimable:     600000 kB\n"
+            "HugePages_Total:       0\n"
+            "HugePages_Free:        0\n"
+            "Hugepagesize:       2048 kB\n",
+        )
+        self._write(
+            "proc/cpuinfo",
+            "".join(
+                f"processor\t: {cpu}\nmodel name\t: Synthetic CPU\n"
+                f"cpu MHz\t\t: 2400.000\n\n"
+                for cpu in range(self.cpus)
+            ),
+        )
+        for resource in ("cpu", "memory", "io"):
+            self._write(
+                f"proc/pressure/{resource}",
+                "some avg10=0.50 avg60=0.40 avg300=0.30 total=1000000\n"
+                "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n",
+            )
+        self._build_processes()
+        self._build_sockets()
+        self._build_disks()
+        self._build_cgroups()
+        self._build_sensors()
+        self._build_topology()
+        self.advance()
+        return self
+
+    def _write(self, rel_path: str, content: str):
+        # 原地覆盖而不是替换文件，采集器预先打开的描述符保持有效
+        with open(os.path.join(self.root, rel_path), "w") as f:
+            f.write(content)
+
+    def _build_processes(self):
+        for i, pid in enumerate(self._pids):
+            # 前几个进程挂在 init 下，其余随机挂在更早的进程下形成多层树
+            self._ppids[pid] = (
+                0
+                if pid == 1
+                else self._random.choice(self._pids[: max(1, min(i, 20 + i // 4))])
+            )
+            base = os.path.join(self.proc, str(pid))
+            os.makedirs(os.path.join(base, "fd"), exist_ok=True)
+            name = "init" if pid == 1 else PROCESS_NAMES[pid % len(PROCESS_NAMES)]
+            with open(os.path.join(base, "comm"), "w") as f:
+                f.write(f"{name}\n")
+            with open(os.path.join(base, "cmdline"), "wb") as f:
+                f.write(f"/usr/bin/{name}\0--worker\0{pid}\0".encode())
+            with open(os.path.join(base, "io"), "w") as f:
+                f.write(f"read_bytes: {pid * 4096}\nwrite_bytes: {pid * 1024}\n")
+
+    def _build_sockets(self):
+        tcp = [
+            "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when "
+            "retrnsmt   uid  timeout inode"
+        ]
+        for i in range(self.sockets):
+            inode = 100_000 + i
+            state = TCP_STATES[i % len(TCP_STATES)]
+            local = f"0100007F:{(8000 + i % 50):04X}"
+            if state == "0A":
+                remote = "00000000:0000"
+            else:
+                # 远端集中在少量地址上，模拟 Top talkers
+                host = self._random.randrange(1, 1 + max(1, self.sockets // 20))
+                remote = f"{host:02X}00000A:{self._random.randrange(1024, 65535):04X}"
+            tcp.append(
+                f"{i:4d}: {local} {remote} {state} 00000000:00000000 "
+                f"00:00000000 00000000  1000        0 {inode} 1 0 100 0 0 10 0"
+            )
+            pid = self._pids[i % len(self._pids)]
+            os.symlink(
+                f"socket:[{inode}]", os.path.join(self.proc, str(pid), "fd", str(i))
+            )
+        self._write("proc/net/tcp", "\n".join(tcp) + "\n")
+        for name in ("tcp6", "udp", "udp6"):
+            self._write(f"proc/net/{name}", tcp[0] + "\n")
+
+    def _build_disks(self):
+        mounts = []
+        for i in range(self.disks):
+            disk = f"sd{chr(ord('a') + i % 26)}{i // 26 or ''}"
+            os.makedirs(os.path.join(self.sys, "block", disk), exist_ok=True)
+            mountpoint = os.path.join(self.root, "mnt", disk)
+            os.makedirs(mountpoint, exist_ok=True)
+            mounts.append(
+                f"{30 + i} 1 8:{i * 16} / {mountpoint} rw,relatime - ext4 "
+                f"/dev/{disk}1 rw"
+            )
+        mounts.append(f"{30 + self.disks} 1 0:22 / /proc rw - proc proc rw")
+        self._write("proc/self/mountinfo", "\n".join(mounts) + "\n")
+
+    def _build_cgroups(self):
+        root = os.path.join(self.sys, "fs", "cgroup")
+        os.makedirs(os.path.join(root, "system.slice"), exist_ok=True)
+        with open(os.path.join(root, "cgroup.controllers"), "w") as f:
+            f.write("cpu io memory pids\n")
+        with open(os.path.join(root, "cgroup.stat"), "w") as f:
+            f.write(f"nr_descendants {self.cgroups + 1}\nnr_dying_descendants 0\n")
+        for i in range(self.cgroups):
+            container_id = f"{i:064x}"
+            path = os.path.join(root, "system.slice", f"docker-{container_id}.scope")
+            os.makedirs(path, exist_ok=True)
+            for name, value in (
+                ("memory.max", "max" if i % 2 else str(1 << 30)),
+                ("pids.current", str(1 + i % 30)),
+                ("io.stat", f"8:0 rbytes={i * 4096} wbytes={i * 8192} rios=1 wios=1"),
+            ):
+                with open(os.path.join(path, name), "w") as f:
+                    f.write(value + "\n")
+            self._cgroup_paths.append(path)
+
+    def _build_sensors(self):
+        hwmon = os.path.join(self.sys, "class", "hwmon", "hwmon0")
+        os.makedirs(hwmon, exist_ok=True)
+        with open(os.path.join(hwmon, "name"), "w") as f:
+            f.write("coretemp\n")
+        for i in range(1, self.cpus + 2):
+            label = "Package id 0" if i == 1 else f"Core {i - 2}"
+            with open(os.path.join(hwmon, f"temp{i}_label"), "w") as f:
+                f.write(label + "\n")
+            with open(os.path.join(hwmon, f"temp{i}_input"), "w") as f:
+                f.write(f"{45000 + i * 500}\n")
+
+    def _numa_nodes(self) -> list[range]:
+        """两个 NUMA 节点（每个封装一个），各占一半 CPU；单核时只有一个节点"""
+        half = max(1, self.cpus // 2)
+        return [
+            range(start, min(start + half, self.cpus))
+            for start in range(0, self.cpus, half)
+        ]
+
+    def _build_topology(self):
+        cpu_root = "sys/devices/system/cpu"
+        os.makedirs(os.path.join(self.root, cpu_root), exist_ok=True)
+        self._write(f"{cpu_root}/online", f"0-{self.cpus - 1}\n")
+        for node, cpus in enumerate(self._numa_nodes()):
+            node_dir = f"sys/devices/system/node/node{node}"
+            os.makedirs(os.path.join(self.root, node_dir), exist_ok=True)
+            self._write(f"{node_dir}/cpulist", f"{cpus.start}-{cpus.stop - 1}\n")
+            self._write(
+                f"{node_dir}/meminfo",
+                "".join(
+                    f"Node {node} {name}: {value:>15} kB\n"
+                    for name, value in (
+                        ("MemTotal", 32768000),
+                        ("MemFree", 8192000 + node * 4096000),
+                        ("MemUsed", 24576000 - node * 4096000),
+                        ("FilePages", 6144000),
+                        ("AnonPages", 12288000),
+                    )
+                )
+                + f"Node {node} HugePages_Total:     0\n"
+                f"Node {node} HugePages_Free:      0\n",
+            )
+            for cpu in cpus:
+                # 相邻的两个逻辑 CPU 是同一物理核心的 SMT 线程
+                sibling = cpu ^ 1 if cpu ^ 1 < self.cpus else cpu
+                topology = f"{cpu_root}/cpu{cpu}/topology"
+                os.makedirs(os.path.join(self.root, topology), exist_ok=True)
+                self._write(f"{topology}/physical_package_id", f"{node}\n")
+                self._write(f"{topology}/core_id", f"{(cpu - cpus.start) // 2}\n")
+                self._write(
+                    f"{topology}/thread_siblings_list",
+                    (
+                        f"{min(cpu, sibling)}-{max(cpu, sibling)}\n"
+                        if sibling != cpu
+                        else f"{cpu}\n"
+                    ),
+                )
+
+    def advance(self):
+        """推进一个采样周期：所有累计计数器按随机增量增长"""
+        self.tick += 1
+        tick = self.tick
+        rnd = self._random
+
+        jiffies = tick * 100
+        lines = [
+            f"cpu  {jiffies * self.cpus} 0 {jiffies * self.cpus // 2} "
+            f"{jiffies * self.cpus * 4} 10 0 5 0 0 0"
+        ]
+        for cpu in range(self.cpus):
+            busy = jiffies + rnd.randrange(50)
+            lines.append(f"cpu{cpu} {busy} 0 {busy // 2} {jiffies * 4} 1 0 1 0 0 0")
+        lines.append(f"intr {tick * 1000}")
+        lines.append(f"ctxt {tick * 5000}")
+        lines.append(f"btime {BOOT_TIME}")
+        lines.append(f"processes {len(self._pids)}")
+        lines.append("procs_running 2")
+        lines.append("procs_blocked 0")
+        self._write("proc/stat", "\n".join(lines) + "\n")
+
+        # 每个网卡一个队列中断，队列 i 固定在 CPU i 上
+        cpus = range(self.cpus)
+        lines = [" " * 11 + "".join(f"CPU{cpu:<8}" for cpu in cpus)]
+        rows = [("0", "IO-APIC   2-edge      timer", lambda cpu: 40 if cpu == 0 else 0)]
+        for i in range(self.interfaces):
+            queue = i % self.cpus
+            rows.append(
+                (
+                    str(40 + i),
+                    f"PCI-MSIX-0000:00:05.0   {i}-edge      eth-rx-{i}",
+                    lambda cpu, queue=queue: (
+                        1000 + rnd.randrange(100) if cpu == queue else 0
+                    ),
+                )
+            )
+        rows.append(("LOC", "Local timer interrupts", lambda cpu: 250))
+        rows.append(("RES", "Rescheduling interrupts", lambda cpu: rnd.randrange(20)))
+        for label, description, rate in rows:
+            counts = "".join(f"{tick * rate(cpu):>11}" for cpu in cpus)
+            lines.append(f"{label:>4}:{counts}  {description}")
+        lines.append(f" ERR:{0:>11}")
+        lines.append(f" MIS:{0:>11}")
+        self._write("proc/interrupts", "\n".join(lines) + "\n")
+
+        lines = [" " * 20 + "".join(f"CPU{cpu:<8}" for cpu in cpus)]
+        for name, rate in (
+            ("TIMER", 250),
+            ("NET_TX", 10),
+            ("NET_RX", 1000),
+            ("RCU", 80),
+        ):
+            counts = "".join(f"{tick * rate:>11}" for cpu in cpus)
+            lines.append(f"{name:>12}:{counts}")
+        self._write("proc/softirqs", "\n".join(lines) + "\n")
+
+        for node in range(len(self._numa_nodes())):
+            hit = tick * 50000
+            other = tick * (500 + node * 4000)
+            self._write(
+                f"sys/devices/system/node/node{node}/numastat",
+                f"numa_hit {hit}\nnuma_miss {other}\nnuma_foreign {other}\n"
+                f"interleave_hit 1024\nlocal_node {hit}\nother_node {other}\n",
+            )
+
+        for i, pid in enumerate(self._pids):
+            name = "init" if pid == 1 else PROCESS_NAMES[pid % len(PROCESS_NAMES)]
+            utime = tick * (i % 7) + rnd.randrange(3)
+            state = "R" if i % 50 == 0 else "S"
+            stat = (
+                f"{pid} ({name}) {state} {self._ppids[pid]} {pid} {pid} 0 -1 4194560 "
+                f"100 0 0 0 {utime} {utime // 3} 0 0 20 0 {1 + i % 8} 0 {1000 + i} "
+                f"{(50 + i % 200) << 20} {1000 + (i * 37) % 50000}" + STAT_TAIL
+            )
+            with open(os.path.join(self.proc, str(pid), "stat"), "w") as f:
+                f.write(stat + "\n")
+
+        net_dev = [
+            "Inter-|   Receive                                                |  "
+            "Transmit",
+            " face |bytes    packets errs drop fifo frame compressed multicast|"
+            "bytes    packets errs drop fifo colls carrier compressed",
+        ]
+        for i in range(self.interfaces):
+            name = "lo" if i == 0 else f"eth{i - 1}"
+            rx = tick * (1_000_000 + i * 1000)
+            tx = tick * (500_000 + i * 1000)
+            net_dev.append(
+                f"{name:>6}: {rx} {rx // 1000} 0 0 0 0 0 0 {tx} {tx // 1000} 0 0 0 0 0 0"
+            )
+        self._write("proc/net/dev", "\n".join(net_dev) + "\n")
+
+        out_segs = tick * 10 * self.sockets
+        self._write(
+            "proc/net/snmp",
+            "Tcp: RtoAlgorithm RtoMin RtoMax MaxConn ActiveOpens PassiveOpens "
+            "AttemptFails EstabResets CurrEstab InSegs OutSegs RetransSegs InErrs "
+            "OutRsts InCsumErrors\n"
+            f"Tcp: 1 200 120000 -1 {tick * 10} {tick * 20} {tick} {tick} "
+            f"{self.sockets // 2} {out_segs} {out_segs} {out_segs // 100} 0 "
+            f"{tick * 3} 0\n"
+            "Udp: InDatagrams NoPorts InErrors OutDatagrams RcvbufErrors "
+            "SndbufErrors InCsumErrors IgnoredMulti MemErrors\n"
+            f"Udp: {tick * 100} {tick} {tick // 10} {tick * 100} {tick // 10} 0 0 0 0\n",
+        )
+        self._write(
+            "proc/net/netstat",
+            "TcpExt: SyncookiesSent SyncookiesRecv ListenOverflows ListenDrops "
+            "TCPTimeouts\n"
+            f"TcpExt: 0 0 {tick // 5} {tick // 5} {tick}\n",
+        )
+        self._write(
+            "proc/net/sockstat",
+            f"sockets: used {self.sockets + 50}\n"
+            f"TCP: inuse {self.sockets // 2} orphan 0 tw {self.sockets // 6} "
+            f"alloc {self.sockets} mem {self.sockets // 10}\n"
+            "UDP: inuse 4 mem 2\nUDPLITE: inuse 0\nRAW: inuse 0\n"
+            "FRAG: inuse 0 memory 0\n",
+        )
+
+        diskstats = []
+        for i in range(self.disks):
+            disk = f"sd{chr(ord('a') + i % 26)}{i // 26 or ''}"
+            ios = tick * (100 + i)
+            diskstats.append(
+                f"   8 {i * 16:7d} {disk} {ios} 0 {ios * 8} {ios // 2} {ios} 0 "
+                f"{ios * 16} {ios // 2} 0 {tick * 10} {ios} 0 0 0 0 0 0"
+            )
+        self._write("proc/diskstats", "\n".join(diskstats) + "\n")
+
+        for i, path in enumerate(self._cgroup_paths):
+            usage = tick * (10_000 + i * 100) + rnd.randrange(1000)
+            with open(os.path.join(path, "cpu.stat"), "w") as f:
+                f.write(
+                    f"usage_usec {usage}\nuser_usec {usage // 2}\n"
+                    f"system_usec {usage // 2}\nnr_periods {tick}\n"
+                    f"nr_throttled {tick // 10}\nthrottled_usec {tick * 10}\n"
+                )
+            with open(os.path.join(path, "memory.current"), "w") as f:
+                f.write(f"{(i + 1) * (1 << 20) + rnd.randrange(1 << 16)}\n")
@@ -6,6 +6,9 @@ Linux系统监控后端服务启动脚本
 import argparse
 import os
 import sys
+import tempfile
+import threading
+import time
 
 import uvicorn
 
@@ -39,9 +42,85 @@ def parse_args():
         choices=["development", "production", "docker"],
         help="运行环境",
     )
+    parser.add_argument(
+        "--capture",
+        type=str,
+        metavar="ARCHIVE",
+        help="记录采集器读取的 /proc、/sys 文件到归档后退出（不启动服务）",
+    )
+    parser.add_argument("--capture-ticks", type=int, default=5, help="记录的采样周期数")
+    parser.add_argument(
+        "--capture-interval", type=float, default=3.0, help="记录的采样间隔（秒）"
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        metavar="ARCHIVE",
+        help="用 --capture 记录的归档代替本机的 /proc 和 /sys 运行服务",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WORKERS", "1")),
+        help="worker 进程数，大于 1 时由单独的采样进程采集并通过共享内存分发给所有 worker",
+    )
     return parser.parse_args()
 
 
+def start_replay(archive_path: str):
+    """展开归档并通过 HOST_PROC/HOST_SYS 让服务读取，后台按记录的间隔循环切换周期"""
+    from app.services.host_capture import ReplayHost
+
+    root = tempfile.mkdtemp(prefix="linux-monitor-replay-")
+    replay = ReplayHost(archive_path, root)
+    replay.advance()
+    # 热重载时服务运行在子进程中，通过环境变量继承重放目录
+    os.environ["HOST_PROC"] = replay.proc
+    os.environ["HOST_SYS"] = replay.sys
+
+    interval = replay.archive.interval()
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            replay.advance()
+
+    threading.Thread(target=loop, name="replay", daemon=True).start()
+    logger.info(
+        f"🔁 重放归档 {archive_path}：{len(replay.archive.ticks)} 个周期，"
+        f"间隔 {interval:.1f} 秒，展开目录 {root}"
+    )
+
+
+def start_publisher():
+    """创建共享内存段并启动唯一的采样进程，worker 通过 SNAPSHOT_SEGMENT 找到该段"""
+    from multiprocessing import get_context
+
+    from app.services.sampler import run_publisher
+    from app.services.shared_snapshot import (
+        DEFAULT_SLOT_SIZE,
+        SnapshotSegment,
+        default_segment_name,
+    )
+
+    segment = SnapshotSegment.create(
+        default_segment_name(),
+        slot_size=int(os.environ.get("SNAPSHOT_SLOT_SIZE", DEFAULT_SLOT_SIZE)),
+    )
+    os.environ["SNAPSHOT_SEGMENT"] = segment.name
+    interval = float(os.environ.get("SAMPLE_INTERVAL", "3"))
+    # spawn 启动，不继承本进程的日志线程等状态
+    process = get_context("spawn").Process(
+        target=run_publisher,
+        args=(segment.name, interval),
+        name="linux-monitor-sampler",
+        daemon=True,
+    )
+    process.start()
+    logger.info(f"🧮 采样进程已启动 (pid {process.pid})，共享内存段 {segment.name}")
+    return process, segment
+
+
 if __name__ == "__main__":
     # 解析命令行参数
     args = parse_args()
@@ -51,6 +130,19 @@ if __name__ == "__main__":
     log_level = args.log_level
     env = args.env
 
+    if args.capture:
+        from app.services.host_capture import capture
+
+        capture(
+            args.capture,
+            ticks=args.capture_ticks,
+            interval=args.capture_interval,
+        )
+        sys.exit(0)
+
+    if args.replay:
+        start_replay(args.replay)
+
     # 根据环境设置日志级别
     if env == "production":
         # 生产环境使用配置文件中的设置
@@ -60,19 +152,37 @@ if __name__ == "__main__":
         log_level = "debug"
         reload = True
 
+    workers = max(1, args.workers)
+    if workers > 1 and reload:
+        logger.warning("多 worker 模式不支持热重载，已关闭热重载")
+        reload = False
+
     logger.info("🚀 启动Linux系统监控后端服务...")
     logger.info(f"📊 API文档: http://{host}:{port}/docs")
     logger.info(f"🔌 WebSocket: ws://{host}:{port}/api/monitor/ws")
     logger.info(f"❤️  健康检查: http://{host}:{port}/health")
     logger.info(f"🌍 运行环境: {env}")
     logger.info(f"📝 日志级别: {log_level}")
+    logger.info(f"👷 Worker 进程数: {workers}")
     logger.info("-" * 50)
 
-    uvicorn.run(
-        "app.main:app",
-        host=host,
-        port=port,
-        reload=reload,
-        log_level=log_level,
-        access_log=True,
-    )
+    publisher = None
+    if workers > 1:
+        publisher = start_publisher()
+
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=host,
+            port=port,
+            reload=reload,
+            workers=workers,
+            log_level=log_level,
+            access_log=True,
+        )
+    finally:
+        if publisher is not None:
+            process, segment = publisher
+            process.terminate()
+            process.join(5)
+            segment.close()
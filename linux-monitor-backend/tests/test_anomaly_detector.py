@@ -0,0 +1,43 @@
+from app.services.anomaly_detector import AnomalyDetector, EwmaDetector
+
+
+def test_ewma_detector_flags_spike():
+    """测试EWMA检测器对突增给出较大的z-score"""
+    detector = EwmaDetector(alpha=0.1, min_std=1.0)
+    for i in range(50):
+        detector.update(10.0 + (i % 3))
+    assert abs(detector.update(11.0)) < 3
+    assert detector.update(90.0) > 10
+
+
+def test_score_batch_matches_online_update():
+    """测试批量打分与逐点更新结果一致"""
+    values = [float(v % 7) for v in range(100)] + [50.0]
+    online = EwmaDetector(alpha=0.2, min_std=0.5)
+    batch = EwmaDetector(alpha=0.2, min_std=0.5)
+
+    online_scores = [online.update(v) for v in values]
+    batch_scores, _ = batch.score_batch(values)
+
+    assert [round(s, 6) for s in online_scores] == [round(s, 6) for s in batch_scores]
+    assert online.mean == batch.mean
+    assert online.count == batch.count
+
+
+def test_anomaly_detector_observe_and_backfill():
+    """测试流式检测与历史回填产生相同的异常标注"""
+    samples = [
+        {"timestamp": i, "cpu": 20.0 + (i % 2), "netUp": 1000.0} for i in range(40)
+    ]
+    samples.append({"timestamp": 40, "cpu": 95.0, "netUp": 1000.0})
+
+    detector = AnomalyDetector(threshold=4.0, warmup=20)
+    live = []
+    for sample in samples:
+        live.extend(detector.observe(sample))
+
+    backfilled = AnomalyDetector(threshold=4.0, warmup=20).backfill(samples)
+
+    assert [a.series for a in live] == ["cpu"]
+    assert live[0].direction == "high"
+    assert [a.model_dump() for a in live] == [a.model_dump() for a in backfilled]
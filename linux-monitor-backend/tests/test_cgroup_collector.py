@@ -0,0 +1,63 @@
+from app.services.cgroup_collector import CgroupCollector
+
+DOCKER_ID = "a" * 64
+POD_ID = "b" * 64
+POD_UID = "1234abcd_5678_90ab_cdef_1234567890ab"
+
+
+def _make_cgroup(path, usage_usec, memory, memory_max="max"):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "cpu.stat").write_text(
+        f"usage_usec {usage_usec}\nuser_usec 0\nsystem_usec 0\n"
+        "nr_periods 10\nnr_throttled 2\nthrottled_usec 500\n"
+    )
+    (path / "memory.current").write_text(f"{memory}\n")
+    (path / "memory.max").write_text(f"{memory_max}\n")
+    (path / "io.stat").write_text("8:0 rbytes=4096 wbytes=8192 rios=1 wios=2\n")
+    (path / "pids.current").write_text("3\n")
+
+
+def _make_tree(root, descendants):
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "cgroup.controllers").write_text("cpu memory io pids\n")
+    (root / "cgroup.stat").write_text(
+        f"nr_descendants {descendants}\nnr_dying_descendants 0\n"
+    )
+
+
+def test_cgroup_collector_top_n_and_incremental_index(tmp_path):
+    """测试容器识别、Top-N排序，以及只有层级变化时才重新扫描"""
+    root = tmp_path / "fs" / "cgroup"
+    _make_tree(root, 4)
+    _make_cgroup(root / "system.slice" / f"docker-{DOCKER_ID}.scope", 1000, 100)
+    pod_dir = (
+        root
+        / "kubepods.slice"
+        / "kubepods-burstable.slice"
+        / f"kubepods-burstable-pod{POD_UID}.slice"
+    )
+    _make_cgroup(pod_dir / f"cri-containerd-{POD_ID}.scope", 1000, 500, "1048576")
+
+    collector = CgroupCollector(host_sys=str(tmp_path), full_rescan_interval=3600)
+    first = collector.collect(sort="memory", limit=10)
+    assert first.total == 2
+    top = first.containers[0]
+    assert top.id == POD_ID[:12]
+    assert top.runtime == "containerd"
+    assert top.pod == POD_UID.replace("_", "-")
+    assert top.memoryMax == 1048576
+    assert first.containers[1].runtime == "docker"
+    assert first.containers[1].memoryMax is None
+
+    # 层级未变化时，新建的目录不会被扫描到
+    _make_cgroup(root / "system.slice" / f"docker-{'c' * 64}.scope", 0, 1)
+    assert collector.collect().total == 2
+
+    # nr_descendants 变化后触发重新扫描
+    _make_tree(root, 5)
+    _make_cgroup(root / "system.slice" / f"docker-{DOCKER_ID}.scope", 2_000_000, 100)
+    result = collector.collect(sort="cpu", limit=1)
+    assert result.total == 3
+    assert len(result.containers) == 1
+    assert result.containers[0].id == DOCKER_ID[:12]
+    assert result.containers[0].cpuPercent > 0
@@ -0,0 +1,70 @@
+import os
+
+from app.services.connection_aggregator import ConnectionAggregator, decode_address
+
+TCP_HEADER = (
+    "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when "
+    "retrnsmt   uid  timeout inode\n"
+)
+TCP6_HEADER = (
+    "  sl  local_address                         remote_address                        "
+    "st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+)
+
+
+def _row(sl, local, remote, state, inode):
+    return (
+        f"   {sl}: {local} {remote} {state} 00000000:00000000 00:00000000 "
+        f"00000000     0        0 {inode} 1 0000000000000000 20 4 0 10 -1\n"
+    )
+
+
+def test_decode_address():
+    """测试 /proc/net/tcp{,6} 小端十六进制地址的解码"""
+    assert decode_address(b"0100007F") == "127.0.0.1"
+    assert decode_address(b"0A00020F") == "15.2.0.10"
+    assert decode_address(b"00000000000000000000000001000000") == "::1"
+
+
+def test_top_talkers(tmp_path):
+    """测试按远端地址和状态聚合，并按所属进程拆分"""
+    net = tmp_path / "net"
+    net.mkdir()
+    rows = [
+        # 监听 socket 不计入
+        _row(0, "00000000:0050", "00000000:0000", "0A", 100),
+        # 10.0.0.1:443 上的3个 ESTABLISHED，两个属于进程 42
+        _row(1, "0F02000A:A000", "0100000A:01BB", "01", 201),
+        _row(2, "0F02000A:A001", "0100000A:01BB", "01", 202),
+        _row(3, "0F02000A:A002", "0100000A:01BB", "01", 203),
+        # TIME_WAIT 没有 inode
+        _row(4, "0F02000A:A003", "0100000A:01BB", "06", 0),
+        _row(5, "0F02000A:A004", "0200000A:0050", "01", 204),
+    ]
+    (net / "tcp").write_text(TCP_HEADER + "".join(rows))
+    (net / "tcp6").write_text(TCP6_HEADER)
+
+    fd_dir = tmp_path / "42" / "fd"
+    fd_dir.mkdir(parents=True)
+    (tmp_path / "42" / "comm").write_text("nginx\n")
+    os.symlink("socket:[201]", fd_dir / "3")
+    os.symlink("socket:[202]", fd_dir / "4")
+
+    aggregator = ConnectionAggregator(host_proc=str(tmp_path))
+    talkers = aggregator.top_talkers(k=10)
+    assert talkers.totalSockets == 5
+
+    entries = [
+        (e.remoteAddress, e.remotePort, e.state, e.pid, e.count)
+        for e in talkers.entries
+    ]
+    assert entries[0] == ("10.0.0.1", 443, "ESTABLISHED", 42, 2)
+    assert ("10.0.0.1", 443, "ESTABLISHED", None, 1) in entries
+    assert ("10.0.0.1", 443, "TIME_WAIT", None, 1) in entries
+    assert talkers.entries[0].process == "nginx"
+
+    # 按IP聚合并过滤状态
+    by_ip = aggregator.top_talkers(k=10, states=["ESTABLISHED"], by_port=False)
+    counts = {(e.remoteAddress, e.pid): e.count for e in by_ip.entries}
+    assert counts == {("10.0.0.1", 42): 2, ("10.0.0.1", None): 1, ("10.0.0.2", None): 1}
+    assert all(e.remotePort is None for e in by_ip.entries)
@@ -0,0 +1,33 @@
+from app.services.cpu_collector import CpuStatCollector
+
+
+def _write_stat(path, total, cores):
+    lines = [f"cpu  {' '.join(map(str, total))} 0 0"]
+    for i, core in enumerate(cores):
+        lines.append(f"cpu{i} {' '.join(map(str, core))} 0 0")
+    lines.append("intr 12345 0 0")
+    lines.append("ctxt 999")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_cpu_stat_collector_modes(tmp_path):
+    """测试从 /proc/stat 一次计算总计和每核的各模式占比"""
+    stat = tmp_path / "stat"
+    # user nice system idle iowait irq softirq steal
+    _write_stat(stat, [0] * 8, [[0] * 8, [0] * 8])
+    collector = CpuStatCollector(host_proc=str(tmp_path))
+    first = collector.collect()
+    assert first.usage == 0.0
+    assert first.cores == [0.0, 0.0]
+
+    _write_stat(
+        stat,
+        [60, 0, 20, 100, 10, 0, 0, 10],
+        [[50, 0, 10, 40, 0, 0, 0, 0], [10, 0, 10, 60, 10, 0, 0, 10]],
+    )
+    times = collector.collect()
+    assert times.usage == 45.0
+    assert times.cores == [60.0, 30.0]
+    assert times.modes["steal"] == 5.0
+    assert times.core_modes["iowait"] == [0.0, 10.0]
+    assert times.core_modes["steal"] == [0.0, 10.0]
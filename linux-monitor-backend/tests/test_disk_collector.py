@@ -0,0 +1,145 @@
+import threading
+
+from app.models.monitor import DiskMount
+from app.services.disk_collector import (
+    STATVFS_WORKERS,
+    DiskCollector,
+    parse_mountinfo,
+)
+
+MOUNTINFO = """\
+23 28 0:22 / /proc rw,relatime - proc proc rw
+28 1 253:1 / / rw,relatime shared:1 - ext4 /dev/vda1 rw
+29 28 253:1 /srv /data\\040dir rw,relatime - ext4 /dev/vda1 rw
+30 28 259:0 / /var/lib/mysql rw,noatime - xfs /dev/nvme0n1 rw
+31 28 0:50 / /mnt/nfs rw,relatime - nfs4 server:/export rw
+32 28 0:24 / /dev/shm rw,relatime - tmpfs tmpfs rw
+33 28 253:1 / /var/lib/docker/bind rw,relatime - ext4 /dev/vda1 rw
+"""
+
+
+def test_parse_mountinfo_filters_pseudo_and_bind_mounts():
+    """测试只保留真实挂载，并对同一设备的绑定挂载去重"""
+    mounts = parse_mountinfo(MOUNTINFO)
+    assert [m.mountpoint for m in mounts] == [
+        "/",
+        "/data dir",
+        "/mnt/nfs",
+        "/var/lib/mysql",
+    ]
+    assert mounts[-1].fstype == "xfs"
+
+
+def _write_diskstats(path, reads, sectors, io_ms):
+    path.write_text(
+        f"   7 0 loop0 5 0 10 0 0 0 0 0 0 0 0 0 0 0 0 0 0\n"
+        f" 259 0 nvme0n1 {reads} 0 {sectors} {reads * 2} {reads} 0 {sectors} "
+        f"{reads * 2} 0 {io_ms} 0 0 0 0 0 0 0\n"
+        f" 259 1 nvme0n1p1 {reads} 0 {sectors} 0 0 0 0 0 0 0 0 0 0 0 0 0 0\n"
+    )
+
+
+def test_collect_devices_rates(tmp_path):
+    """测试根据 /proc/diskstats 计算速率、await和利用率"""
+    proc = tmp_path / "proc"
+    sys_block = tmp_path / "sys" / "block"
+    proc.mkdir()
+    sys_block.mkdir(parents=True)
+    (sys_block / "nvme0n1").mkdir()
+    (sys_block / "loop0").mkdir()
+    (proc / "self").mkdir()
+    (proc / "self" / "mountinfo").write_text(MOUNTINFO)
+
+    collector = DiskCollector(host_proc=str(proc), host_sys=str(tmp_path / "sys"))
+    collector._refresh_mounts()
+
+    _write_diskstats(proc / "diskstats", reads=100, sectors=2048, io_ms=0)
+    first = collector.collect_devices()
+    assert [d.name for d in first] == ["nvme0n1"]
+    assert first[0].readSpeed == 0.0
+
+    collector._last_time -= 1.0
+    _write_diskstats(proc / "diskstats", reads=200, sectors=4096, io_ms=500)
+    device = collector.collect_devices()[0]
+    assert 900 * 1024 < device.readSpeed < 1024 * 1024
+    assert device.awaitMs == 2.0
+    assert 40 < device.utilization <= 50
+
+
+def test_collect_devices_before_mounts(tmp_path):
+    """测试首次采集挂载点之前也只统计整盘设备"""
+    proc = tmp_path / "proc"
+    proc.mkdir()
+    (tmp_path / "sys" / "block" / "nvme0n1").mkdir(parents=True)
+    _write_diskstats(proc / "diskstats", reads=100, sectors=2048, io_ms=0)
+
+    collector = DiskCollector(host_proc=str(proc), host_sys=str(tmp_path / "sys"))
+    assert [d.name for d in collector.collect_devices()] == ["nvme0n1"]
+
+
+def _hanging_collector(tmp_path, monkeypatch, mountpoints, release):
+    """NFS 挂载点的 statvfs 一直阻塞到 release，本地挂载点立即返回调用次数"""
+    lines = []
+    for i, mountpoint in enumerate(mountpoints):
+        if mountpoint.startswith("/mnt/nfs"):
+            lines.append(
+                f"{40 + i} 28 0:{60 + i} / {mountpoint} rw - nfs4 srv:/e{i} rw"
+            )
+        else:
+            lines.append(f"{40 + i} 1 253:{i} / {mountpoint} rw - ext4 /dev/vd{i} rw")
+    proc = tmp_path / "proc"
+    (proc / "self").mkdir(parents=True)
+    (proc / "self" / "mountinfo").write_text("\n".join(lines) + "\n")
+
+    calls = {}
+
+    def fake_statvfs(mount):
+        calls[mount.mountpoint] = calls.get(mount.mountpoint, 0) + 1
+        if mount.fstype == "nfs4":
+            release.wait()
+        return DiskMount(
+            device=mount.device,
+            mountpoint=mount.mountpoint,
+            fstype=mount.fstype,
+            total=100,
+            used=calls[mount.mountpoint],
+            free=0,
+            percent=0.0,
+        )
+
+    collector = DiskCollector(host_proc=str(proc), host_sys=None, statvfs_timeout=0.05)
+    monkeypatch.setattr(collector, "_statvfs", fake_statvfs)
+    return collector, calls
+
+
+def test_hung_mounts_do_not_block_others(tmp_path, monkeypatch):
+    """测试多个挂死的挂载点各只占用一个线程，其余挂载点的用量继续更新"""
+    release = threading.Event()
+    mountpoints = ["/"] + [f"/mnt/nfs{i}" for i in range(6)]
+    collector, calls = _hanging_collector(tmp_path, monkeypatch, mountpoints, release)
+    try:
+        for tick in range(1, 4):
+            mounts = collector.collect_mounts()
+            assert [(m.mountpoint, m.used) for m in mounts] == [("/", tick)]
+        # 挂死的挂载点不会被重复提交
+        assert all(calls.get(f"/mnt/nfs{i}", 0) <= 1 for i in range(6))
+    finally:
+        release.set()
+
+
+def test_mount_queued_behind_hung_mounts(tmp_path, monkeypatch, caplog):
+    """测试排在挂死调用之后的本地挂载点在换用线程池后重新提交，超时只记录一次"""
+    release = threading.Event()
+    mountpoints = [f"/mnt/nfs{i}" for i in range(STATVFS_WORKERS)] + ["/zz"]
+    collector, _ = _hanging_collector(tmp_path, monkeypatch, mountpoints, release)
+    try:
+        # 所有线程都被挂死的调用占用，/zz 排队未执行
+        assert collector.collect_mounts() == []
+        for tick in range(1, 4):
+            mounts = collector.collect_mounts()
+            assert [(m.mountpoint, m.used) for m in mounts] == [("/zz", tick)]
+    finally:
+        release.set()
+
+    timeouts = [r for r in caplog.records if "statvfs 超时" in r.getMessage()]
+    assert len(timeouts) == STATVFS_WORKERS + 1
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+
+from app.services.governor import CollectorGovernor
+from app.services.sampler import Sampler, encode_topics
+
+
+def test_governor_stretches_and_restores_intervals(monkeypatch):
+    """测试自身CPU占用超出预算时放大间隔，有余量时逐步恢复"""
+    clock = {"cpu": 0.0, "wall": 100.0}
+    monkeypatch.setattr(time, "process_time", lambda: clock["cpu"])
+    monkeypatch.setattr(time, "monotonic", lambda: clock["wall"])
+    governor = CollectorGovernor(
+        budget=0.01, intervals={"processes": 3.0}, max_stretch=4.0
+    )
+
+    def tick(cpu_seconds, wall_seconds=3.0):
+        clock["cpu"] += cpu_seconds
+        clock["wall"] += wall_seconds
+        governor.observe()
+
+    governor.observe()
+    tick(0.3)  # 10% 占用
+    assert governor.stretch == 2.0
+    tick(0.3)
+    tick(0.3)
+    assert governor.stretch == 4.0
+    assert governor.interval("processes") == 12.0
+
+    governor.ran("processes")
+    clock["wall"] += 6.0
+    assert not governor.due("processes")
+    assert governor.due("disk")
+
+    for _ in range(10):
+        tick(0.0)
+    assert governor.stretch == 1.0
+    assert governor.due("processes")
+
+
+def test_governor_activity(monkeypatch):
+    """测试订阅者和轮询决定采集是否处于活动状态"""
+    clock = {"wall": 100.0}
+    monkeypatch.setattr(time, "monotonic", lambda: clock["wall"])
+    governor = CollectorGovernor(idle_timeout=30.0)
+    assert not governor.active
+    governor.touch()
+    assert governor.active
+    clock["wall"] += 31
+    assert not governor.active
+    governor.subscribe()
+    assert governor.active
+    governor.unsubscribe()
+    assert not governor.active
+
+
+class _StubService:
+    def __init__(self):
+        self.governor = CollectorGovernor(idle_timeout=0.05)
+        self.samples = 0
+        self.events_running = False
+
+    def get_all_monitor_data(self):
+        self.samples += 1
+        return self.samples
+
+    def start_process_events(self, loop):
+        self.events_running = True
+
+    def stop_process_events(self, loop):
+        self.events_running = False
+
+
+def test_sampler_pauses_without_watchers():
+    """测试共享采样器只在有订阅者或轮询时采集"""
+
+    async def scenario():
+        service = _StubService()
+        sampler = Sampler(service, interval=0.01)
+        sampler.ensure_started()
+        await asyncio.sleep(0.05)
+        assert service.samples == 0
+        assert sampler.paused
+
+        sampler.subscribe()
+        seq, data = await sampler.next(0)
+        assert seq == 1 and data == 1
+        assert service.events_running
+        sampler.unsubscribe()
+
+        # 没有订阅者也没有轮询后暂停，并取消进程事件订阅
+        await asyncio.sleep(0.1)
+        assert sampler.paused
+        assert not service.events_running
+        paused_at = service.samples
+        await asyncio.sleep(0.05)
+        assert service.samples == paused_at
+
+        sampler.touch()
+        await sampler.next(sampler.seq)
+        assert not sampler.paused
+        await sampler.stop()
+        assert not service.events_running
+
+    asyncio.run(scenario())
+
+
+def test_encode_topics_matches_models():
+    """测试按主题直接编码的 JSON 与模型导出的字典一致"""
+    from app.services.monitor_service import MonitorService
+
+    data = MonitorService().get_all_monitor_data()
+    encoded = encode_topics(data)
+    for topic in ("system", "cpu", "memory", "disk", "network"):
+        assert json.loads(encoded[topic]) == getattr(data, topic).model_dump()
+    assert json.loads(encoded["processes"]) == [p.model_dump() for p in data.processes]
+    assert json.loads(encoded["anomalies"]) == [a.model_dump() for a in data.anomalies]
@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.services.history_export import export_history
+from app.services.metric_history import MetricHistory
+
+
+def _sample(i: int) -> dict:
+    return {
+        "timestamp": 1000 * i,
+        "cpu": float(i),
+        "memory": 50.0,
+        "diskRead": 0.0,
+        "diskWrite": 0.0,
+        "netUp": 0.0,
+        "netDown": 0.0,
+    }
+
+
+def test_iter_chunks_range_and_concurrent_appends():
+    """测试分块迭代的时间范围过滤，以及迭代期间旧采样被丢弃的情况"""
+    history = MetricHistory(max_samples=10)
+    for i in range(10):
+        history.append(_sample(i))
+
+    chunks = [[s["timestamp"] for s in c] for c in history.iter_chunks(2000, 7000, 3)]
+    assert chunks == [[2000], [3000, 4000, 5000], [6000, 7000]]
+
+    iterator = history.iter_chunks(chunk_size=4)
+    assert [s["cpu"] for s in next(iterator)] == [0, 1, 2, 3]
+    # 迭代期间追加 6 个采样，4、5 已被丢弃，开始之后追加的不返回
+    for i in range(10, 16):
+        history.append(_sample(i))
+    remaining = [s["cpu"] for chunk in iterator for s in chunk]
+    assert remaining == [6, 7, 8, 9]
+
+
+def test_export_csv_and_ndjson():
+    """测试CSV和NDJSON导出只包含选择的指标"""
+    chunks = [[_sample(1), _sample(2)], [_sample(3)]]
+
+    text = "".join(export_history(iter(chunks), "csv", ["cpu"]))
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows == [
+        ["timestamp", "cpu"],
+        ["1000", "1.0"],
+        ["2000", "2.0"],
+        ["3000", "3.0"],
+    ]
+
+    lines = "".join(export_history(iter(chunks), "ndjson", ["cpu", "memory"]))
+    records = [json.loads(line) for line in lines.splitlines()]
+    assert records[2] == {"timestamp": 3000, "cpu": 3.0, "memory": 50.0}
+
+
+def test_export_arrow_stream():
+    """测试Arrow IPC流可以被逐批读取"""
+    pa = pytest.importorskip("pyarrow")
+    chunks = [[_sample(1), _sample(2)], [_sample(3)]]
+    data = b"".join(export_history(iter(chunks), "arrow", ["cpu"]))
+    reader = pa.ipc.open_stream(data)
+    table = reader.read_all()
+    assert table.column_names == ["timestamp", "cpu"]
+    assert table.column("cpu").to_pylist() == [1.0, 2.0, 3.0]
+    assert len(table.to_batches()) == 2
+
+
+def test_export_endpoint():
+    """测试导出接口的流式响应和参数校验"""
+    from fastapi.testclient import TestClient
+
+    from app.api.monitor import monitor_service
+    from app.main import app
+
+    client = TestClient(app)
+    for i in range(5):
+        monitor_service.history.append(_sample(10_000 + i))
+
+    response = client.get(
+        "/api/monitor/history/export?format=ndjson&series=cpu"
+        "&since=10000000&until=10003000&chunk_size=2"
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in response.headers["content-disposition"]
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["cpu"] for r in records] == [10000.0, 10001.0, 10002.0, 10003.0]
+
+    response = client.get("/api/monitor/history/export?series=gpu")
+    assert response.status_code == 400
+    assert response.json()["success"] is False
@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import tarfile
+
+import psutil
+import pytest
+
+from app.services.host_capture import (
+    ARCHIVE_VERSION,
+    HostArchive,
+    HostRecorder,
+    ReplayHost,
+    _add_bytes,
+)
+from benchmarks.synthetic_host import SyntheticHost
+
+
+def test_capture_and_replay(tmp_path, monkeypatch):
+    """测试记录采集器读取的文件并在另一个目录中按周期重放"""
+    from app.services.monitor_service import MonitorService
+
+    host = SyntheticHost(
+        str(tmp_path / "host"), processes=20, sockets=30, interfaces=2, cgroups=2
+    ).build()
+    monkeypatch.setenv("HOST_PROC", host.proc)
+    monkeypatch.setenv("HOST_SYS", host.sys)
+    monkeypatch.setattr(psutil, "PROCFS_PATH", psutil.PROCFS_PATH)
+
+    recorder = HostRecorder(host.proc, host.sys)
+    recorder.start()
+    try:
+        service = MonitorService()
+        service.get_cpu_info()
+        service.get_containers_info()
+        service.get_top_talkers()
+        service.process_collector.scan()
+        recorder.snapshot()
+
+        host.advance()
+        shutil.rmtree(os.path.join(host.proc, "118"))
+        service.process_collector.scan()
+        recorder.snapshot()
+    finally:
+        recorder.stop()
+    archive_path = str(tmp_path / "capture.tar.xz")
+    recorder.write(archive_path)
+
+    archive = HostArchive(archive_path)
+    assert len(archive.ticks) == 2
+    files = archive.ticks[0]["files"]
+    assert {"proc/stat", "proc/118/stat", "proc/net/tcp"} <= set(files)
+    assert any(rel.endswith("/cpu.stat") for rel in files)
+    assert archive.ticks[0]["links"]["proc/100/fd/1"].startswith("socket:[")
+
+    replay = ReplayHost(archive, str(tmp_path / "replay"))
+    replay.advance()
+    with open(os.path.join(host.root, "proc/net/tcp"), "rb") as f:
+        with open(os.path.join(replay.proc, "net/tcp"), "rb") as g:
+            assert f.read() == g.read()
+    assert os.path.exists(os.path.join(replay.proc, "118"))
+
+    monkeypatch.setenv("HOST_PROC", replay.proc)
+    monkeypatch.setenv("HOST_SYS", replay.sys)
+    replayed = MonitorService()
+    replayed.process_collector.scan()
+    assert len(replayed.process_collector.table) == 20
+    assert replayed.get_containers_info().total == 2
+
+    # 第二个周期中退出的进程在重放时也会消失
+    replay.advance()
+    assert not os.path.exists(os.path.join(replay.proc, "118"))
+    replayed.process_collector.scan()
+    assert len(replayed.process_collector.table) == 19
+    # 到达末尾后从第一个周期重新开始
+    replay.advance()
+    assert replay.tick == 0
+
+
+def _write_archive(path, ticks, manifest=True):
+    with tarfile.open(path, "w") as tar:
+        if manifest:
+            _add_bytes(
+                tar,
+                "manifest.json",
+                json.dumps(
+                    {
+                        "version": ARCHIVE_VERSION,
+                        "hostProc": "/proc",
+                        "hostSys": "/sys",
+                        "ticks": ticks,
+                    }
+                ).encode(),
+            )
+        _add_bytes(tar, "blobs/d1", b"pwned\n")
+
+
+def _tick(files=None, links=None, dirs=()):
+    return {"offset": 0.0, "files": files or {}, "links": links or {}, "dirs": dirs}
+
+
+def test_archive_rejects_unsafe_paths(tmp_path):
+    """测试归档中 proc/ 和 sys/ 之外的路径以及缺少 manifest 的归档被拒绝"""
+    path = str(tmp_path / "bad.tar")
+    for rel in ("../../etc/passwd", "/etc/passwd", "proc/../../x", "etc/x"):
+        _write_archive(path, [_tick(files={rel: "d1"})])
+        with pytest.raises(ValueError, match="路径不合法"):
+            HostArchive(path)
+
+    _write_archive(path, [_tick()], manifest=False)
+    with pytest.raises(ValueError, match="manifest.json"):
+        HostArchive(path)
+
+
+def test_replay_does_not_write_through_links(tmp_path):
+    """测试不会经由归档中的符号链接写入重放目录之外"""
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    links = {"proc/x": str(outside)}
+    path = str(tmp_path / "links.tar")
+    _write_archive(
+        path, [_tick(links=links), _tick(files={"proc/x/evil": "d1"}, links=links)]
+    )
+
+    replay = ReplayHost(path, str(tmp_path / "replay"))
+    replay.advance()
+    with pytest.raises(ValueError, match="重放目录之外"):
+        replay.advance()
+    assert list(outside.iterdir()) == []
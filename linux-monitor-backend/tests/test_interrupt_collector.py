@@ -0,0 +1,79 @@
+from app.services.interrupt_collector import InterruptCollector, IrqLayout
+
+# CPU1 离线，表头中只有 CPU0 和 CPU2
+INTERRUPTS = """\
+           CPU0       CPU2
+  0:         {timer}          0   IO-APIC   2-edge      timer
+ 44:          {rx0}        {rx2}   PCI-MSIX-0000:00:05.0   1-edge      virtio4-input.0
+LOC:        {loc}        {loc}   Local timer interrupts
+ ERR:          0
+ MIS:          0
+"""
+
+SOFTIRQS = """\
+                    CPU0       CPU2
+          HI:          0          0
+       TIMER:        {timer}        {timer}
+      NET_RX:        {rx0}        {rx2}
+"""
+
+
+def write_files(root, timer=0, rx0=0, rx2=0, loc=0):
+    (root / "interrupts").write_text(
+        INTERRUPTS.format(timer=timer, rx0=rx0, rx2=rx2, loc=loc)
+    )
+    (root / "softirqs").write_text(SOFTIRQS.format(timer=timer, rx0=rx0, rx2=rx2))
+
+
+def test_layout_rows():
+    """测试布局解析：离线 CPU、只有一个计数的 ERR/MIS 行和描述"""
+    lines = INTERRUPTS.format(timer=1, rx0=2, rx2=3, loc=4).encode().splitlines()
+    layout = IrqLayout(lines)
+    assert layout.cpus == [0, 2]
+    assert layout.labels == [b"0:", b"44:", b"LOC:", b"ERR:", b"MIS:"]
+    assert layout.widths == [2, 2, 2, 1, 1]
+    assert layout.descriptions[1] == "PCI-MSIX-0000:00:05.0 1-edge virtio4-input.0"
+    assert layout.descriptions[3] is None
+    assert list(layout.parse(lines)) == [1, 0, 2, 3, 4, 4, 0, 0, 0, 0]
+
+
+def test_interrupt_collector_rates(tmp_path, monkeypatch):
+    """测试每个 CPU 的速率和最热的中断/CPU 组合"""
+    clock = iter([100.0, 102.0, 104.0])
+    monkeypatch.setattr(
+        "app.services.interrupt_collector.time.monotonic", lambda: next(clock)
+    )
+    write_files(tmp_path)
+    collector = InterruptCollector(host_proc=str(tmp_path))
+    first = collector.collect()
+    assert first.cpus == [0, 2]
+    assert first.hotspots == []
+
+    write_files(tmp_path, timer=20, rx0=2000, rx2=200, loc=500)
+    info = collector.collect(limit=3)
+    assert info.hardirqRates == [1260.0, 350.0]
+    assert info.softirqRates["NET_RX"] == [1000.0, 100.0]
+    assert info.softirqRates["HI"] == [0.0, 0.0]
+    top = info.hotspots[0]
+    assert (top.irq, top.kind, top.cpu, top.rate) == ("44", "hardirq", 0, 1000.0)
+    assert top.description.endswith("virtio4-input.0")
+    assert top.share == 90.9
+    assert len(info.hotspots) == 3
+
+    # 新的中断出现时重新计算布局，本周期不输出速率
+    (tmp_path / "interrupts").write_text(
+        INTERRUPTS.format(timer=40, rx0=4000, rx2=400, loc=1000).replace(
+            "LOC:", " 45:          1          1   PCI-MSIX   2-edge   nvme0q1\nLOC:"
+        )
+    )
+    info = collector.collect()
+    assert info.hardirqRates == [0.0, 0.0]
+    assert collector.hardirqs.layout.labels[2] == b"45:"
+
+
+def test_interrupt_collector_missing_files(tmp_path):
+    """测试文件不存在时返回空结果"""
+    info = InterruptCollector(host_proc=str(tmp_path)).collect()
+    assert info.cpus == []
+    assert info.hardirqRates == []
+    assert info.hotspots == []
@@ -0,0 +1,87 @@
+import logging
+
+from app.core.logging_config import (
+    RateLimitFilter,
+    get_hot_path_logger,
+    install_queue_handlers,
+    uninstall_queue_handlers,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+def test_queue_handlers_keep_routing():
+    """测试改为队列输出后每个日志记录器的处理器集合和级别保持不变"""
+    console, errors = ListHandler(), ListHandler(logging.ERROR)
+    service = logging.getLogger("test.queue.service")
+    api = logging.getLogger("test.queue.api")
+    service.setLevel(logging.INFO)
+    api.setLevel(logging.INFO)
+    service.addHandler(console)
+    api.addHandler(console)
+    api.addHandler(errors)
+
+    listener = install_queue_handlers([service, api])
+    try:
+        service.info("服务日志 %d", 1)
+        api.error("接口错误")
+        api.info("接口日志")
+    finally:
+        uninstall_queue_handlers(listener)
+
+    assert console.messages == ["服务日志 1", "接口错误", "接口日志"]
+    assert errors.messages == ["接口错误"]
+    # 停止后恢复原处理器
+    assert service.handlers == [console]
+    assert api.handlers == [console, errors]
+
+
+def test_rate_limit_filter():
+    """测试同一调用位置的INFO日志被限频，并在下一次输出时附带抑制条数"""
+    rate_filter = RateLimitFilter(interval=60.0)
+
+    def record(level=logging.INFO, lineno=10, name="app.services.x.hot"):
+        return logging.LogRecord(
+            name, level, "x.py", lineno, "进程数据已更新", None, None
+        )
+
+    assert rate_filter.filter(record())
+    assert not rate_filter.filter(record())
+    assert not rate_filter.filter(record())
+    # 其他调用位置、WARNING 及以上级别和非热点路径日志不受影响
+    assert rate_filter.filter(record(lineno=11))
+    assert rate_filter.filter(record(level=logging.WARNING))
+    assert rate_filter.filter(record(name="app.services.x"))
+    assert rate_filter.filter(record(name="app.services.x"))
+
+    rate_filter._state[("x.py", 10)][0] -= 61
+    passed = record()
+    assert rate_filter.filter(passed)
+    assert "另有 2 条" in passed.getMessage()
+
+
+def test_rate_limit_only_hot_path():
+    """测试开启限频后只有热点路径日志被抑制，连接、暂停等生命周期日志照常输出"""
+    handler = ListHandler()
+    logger = logging.getLogger("test.ratelimit.service")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    hot_logger = get_hot_path_logger(logger.name)
+
+    listener = install_queue_handlers([logger], rate_limit=60.0)
+    try:
+        for _ in range(3):
+            hot_logger.info("进程数据已更新")
+            logger.info("恢复采集")
+    finally:
+        uninstall_queue_handlers(listener)
+
+    assert handler.messages == ["进程数据已更新"] + ["恢复采集"] * 3
@@ -1,7 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api.monitor import monitor_service, sampler
 from app.main import app
+from app.services.process_collector import TreeNode
 
 client = TestClient(app)
 
@@ -70,3 +72,275 @@ def test_get_processes_info():
     data = response.json()
     assert data["success"] is True
     assert isinstance(data["data"], list)
+
+
+def test_get_history():
+    """测试获取指标历史"""
+    response = client.get("/api/monitor/history?limit=10")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert isinstance(data["data"]["samples"], list)
+    assert isinstance(data["data"]["annotations"], list)
+
+
+def test_get_containers_info():
+    """测试获取容器资源使用"""
+    response = client.get("/api/monitor/containers?sort=memory&limit=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert isinstance(data["data"]["containers"], list)
+
+
+def test_get_network_interfaces():
+    """测试获取网络接口列表及过滤"""
+    response = client.get("/api/monitor/network/interfaces?up=true")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert all(i["isUp"] for i in data["data"])
+
+
+def test_get_top_talkers():
+    """测试获取按远端地址聚合的连接"""
+    response = client.get("/api/monitor/network/talkers?k=5&state=ESTABLISHED")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert all(e["state"] == "ESTABLISHED" for e in data["data"]["entries"])
+
+
+def test_get_process_detail():
+    """测试获取Top-N进程及单个进程详细信息"""
+    response = client.get("/api/monitor/processes?limit=5&sort=memory")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert len(data["data"]) <= 5
+
+    pid = data["data"][0]["pid"]
+    response = client.get(f"/api/monitor/processes/{pid}")
+    assert response.status_code == 200
+    assert response.json()["data"]["pid"] == pid
+
+
+def test_get_process_tree():
+    """测试获取进程树"""
+    response = client.get("/api/monitor/processes/tree?depth=1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    for node in data["data"]:
+        assert node["subtreeProcesses"] >= 1 + len(node["children"])
+
+
+def test_get_process_events():
+    """测试获取进程事件"""
+    response = client.get("/api/monitor/processes/events?since=0")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert isinstance(data["data"]["events"], list)
+    assert data["data"]["lastSeq"] >= 0
+
+
+def test_search_processes():
+    """测试进程搜索和非法正则"""
+    response = client.get("/api/monitor/processes/search?name=python&limit=10")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["data"]["total"] >= len(data["data"]["processes"])
+
+    response = client.get("/api/monitor/processes/search?name=(&regex=true")
+    assert response.status_code == 400
+
+
+def test_get_process_history():
+    """测试进程历史和固定进程"""
+    import os
+
+    pid = os.getpid()
+    response = client.post(f"/api/monitor/processes/{pid}/pin")
+    assert response.status_code == 200
+    response = client.get(f"/api/monitor/processes/{pid}/history")
+    assert response.status_code == 200
+    assert response.json()["data"]["pinned"] is True
+    response = client.delete(f"/api/monitor/processes/{pid}/pin")
+    assert response.json()["data"]["pinned"] is False
+
+    response = client.get("/api/monitor/processes/history")
+    assert response.status_code == 200
+    assert isinstance(response.json()["data"], list)
+
+
+def test_get_perf_stats():
+    """测试采集器自身耗时统计和 Prometheus 指标"""
+    client.get("/api/monitor/cpu")
+    response = client.get("/debug/perf")
+    assert response.status_code == 200
+    stages = response.json()["data"]["stages"]
+    assert stages["cpu"]["count"] >= 1
+    assert {"p50", "p95", "p99", "errors", "fallbacks"} <= set(stages["cpu"])
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'linux_monitor_stage_seconds_count{stage="cpu"}' in response.text
+
+
+def test_websocket_uses_shared_sampler():
+    """测试 WebSocket 推送来自共享采样器，并在断开后取消订阅"""
+    from app.api.monitor import sampler
+
+    with client.websocket_connect("/api/monitor/ws") as websocket:
+        assert websocket.receive_json()["type"] == "monitor_data"
+        complete = websocket.receive_json()
+        assert "processes" in complete["data"]
+        assert sampler.governor.subscribers == 1
+    assert sampler.governor.subscribers == 0
+    assert sampler.seq >= 1
+
+    response = client.get("/debug/perf")
+    assert "stretch" in response.json()["data"]["governor"]
+
+
+def test_stream_rejects_unknown_topic():
+    """测试SSE端点拒绝未知主题"""
+    response = client.get("/api/monitor/stream?topics=cpu,gpu")
+    assert response.status_code == 400
+    assert "gpu" in response.json()["error"]
+
+
+def test_event_stream_topics_and_resume(monkeypatch):
+    """测试SSE事件流的主题过滤和 Last-Event-ID 续传"""
+    import asyncio
+    import json
+
+    from app.api.monitor import event_stream, sampler
+
+    monkeypatch.setattr(sampler, "interval", 0.05)
+
+    async def read_event(stream):
+        while True:
+            chunk = await anext(stream)
+            if chunk.startswith("id:"):
+                return chunk
+
+    async def scenario():
+        stream = event_stream({"cpu", "memory"})
+        assert (await anext(stream)).startswith("retry:")
+        chunk = await read_event(stream)
+        lines = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+        assert lines["event"] == "monitor_data"
+        assert set(json.loads(lines["data"])) == {"cpu", "memory", "timestamp"}
+        assert sampler.governor.subscribers == 1
+        await stream.aclose()
+        assert sampler.governor.subscribers == 0
+
+        # 带 Last-Event-ID 重连时只推送之后的采样
+        last_id = lines["id"]
+        resumed = event_stream({"system"}, last_id)
+        await anext(resumed)
+        chunk = await read_event(resumed)
+        resumed_id = chunk.split("\n", 1)[0][len("id: ") :]
+        assert int(resumed_id.split("-")[0]) > int(last_id.split("-")[0])
+        await resumed.aclose()
+        await sampler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_get_network_stack():
+    """测试获取内核网络协议栈计数"""
+    response = client.get("/api/monitor/network/stack")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert "tcpRetransSegs" in data["data"]
+    assert "socketsUsed" in data["data"]
+
+
+def test_get_interrupts_info():
+    """测试获取每个 CPU 的中断分布"""
+    response = client.get("/api/monitor/interrupts?limit=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert len(data["data"]["hardirqRates"]) == len(data["data"]["cpus"])
+    assert len(data["data"]["hotspots"]) <= 5
+
+
+def test_get_numa_info():
+    """测试获取 NUMA 节点内存和 CPU 拓扑"""
+    response = client.get("/api/monitor/numa")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert "nodes" in data["data"]
+    assert "topology" in data["data"]
+
+
+def test_get_cpu_info_grouped_by_node():
+    """测试按 NUMA 节点分组的每核使用率"""
+    response = client.get("/api/monitor/cpu?group_by=node")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    grouped = sum(len(group["cores"]) for group in data["coreGroups"])
+    assert grouped in (0, len(data["cores"]))
+
+
+def test_get_process_tree_deep_chain(monkeypatch):
+    """测试很深的进程链也能完整返回，不受响应序列化的嵌套深度限制"""
+    depth = 300
+    node = None
+    for pid in range(depth, 0, -1):
+        node = TreeNode(
+            pid=pid,
+            name='sh "x"',
+            status="睡眠",
+            cpuPercent=0.5,
+            memoryPercent=0.0,
+            rss=1,
+            subtreeCpuPercent=0.5 * (depth - pid + 1),
+            subtreeMemoryPercent=0.0,
+            subtreeRss=depth - pid + 1,
+            subtreeProcesses=depth - pid + 1,
+            children=[node] if node else [],
+        )
+    monkeypatch.setattr(
+        monitor_service, "get_process_tree", lambda root=None, depth=None: [node]
+    )
+
+    response = client.get("/api/monitor/processes/tree")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    [current] = data["data"]
+    assert current["name"] == 'sh "x"'
+    level = 1
+    while current["children"]:
+        [current] = current["children"]
+        level += 1
+    assert (level, current["pid"], current["subtreeProcesses"]) == (depth, depth, 1)
+
+
+def test_pin_process_limit(monkeypatch):
+    """测试固定的进程达到上限后返回 409"""
+    import os
+
+    monkeypatch.setattr(monitor_service.process_history, "max_pinned", 0)
+    response = client.post(f"/api/monitor/processes/{os.getpid()}/pin")
+    assert response.status_code == 409
+    assert response.json()["success"] is False
+
+
+def test_rest_poll_does_not_wake_sampler(monkeypatch):
+    """测试单进程模式下普通的模块轮询不唤醒采样器，读取历史的轮询才唤醒"""
+    monkeypatch.setattr(sampler.governor, "_last_poll", None)
+    assert client.get("/api/monitor/memory").status_code == 200
+    assert client.get("/api/monitor/processes").status_code == 200
+    assert not sampler.governor.active
+
+    assert client.get("/api/monitor/history?limit=1").status_code == 200
+    assert sampler.governor.active
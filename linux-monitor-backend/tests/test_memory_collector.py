@@ -0,0 +1,34 @@
+from app.services.memory_collector import MemoryCollector
+
+
+def test_memory_collector_rereads_same_descriptor(tmp_path):
+    """测试 meminfo 与 PSI 的解析，以及复用同一个文件描述符重新读取"""
+    (tmp_path / "pressure").mkdir()
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text(
+        "MemTotal:        1000 kB\n"
+        "MemFree:          200 kB\n"
+        "Dirty:             12 kB\n"
+        "HugePages_Total:    4\n"
+    )
+    (tmp_path / "pressure" / "memory").write_text(
+        "some avg10=1.50 avg60=0.75 avg300=0.10 total=12345\n"
+        "full avg10=0.50 avg60=0.25 avg300=0.00 total=678\n"
+    )
+
+    collector = MemoryCollector(host_proc=str(tmp_path))
+    values = collector.read_meminfo()
+    assert values["MemTotal"] == 1000 * 1024
+    assert values["HugePages_Total"] == 4
+    fd = collector._meminfo.fd
+
+    # 原地改写文件内容，复用的描述符应读到新值
+    with open(meminfo, "r+") as f:
+        f.write("MemTotal:        2000 kB\n")
+    assert collector.read_meminfo()["MemTotal"] == 2000 * 1024
+    assert collector._meminfo.fd == fd
+
+    pressure = collector.read_pressure()
+    assert set(pressure) == {"memory"}
+    assert pressure["memory"].some.avg10 == 1.5
+    assert pressure["memory"].full.total == 678
@@ -0,0 +1,106 @@
+from app.services.netstack_collector import (
+    PAGE_SIZE,
+    NetStackCollector,
+    header_offsets,
+    pair_offsets,
+)
+
+SNMP = """\
+Ip: Forwarding DefaultTTL InReceives
+Ip: 1 64 1000
+IcmpMsg: InType3 OutType3
+IcmpMsg: 5 5
+Tcp: RtoAlgorithm RtoMin MaxConn ActiveOpens InErrs OutSegs RetransSegs OutRsts EstabResets AttemptFails
+Tcp: 1 200 -1 10 {in_errs} {out_segs} {retrans} {rsts} 3 4
+Udp: InDatagrams NoPorts InErrors OutDatagrams RcvbufErrors SndbufErrors
+Udp: 100 2 {udp_errs} 90 {rcvbuf} 0
+"""
+
+NETSTAT = """\
+TcpExt: SyncookiesSent ListenOverflows ListenDrops TCPTimeouts
+TcpExt: 0 {overflows} {drops} 7
+IpExt: InNoRoutes InOctets
+IpExt: 0 123456
+"""
+
+SOCKSTAT = """\
+sockets: used 321
+TCP: inuse 12 orphan 1 tw 5 alloc 20 mem 3
+UDP: inuse 4 mem 2
+UDPLITE: inuse 0
+RAW: inuse 0
+FRAG: inuse 0 memory 0
+"""
+
+
+def write_files(root, out_segs=0, retrans=0, overflows=0, icmp_types=1, **values):
+    net = root / "net"
+    net.mkdir(exist_ok=True)
+    snmp = SNMP.format(
+        in_errs=values.get("in_errs", 0),
+        out_segs=out_segs,
+        retrans=retrans,
+        rsts=values.get("rsts", 0),
+        udp_errs=values.get("udp_errs", 0),
+        rcvbuf=values.get("rcvbuf", 0),
+    )
+    if icmp_types > 1:
+        # 出现新的 ICMP 消息类型时 IcmpMsg 行会多出字段
+        snmp = snmp.replace("InType3 OutType3", "InType0 InType3 OutType3")
+        snmp = snmp.replace("IcmpMsg: 5 5", "IcmpMsg: 1 5 5")
+    (net / "snmp").write_text(snmp)
+    (net / "netstat").write_text(
+        NETSTAT.format(overflows=overflows, drops=values.get("drops", 0))
+    )
+    (net / "sockstat").write_text(SOCKSTAT)
+
+
+def test_offsets_from_headers():
+    """测试根据表头计算每个字段的值在 split() 结果中的位置"""
+    tokens = NETSTAT.format(overflows=11, drops=12).encode().split()
+    offsets = header_offsets(tokens)
+    assert tokens[offsets[(b"TcpExt:", b"ListenOverflows")]] == b"11"
+    assert tokens[offsets[(b"IpExt:", b"InOctets")]] == b"123456"
+
+    tokens = SOCKSTAT.encode().split()
+    offsets = pair_offsets(tokens)
+    assert tokens[offsets[(b"TCP:", b"tw")]] == b"5"
+    assert tokens[offsets[(b"sockets:", b"used")]] == b"321"
+
+
+def test_netstack_collector_rates(tmp_path):
+    """测试累计计数转换为每秒速率，以及文件结构变化后重新计算位置"""
+    write_files(tmp_path, out_segs=1000, retrans=10)
+    collector = NetStackCollector(host_proc=str(tmp_path))
+    first = collector.collect()
+    assert first.tcpRetransSegs == 0.0
+    assert first.socketsUsed == 321
+    assert first.tcpTimeWait == 5
+    assert first.tcpMemory == 3 * PAGE_SIZE
+    assert first.udpMemory == 2 * PAGE_SIZE
+
+    collector._last_time -= 2.0
+    write_files(
+        tmp_path,
+        out_segs=3000,
+        retrans=50,
+        overflows=8,
+        icmp_types=2,
+        rsts=4,
+        udp_errs=6,
+    )
+    second = collector.collect()
+    assert 990 < second.tcpOutSegs <= 1000
+    assert 19 < second.tcpRetransSegs <= 20
+    assert second.retransmitPercent == 2.0
+    assert 3.9 < second.listenOverflows <= 4
+    assert 1.9 < second.tcpOutRsts <= 2
+    assert 2.9 < second.udpInErrors <= 3
+    assert second.tcpTimeouts == 0.0
+
+
+def test_netstack_collector_missing_files(tmp_path):
+    """测试文件不存在时返回默认值而不是抛出异常"""
+    stack = NetStackCollector(host_proc=str(tmp_path)).collect()
+    assert stack.tcpRetransSegs == 0.0
+    assert stack.socketsUsed == 0
@@ -0,0 +1,38 @@
+from app.services.network_collector import NetworkCollector, parse_net_dev
+
+NET_DEV = """\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo: {lo} 10 0 0 0 0 0 0 {lo} 10 0 0 0 0 0 0
+  eth0: {rx} 100 1 2 0 0 0 0 {tx} 50 3 4 0 0 0 0
+"""
+
+
+def test_parse_net_dev():
+    """测试解析 /proc/net/dev 的收发字节、包、错误和丢包列"""
+    counters = parse_net_dev(NET_DEV.format(lo=5, rx=1000, tx=2000).encode())
+    assert counters["eth0"] == (1000, 100, 1, 2, 2000, 50, 3, 4)
+    assert counters["lo"][0] == 5
+
+
+def test_network_collector_rates(tmp_path):
+    """测试每个接口的速率计算，以及接口清单不会在每个周期刷新"""
+    net = tmp_path / "net"
+    net.mkdir()
+    (net / "dev").write_text(NET_DEV.format(lo=0, rx=0, tx=0))
+
+    collector = NetworkCollector(host_proc=str(tmp_path))
+    refreshes = []
+    original_refresh = collector.inventory.refresh
+    collector.inventory.refresh = lambda: (refreshes.append(1), original_refresh())
+
+    first = {i.name: i for i in collector.collect()}
+    assert first["eth0"].receiveRate == 0.0
+
+    collector._last_time -= 2.0
+    (net / "dev").write_text(NET_DEV.format(lo=0, rx=4000, tx=1000))
+    second = {i.name: i for i in collector.collect()}
+    assert 1900 < second["eth0"].receiveRate <= 2000
+    assert 450 < second["eth0"].sendRate <= 500
+    assert second["eth0"].bytesReceived == 4000
+    assert len(refreshes) == 1
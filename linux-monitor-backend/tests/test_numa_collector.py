@@ -0,0 +1,109 @@
+from app.services.numa_collector import (
+    NumaCollector,
+    parse_cpulist,
+    parse_node_meminfo,
+)
+
+
+def write_sys(root, online="0-3", hit=0, other=0):
+    """两个节点、两个封装，每个物理核心两个 SMT 线程"""
+    cpu_root = root / "devices" / "system" / "cpu"
+    cpu_root.mkdir(parents=True, exist_ok=True)
+    (cpu_root / "online").write_text(online + "\n")
+    for cpu in range(4):
+        topology = cpu_root / f"cpu{cpu}" / "topology"
+        topology.mkdir(parents=True, exist_ok=True)
+        (topology / "physical_package_id").write_text(f"{cpu // 2}\n")
+        (topology / "core_id").write_text("0\n")
+        pair = cpu - cpu % 2
+        (topology / "thread_siblings_list").write_text(f"{pair}-{pair + 1}\n")
+    for node in range(2):
+        node_dir = root / "devices" / "system" / "node" / f"node{node}"
+        node_dir.mkdir(parents=True, exist_ok=True)
+        (node_dir / "cpulist").write_text(f"{node * 2}-{node * 2 + 1}\n")
+        (node_dir / "meminfo").write_text(
+            f"Node {node} MemTotal:        1000 kB\n"
+            f"Node {node} MemFree:          250 kB\n"
+            f"Node {node} MemUsed:          750 kB\n"
+            f"Node {node} FilePages:        100 kB\n"
+            f"Node {node} HugePages_Total:     4\n"
+        )
+        (node_dir / "numastat").write_text(
+            f"numa_hit {hit}\nnuma_miss {other}\nnuma_foreign 0\n"
+            f"interleave_hit 0\nlocal_node {hit}\nother_node {other}\n"
+        )
+
+
+def test_parsers():
+    """测试 CPU 列表和节点 meminfo 的解析"""
+    assert parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+    assert parse_cpulist("") == []
+    meminfo = parse_node_meminfo(
+        b"Node 1 MemTotal:  2048 kB\nNode 1 HugePages_Free:   3\n"
+    )
+    assert meminfo == {"MemTotal": 2048 * 1024, "HugePages_Free": 3}
+
+
+def test_numa_nodes_and_topology(tmp_path, monkeypatch):
+    """测试节点内存、跨节点分配速率和缓存的拓扑"""
+    clock = iter([10.0, 12.0])
+    monkeypatch.setattr(
+        "app.services.numa_collector.time.monotonic", lambda: next(clock)
+    )
+    write_sys(tmp_path, hit=900, other=100)
+    collector = NumaCollector(host_sys=str(tmp_path))
+    nodes = collector.collect_nodes()
+    assert [n.node for n in nodes] == [0, 1]
+    assert nodes[1].cpus == [2, 3]
+    assert nodes[0].memTotal == 1000 * 1024
+    assert nodes[0].percent == 75.0
+    assert nodes[0].hugepagesTotal == 4
+    # 首次采样使用累计值计算跨节点占比，速率为 0
+    assert nodes[0].remotePercent == 10.0
+    assert nodes[0].numaHit == 0.0
+
+    write_sys(tmp_path, hit=1900, other=1100)
+    nodes = collector.collect_nodes()
+    assert nodes[0].numaHit == 500.0
+    assert nodes[0].otherNode == 500.0
+    assert nodes[0].remotePercent == 50.0
+
+    topology = collector.topology()
+    assert [(t.cpu, t.node, t.socket, t.siblings) for t in topology] == [
+        (0, 0, 0, [0, 1]),
+        (1, 0, 0, [0, 1]),
+        (2, 1, 1, [2, 3]),
+        (3, 1, 1, [2, 3]),
+    ]
+    assert collector.core_nodes(4) == [0, 0, 1, 1]
+    assert collector.core_nodes(2) == []
+    groups = collector.group_cores([10.0, 20.0, 50.0, 70.0])
+    assert [(g.node, g.cpus, g.usage) for g in groups] == [
+        (0, [0, 1], 15.0),
+        (1, [2, 3], 60.0),
+    ]
+
+
+def test_topology_cached_until_hotplug(tmp_path, monkeypatch):
+    """测试拓扑只发现一次，在线 CPU 变化时重新发现"""
+    write_sys(tmp_path)
+    collector = NumaCollector(host_sys=str(tmp_path))
+    first = collector.topology()
+
+    calls = []
+    discover = collector._discover
+    monkeypatch.setattr(collector, "_discover", lambda: calls.append(1) or discover())
+    assert collector.topology() is first
+    assert calls == []
+
+    (tmp_path / "devices" / "system" / "cpu" / "online").write_text("0-2\n")
+    assert [t.cpu for t in collector.topology()] == [0, 1, 2]
+    assert calls == [1]
+
+
+def test_numa_missing(tmp_path):
+    """测试没有 NUMA 和拓扑信息时返回空结果"""
+    collector = NumaCollector(host_sys=str(tmp_path))
+    assert collector.collect_nodes() == []
+    assert collector.core_nodes(0) == []
+    assert collector.group_cores([]) == []
@@ -0,0 +1,43 @@
+import pytest
+
+from app.core.perf import Histogram, PerfRegistry
+
+
+def test_histogram_percentiles():
+    """测试对数分桶直方图的分位数估计误差在一个桶以内"""
+    histogram = Histogram()
+    for i in range(1, 1001):
+        histogram.observe(i / 1000)
+    assert histogram.count == 1000
+    assert histogram.max == 1.0
+    assert 0.5 <= histogram.percentile(0.5) <= 0.5 * 1.19
+    assert 0.99 <= histogram.percentile(0.99) <= 1.0
+    assert Histogram().percentile(0.5) == 0.0
+
+
+def test_registry_timer_errors_and_clients():
+    """测试计时、错误/降级计数和按客户端统计"""
+    perf = PerfRegistry()
+
+    @perf.timed("collect")
+    def collect(fail=False):
+        if fail:
+            raise ValueError("boom")
+        return 1
+
+    assert collect() == 1
+    with pytest.raises(ValueError):
+        collect(fail=True)
+    perf.fallback("collect")
+    with perf.timer("ws.send", client="127.0.0.1:5000"):
+        pass
+
+    snapshot = perf.snapshot()
+    assert snapshot["stages"]["collect"]["count"] == 2
+    assert snapshot["stages"]["collect"]["errors"] == 1
+    assert snapshot["stages"]["collect"]["fallbacks"] == 1
+    assert snapshot["clients"]["127.0.0.1:5000"]["count"] == 1
+    assert 'client="127.0.0.1:5000"' in perf.prometheus()
+
+    perf.drop_client("127.0.0.1:5000")
+    assert perf.snapshot()["clients"] == {}
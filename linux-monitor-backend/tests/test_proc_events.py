@@ -0,0 +1,89 @@
+import struct
+
+from app.services.proc_events import (
+    PROC_EVENT_EXEC,
+    PROC_EVENT_EXIT,
+    PROC_EVENT_FORK,
+    ConnectorEvent,
+    parse_proc_events,
+)
+from app.services.process_collector import ProcessCollector
+
+
+def _message(what, *data):
+    body = struct.pack("=IIQ", what, 0, 0) + struct.pack(f"={len(data)}I", *data)
+    cn_msg = struct.pack("=IIIIHH", 1, 1, 0, 0, len(body), 0)
+    length = 16 + len(cn_msg) + len(body)
+    return struct.pack("=IHHII", length, 3, 0, 0, 0) + cn_msg + body
+
+
+def _write_stat(tmp_path, pid, name, ppid=1, start=100):
+    proc_dir = tmp_path / str(pid)
+    proc_dir.mkdir(exist_ok=True)
+    fields = ["S", ppid] + [0] * 15 + [1, 0, start, 4096, 10, 0, 0]
+    (proc_dir / "stat").write_text(f"{pid} ({name}) " + " ".join(map(str, fields)))
+    (proc_dir / "cmdline").write_bytes(name.encode() + b"\0-x\0")
+
+
+def test_parse_proc_events():
+    """测试解析一次 recv 中的多条 fork/exec/exit 消息"""
+    data = (
+        _message(PROC_EVENT_FORK, 10, 10, 20, 20)
+        + _message(PROC_EVENT_EXEC, 20, 20)
+        + _message(PROC_EVENT_EXIT, 20, 20, 256, 17)
+    )
+    assert parse_proc_events(data) == [
+        ConnectorEvent(PROC_EVENT_FORK, 20, 20, 10),
+        ConnectorEvent(PROC_EVENT_EXEC, 20, 20),
+        ConnectorEvent(PROC_EVENT_EXIT, 20, 20, exit_code=256),
+    ]
+
+
+def test_connector_events_update_table(tmp_path):
+    """测试事件实时更新进程表，且扫描不会重复上报已处理的变化"""
+    _write_stat(tmp_path, 1, "init", ppid=0)
+    collector = ProcessCollector(host_proc=str(tmp_path))
+    collector.scan()
+
+    _write_stat(tmp_path, 20, "cron")
+    collector.handle_event(ConnectorEvent(PROC_EVENT_FORK, 20, 20, 1))
+    collector.handle_event(ConnectorEvent(PROC_EVENT_EXEC, 20, 20))
+    # 线程事件被忽略
+    collector.handle_event(ConnectorEvent(PROC_EVENT_EXEC, 21, 20))
+    assert collector.tree.children(1) == {20}
+
+    [exec_event] = collector.events.since(0)
+    assert (exec_event.kind, exec_event.name, exec_event.cmdline) == (
+        "exec",
+        "cron",
+        "cron -x",
+    )
+
+    # 退出后 /proc 中仍残留僵尸进程，扫描不应把它当作新进程
+    collector.handle_event(ConnectorEvent(PROC_EVENT_EXIT, 20, 20, exit_code=9))
+    assert 20 not in collector.table
+    collector.scan()
+    assert 20 not in collector.table
+
+    events = collector.events.since(exec_event.seq)
+    assert [(e.kind, e.name, e.exitCode, e.exitSignal) for e in events] == [
+        ("exit", "cron", 0, 9)
+    ]
+
+
+def test_scan_diff_fallback_events(tmp_path):
+    """测试事件源不可用时由扫描对比产生启动/退出事件，首次扫描不产生事件"""
+    _write_stat(tmp_path, 1, "init", ppid=0)
+    collector = ProcessCollector(host_proc=str(tmp_path))
+    collector.scan()
+    assert collector.events.since(0) == []
+
+    _write_stat(tmp_path, 30, "job")
+    collector.scan()
+    (tmp_path / "30" / "stat").unlink()
+    collector.scan()
+    events = collector.events.since(0)
+    assert [(e.kind, e.pid, e.source) for e in events] == [
+        ("start", 30, "scan"),
+        ("exit", 30, "scan"),
+    ]
@@ -0,0 +1,188 @@
+import json
+import shutil
+
+from app.models.monitor import ProcessTreeNode
+from app.services.process_collector import (
+    CLOCK_TICKS,
+    PAGE_SIZE,
+    ProcessCollector,
+    parse_stat,
+)
+
+
+def _stat(pid, name, state="S", ppid=1, utime=0, stime=0, start=100, rss=10):
+    fields = [state, ppid] + [0] * 9 + [utime, stime] + [0] * 4 + [3, 0, start]
+    fields += [4096000, rss]
+    return f"{pid} ({name}) " + " ".join(str(f) for f in fields) + " 0 0\n"
+
+
+def _write_proc(tmp_path, processes):
+    (tmp_path / "stat").write_text("cpu  1 2 3 4\nbtime 1700000000\n")
+    (tmp_path / "meminfo").write_text(f"MemTotal: {1000 * PAGE_SIZE // 1024} kB\n")
+    for pid, stat in processes.items():
+        proc_dir = tmp_path / str(pid)
+        (proc_dir / "fd").mkdir(parents=True, exist_ok=True)
+        (proc_dir / "stat").write_text(stat)
+        (proc_dir / "cmdline").write_bytes(b"worker\0--flag\0")
+        (proc_dir / "io").write_text(
+            f"rchar: 0\nwchar: 0\nread_bytes: {pid * 1000}\nwrite_bytes: 0\n"
+        )
+
+
+def test_parse_stat_name_with_parens():
+    """测试进程名中包含空格和括号时的解析"""
+    name, state, ppid, ticks, threads, start, vms, rss = parse_stat(
+        _stat(7, "a) (b", state="R", ppid=3, utime=5, stime=6).encode()
+    )
+    assert (name, state, ppid, ticks, threads, start) == ("a) (b", b"R", 3, 11, 3, 100)
+    assert (vms, rss) == (4096000, 10)
+
+
+def test_process_collector_top_and_detail(tmp_path):
+    """测试CPU速率、PID复用检测以及详细字段只为Top-N读取"""
+    _write_proc(tmp_path, {1: _stat(1, "init"), 2: _stat(2, "busy", rss=500)})
+    collector = ProcessCollector(host_proc=str(tmp_path))
+    collector.scan()
+    for entry in collector.table.values():
+        entry.last_time -= 1.0
+
+    _write_proc(
+        tmp_path,
+        {
+            1: _stat(1, "init"),
+            2: _stat(2, "busy", utime=CLOCK_TICKS // 2, rss=500),
+            3: _stat(3, "new"),
+        },
+    )
+    collector.scan()
+    assert 45 < collector.table[2].cpu_percent <= 50
+    assert collector.table[3].cpu_percent == 0.0
+
+    top = collector.top(limit=1)
+    assert [p.pid for p in top] == [2]
+    assert top[0].rss == 500 * PAGE_SIZE
+    assert top[0].memoryPercent == 50.0
+    assert top[0].cmdline == "worker --flag"
+    assert top[0].readBytes == 2000
+    assert top[0].fds == 0
+    assert top[0].startTime == int((1700000000 + 100 / CLOCK_TICKS) * 1000)
+
+    # 显式请求的进程附加在 Top-N 之后
+    assert [p.pid for p in collector.top(limit=1, sort="memory", pids=[1])] == [2, 1]
+
+    # PID 被复用（启动时间变化）时视为新进程，已退出的进程从进程表移除
+    shutil.rmtree(tmp_path / "1")
+    _write_proc(tmp_path, {2: _stat(2, "other", start=200)})
+    collector.scan()
+    assert collector.table[2].cpu_percent == 0.0
+    assert collector.detail(2).name == "other"
+    assert collector.detail(1) is None
+
+
+def test_process_tree_incremental(tmp_path):
+    """测试父子进程索引的增量更新（启动、退出、收养）和子树汇总"""
+    _write_proc(
+        tmp_path,
+        {
+            1: _stat(1, "init", ppid=0, rss=10),
+            10: _stat(10, "supervisor", ppid=1, rss=20),
+            11: _stat(11, "worker", ppid=10, rss=30),
+            12: _stat(12, "worker", ppid=10, rss=40),
+        },
+    )
+    collector = ProcessCollector(host_proc=str(tmp_path))
+    diff = collector.scan()
+    assert {e.pid for e in diff.started} == {1, 10, 11, 12}
+    assert collector.tree.children(10) == {11, 12}
+
+    [init] = collector.tree_view()
+    assert init.pid == 1
+    assert init.subtreeProcesses == 4
+    assert init.subtreeRss == 100 * PAGE_SIZE
+    [supervisor] = init.children
+    assert supervisor.subtreeRss == 90 * PAGE_SIZE
+    assert len(supervisor.children) == 2
+
+    # supervisor 退出，worker 12 退出，worker 11 被 init 收养，新进程 13 启动
+    shutil.rmtree(tmp_path / "10")
+    shutil.rmtree(tmp_path / "12")
+    _write_proc(
+        tmp_path,
+        {
+            11: _stat(11, "worker", ppid=1, rss=30),
+            13: _stat(13, "cron", ppid=1, rss=5),
+        },
+    )
+    diff = collector.scan()
+    assert [e.pid for e in diff.started] == [13]
+    assert {e.pid for e in diff.exited} == {10, 12}
+    assert [(e.pid, old) for e, old in diff.reparented] == [(11, 10)]
+    assert collector.tree.children(1) == {11, 13}
+    assert collector.tree.children(10) == set()
+
+    [init] = collector.tree_view(depth=0)
+    assert init.children == []
+    assert init.subtreeProcesses == 3
+    assert [n.pid for n in collector.tree_view(root=11)] == [11]
+
+
+def test_process_tree_encoding(tmp_path):
+    """测试树节点直接编码的结构与公开模型一致，很深的进程链不受递归深度限制"""
+    depth = 3000
+    processes = {1: _stat(1, "init", ppid=0)}
+    for pid in range(2, depth + 1):
+        processes[pid] = _stat(pid, "sh", ppid=pid - 1, rss=1)
+    _write_proc(tmp_path, processes)
+    collector = ProcessCollector(host_proc=str(tmp_path))
+    collector.scan()
+
+    [init] = collector.tree_view()
+    encoded = init.to_json()
+    assert encoded.count('"children":[') == depth
+    assert encoded.endswith("]}" * depth)
+    assert f'{{"pid":{depth},' in encoded
+
+    [shallow] = collector.tree_view(depth=2)
+    assert ProcessTreeNode.model_validate_json(shallow.to_json()).model_dump() == (
+        json.loads(shallow.to_json())
+    )
+
+
+def test_process_search_index(tmp_path):
+    """测试名称/状态索引的增量维护以及搜索、过滤和分页"""
+    _write_proc(
+        tmp_path,
+        {
+            1: _stat(1, "init", ppid=0, rss=10),
+            20: _stat(20, "nginx", rss=200),
+            21: _stat(21, "nginx", state="R", rss=300),
+            30: _stat(30, "python3", state="R", rss=50),
+        },
+    )
+    collector = ProcessCollector(host_proc=str(tmp_path))
+    collector.scan()
+    assert collector.index.by_name["nginx"] == {20, 21}
+    assert collector.index.by_state[b"R"] == {21, 30}
+
+    result = collector.search(name="NGIN", sort="memory")
+    assert result.total == 2
+    assert [p.pid for p in result.processes] == [21, 20]
+
+    assert [p.pid for p in collector.search(name="^py", regex=True).processes] == [30]
+    running = collector.search(states=["running"], sort="pid")
+    assert [p.pid for p in running.processes] == [21, 30]
+    assert collector.search(name="nginx", states=["running"]).total == 1
+    assert collector.search(min_memory=10.0).total == 2
+
+    page = collector.search(sort="pid", offset=1, limit=2)
+    assert (page.total, [p.pid for p in page.processes]) == (4, [20, 21])
+    assert collector.search(user="nobody-such-user").total == 0
+
+    # exec 改名、状态变化和退出都会更新索引
+    shutil.rmtree(tmp_path / "20")
+    _write_proc(tmp_path, {21: _stat(21, "nginx", rss=300), 30: _stat(30, "node")})
+    collector.scan()
+    assert collector.index.by_name["nginx"] == {21}
+    assert "python3" not in collector.index.by_name
+    assert collector.index.by_state.get(b"R") is None
+    assert [p.pid for p in collector.search(name="node").processes] == [30]
@@ -0,0 +1,68 @@
+from app.services.process_collector import ProcessEntry
+from app.services.process_history import ProcessHistory, ProcessSeries
+
+
+def _entry(pid, cpu=0.0, rss=0, start=1, name="p"):
+    entry = ProcessEntry(pid, start)
+    entry.name = name
+    entry.cpu_percent = cpu
+    entry.rss = rss
+    return entry
+
+
+def test_process_series_ring_buffer():
+    """测试环形缓冲区按时间顺序返回并覆盖最旧的采样"""
+    series = ProcessSeries(1, 1, capacity=3)
+    for t in range(5):
+        series.append(t, float(t), t * 10)
+    model = series.to_model(pinned=False)
+    assert model.timestamps == [2, 3, 4]
+    assert model.rss == [20, 30, 40]
+    assert series.to_model(pinned=False, since=4).cpu == [4.0]
+
+
+def test_process_history_top_k_and_eviction():
+    """测试Top-K跟踪、固定进程、退出丢弃以及LRU淘汰"""
+    history = ProcessHistory(capacity=10, top_k=1, max_tracked=3)
+    table = {
+        1: _entry(1, cpu=50.0, rss=10),
+        2: _entry(2, cpu=1.0, rss=999),
+        3: _entry(3, cpu=0.0, rss=1),
+    }
+    history.pin(table[3])
+    history.record(table, 1000)
+    assert {s.pid for s in history.all()} == {1, 2, 3}
+
+    # 进程 4 成为CPU Top-1，进程 1 离开Top集合后按LRU被淘汰，固定的进程 3 保留
+    table[4] = _entry(4, cpu=90.0, rss=5)
+    history.record(table, 2000)
+    assert {s.pid for s in history.all()} == {2, 3, 4}
+    assert history.get(table[3]).pinned is True
+    assert history.get(table[2]).timestamps == [1000, 2000]
+
+    # PID 被复用（启动时间不同）时旧序列被丢弃
+    table[4] = _entry(4, cpu=0.0, rss=0, start=2)
+    del table[3]
+    history.record(table, 3000)
+    assert history.get(table[4]) is None
+    assert 3 not in {s.pid for s in history.all()}
+
+
+def test_process_history_pin_limit():
+    """测试固定数量上限，固定的序列计入 max_tracked，内存上限不被突破"""
+    history = ProcessHistory(capacity=10, top_k=1, max_tracked=4)
+    assert history.max_pinned == 2
+    table = {pid: _entry(pid, cpu=float(pid), rss=pid) for pid in range(1, 11)}
+    assert history.pin(table[1])
+    assert history.pin(table[2])
+    assert history.pin(table[2])
+    assert not history.pin(table[3])
+
+    for t in range(5):
+        table[10 - t].cpu_percent = 100.0 + t
+        history.record(table, t)
+        assert len(history) <= history.max_tracked
+    assert {1, 2} <= {s.pid for s in history.all()}
+
+    history.unpin(1)
+    assert history.pin(table[3])
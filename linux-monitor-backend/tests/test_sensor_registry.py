@@ -0,0 +1,43 @@
+from app.services.sensor_registry import SensorRegistry
+
+
+def _make_hwmon(root, index, name, inputs):
+    hwmon = root / "class" / "hwmon" / f"hwmon{index}"
+    hwmon.mkdir(parents=True)
+    (hwmon / "name").write_text(f"{name}\n")
+    for i, (label, millideg) in enumerate(inputs, start=1):
+        (hwmon / f"temp{i}_input").write_text(f"{millideg}\n")
+        if label:
+            (hwmon / f"temp{i}_label").write_text(f"{label}\n")
+    return hwmon
+
+
+def test_sensor_registry_discovers_once_and_rereads(tmp_path):
+    """测试传感器只发现一次，之后复用已知文件读取全部封装与核心温度"""
+    hwmon = _make_hwmon(
+        tmp_path,
+        0,
+        "coretemp",
+        [("Package id 0", 55000), ("Core 0", 50000), ("Core 1", 52000)],
+    )
+    _make_hwmon(tmp_path, 1, "nvme", [("Composite", 40000)])
+    zone = tmp_path / "class" / "thermal" / "thermal_zone0"
+    zone.mkdir(parents=True)
+    (zone / "type").write_text("acpitz\n")
+    (zone / "temp").write_text("45000\n")
+
+    registry = SensorRegistry(host_sys=str(tmp_path), rescan_interval=3600)
+    readings = registry.read()
+    kinds = {(r.label, r.kind) for r in readings}
+    assert ("Package id 0", "package") in kinds
+    assert ("Core 1", "core") in kinds
+    assert ("Composite", "other") in kinds
+    assert ("thermal_zone0", "zone") in kinds
+    assert registry.cpu_temperature(readings) == 55.0
+
+    # 新增的传感器在重新扫描前不会被发现，已有传感器的值会被重新读取
+    _make_hwmon(tmp_path, 2, "k10temp", [("Tctl", 70000)])
+    (hwmon / "temp1_input").write_text("61000\n")
+    readings = registry.read()
+    assert not any(r.source == "k10temp" for r in readings)
+    assert registry.cpu_temperature(readings) == 61.0
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import struct
+
+import pytest
+
+from app.models.monitor import MonitorData, ProcessEvent
+from app.services.monitor_service import MonitorService
+from app.services.sampler import EVENT_LIST, SharedSampler, publish
+from app.services.shared_snapshot import HEADER_SIZE, SnapshotSegment
+
+
+@pytest.fixture
+def segment():
+    segment = SnapshotSegment.create(slot_size=64 * 1024)
+    yield segment
+    segment.close()
+
+
+def test_segment_round_trip(segment):
+    """测试写入的采样可以被其他映射读取，两个槽位轮流使用"""
+    reader = SnapshotSegment.attach(segment.name)
+    try:
+        assert reader.read() is None
+        assert segment.write(1, {"cpu": '{"usage": 12.5}', "system": '"主机"'})
+        assert reader.read() == (1, {"cpu": '{"usage": 12.5}', "system": '"主机"'})
+        assert reader.read(after=1) is None
+
+        segment.write(2, {"cpu": '{"usage": 50}'})
+        assert reader.read(after=1) == (2, {"cpu": '{"usage": 50}'})
+        assert struct.unpack_from("<Q", reader.buf, 24)[0] == 1
+
+        # 超出槽容量的采样被丢弃，读取方仍看到上一份
+        assert not segment.write(3, {"processes": "x" * 70_000})
+        assert reader.read(after=1) == (2, {"cpu": '{"usage": 50}'})
+    finally:
+        reader.close()
+
+
+def test_segment_rejects_torn_read(segment):
+    """测试 seqlock 计数为奇数（正在写入）时不返回数据"""
+    segment.write(1, {"cpu": "{}"})
+    struct.pack_into("<Q", segment.buf, HEADER_SIZE, 1)
+    assert segment.read(retries=2) is None
+
+
+def test_segment_activity(segment):
+    """测试 worker 记录的活动时间对其他进程可见"""
+    reader = SnapshotSegment.attach(segment.name)
+    try:
+        assert reader.last_activity == 0.0
+        segment.touch()
+        assert reader.last_activity > 0
+    finally:
+        reader.close()
+
+
+def test_publisher_feeds_shared_sampler(segment, monkeypatch):
+    """测试采样进程写入的快照被 worker 读取，并同步历史数据"""
+    import psutil
+
+    monkeypatch.setattr(psutil, "PROCFS_PATH", psutil.PROCFS_PATH)
+
+    async def scenario():
+        publisher = asyncio.create_task(publish(segment.name, interval=0.05))
+        worker = MonitorService()
+        sampler = SharedSampler(worker, segment.name, interval=0.05)
+        try:
+            # 订阅写入活动时间，暂停中的采样进程随之开始采集
+            sampler.subscribe()
+            seq, encoded = await asyncio.wait_for(sampler.next_encoded(0), 10)
+            assert seq >= 1
+            assert json.loads(encoded["cpu"])["usage"] >= 0
+            assert isinstance(sampler.latest_data(), MonitorData)
+            assert sampler.fresh
+            await asyncio.wait_for(sampler.next_encoded(seq), 10)
+            assert len(worker.history) >= 1
+            sampler.unsubscribe()
+        finally:
+            await sampler.stop()
+            sampler.segment.close()
+            publisher.cancel()
+            try:
+                await publisher
+            except asyncio.CancelledError:
+                pass
+
+    asyncio.run(scenario())
+
+
+def test_shared_sampler_follows_publisher_restart(segment):
+    """测试采样进程重启、段内序号从头开始后 worker 继续读取新采样和进程事件"""
+
+    def sections(*event_seqs):
+        events = [
+            ProcessEvent(seq=seq, kind="exec", pid=seq, source="scan", timestamp=0)
+            for seq in event_seqs
+        ]
+        return {"cpu": "{}", "process_events": EVENT_LIST.dump_json(events).decode()}
+
+    async def scenario():
+        worker = MonitorService()
+        sampler = SharedSampler(worker, segment.name, interval=0.05)
+        sampler.ensure_started()
+        try:
+            segment.restart()
+            segment.write(1, sections(1, 2))
+            seq, _ = await asyncio.wait_for(sampler.next_encoded(0), 5)
+            segment.write(2, sections(1, 2, 3))
+            seq, _ = await asyncio.wait_for(sampler.next_encoded(seq), 5)
+            assert worker.process_events_seq == 3
+
+            # 新的采样进程从序号 1 开始写入
+            segment.restart()
+            segment.write(1, sections(1))
+            seq, _ = await asyncio.wait_for(sampler.next_encoded(seq), 5)
+            assert seq == 3
+            assert [e.seq for e in worker.get_process_events(0)] == [1, 2, 3, 4]
+        finally:
+            await sampler.stop()
+            sampler.segment.close()
+
+    asyncio.run(scenario())
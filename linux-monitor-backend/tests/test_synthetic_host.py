@@ -0,0 +1,46 @@
+import psutil
+
+from benchmarks.bench_collectors import compare
+from benchmarks.synthetic_host import SyntheticHost
+
+
+def test_collectors_read_synthetic_host(tmp_path, monkeypatch):
+    """测试采集器能完整读取合成的 /proc 和 /sys（保证基准测试测到真实工作量）"""
+    from app.services.monitor_service import MonitorService
+
+    host = SyntheticHost(
+        str(tmp_path), processes=50, sockets=120, interfaces=3, disks=2, cgroups=4
+    ).build()
+    monkeypatch.setenv("HOST_PROC", host.proc)
+    monkeypatch.setenv("HOST_SYS", host.sys)
+    # MonitorService 会修改全局的 psutil.PROCFS_PATH，测试结束后恢复
+    monkeypatch.setattr(psutil, "PROCFS_PATH", psutil.PROCFS_PATH)
+    service = MonitorService()
+
+    service.get_cpu_info()
+    service.get_disk_info()
+    host.advance()
+    cpu = service.get_cpu_info()
+    assert len(cpu.cores) == host.cpus
+    assert cpu.usage > 0
+    assert len(service.get_disk_info().devices) == 2
+
+    service.process_collector.scan()
+    assert len(service.process_collector.table) == 50
+    assert service.get_containers_info().total == 4
+    talkers = service.get_top_talkers()
+    # 每6个 socket 中有1个处于 LISTEN 状态，不计入
+    assert talkers.totalSockets == 100
+    assert talkers.entries[0].process is not None
+    assert service.get_network_connections().tcpListen == 20
+
+
+def test_compare_detects_regressions():
+    """测试基线比较忽略噪声范围内的变化"""
+    baseline = {"time": {"tick": {"median": 10.0}, "cpu": {"median": 0.05}}}
+    results = {
+        "time": {"tick": {"median": 16.0}, "cpu": {"median": 0.1}},
+        "memory": {"retained": 100},
+    }
+    assert compare(results, baseline, tolerance=1.5) == [("tick (ms)", 10.0, 16.0)]
+    assert compare(results, baseline, tolerance=2.0) == []
@@ -3,7 +3,7 @@ import * as echarts from 'echarts';
 import { useMonitorStore } from '@/stores/monitor-store';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Cpu, TrendingUp, TrendingDown, Minus } from 'lucide-react';
-import { CpuInfo, SystemInfo } from '@/types/monitor';
+import { CoreGroup, CpuInfo, SystemInfo } from '@/types/monitor';
 import { formatFrequency } from '@/utils/format';
 
 // ==================== 常量定义 ====================
@@ -146,6 +146,38 @@ const safeFormatNumber = (value: number | undefined, decimals: number): string =
   return value.toFixed(decimals);
 };
 
+/**
+ * 按 NUMA 节点对每核使用率分组，只有一个节点或缺少节点信息时返回空数组
+ */
+const groupCoresByNode = (cpu: CpuInfo | null): CoreGroup[] => {
+  const cores = cpu?.cores;
+  const nodes = cpu?.coreNodes;
+  if (!Array.isArray(cores) || !Array.isArray(nodes) || nodes.length !== cores.length) {
+    return [];
+  }
+
+  const groups = new Map<number, CoreGroup>();
+  nodes.forEach((node, index) => {
+    let group = groups.get(node);
+    if (!group) {
+      group = { node, cpus: [], cores: [], usage: 0 };
+      groups.set(node, group);
+    }
+    group.cpus.push(index);
+    group.cores.push(cores[index]);
+  });
+  if (groups.size < 2) {
+    return [];
+  }
+
+  return Array.from(groups.values())
+    .map(group => ({
+      ...group,
+      usage: group.cores.reduce((sum, value) => sum + value, 0) / group.cores.length,
+    }))
+    .sort((a, b) => a.node - b.node);
+};
+
 // ==================== 主组件 ====================
 
 export function EnhancedCpuChart() {
@@ -372,6 +404,9 @@ export function EnhancedCpuChart() {
   
   // 获取CPU使用率
   const cpuUsage = cpuData?.usage ?? 0;
+
+  // 多个 NUMA 节点时按节点分组显示每核使用率
+  const nodeGroups = groupCoresByNode(cpuData);
   
   // 获取频率信息
   const frequencyDisplay = cpuData?.frequency !== undefined 
@@ -490,6 +525,32 @@ export function EnhancedCpuChart() {
             加载CPU详细信息中...
           </div>
         )}
+
+        {/* 按 NUMA 节点分组的每核使用率 */}
+        {nodeGroups.length > 0 && (
+          <div className="mt-4 space-y-2 text-xs">
+            {nodeGroups.map(group => (
+              <div key={group.node}>
+                <div className="flex justify-between text-slate-400">
+                  <span>NUMA 节点 {group.node} · {group.cores.length} 核</span>
+                  <span className={`font-medium ${getStatusColorClass(group.usage)}`}>
+                    {safeFormatNumber(group.usage, 1)}%
+                  </span>
+                </div>
+                <div className="mt-1 flex h-4 items-end gap-px">
+                  {group.cores.map((usage, i) => (
+                    <div
+                      key={group.cpus[i]}
+                      title={`CPU ${group.cpus[i]}: ${safeFormatNumber(usage, 1)}%`}
+                      className="flex-1 rounded-sm bg-blue-500/70"
+                      style={{ height: `${Math.max(5, Math.min(100, usage))}%` }}
+                    />
+                  ))}
+                </div>
+              </div>
+            ))}
+          </div>
+        )}
       </CardContent>
     </Card>
   );
@@ -14,8 +14,16 @@ interface HistoryItem {
 interface MemoryHistoryItem extends HistoryItem {
   percent: number;
   used: number;
+  pressure?: number;
 }
 
+// PSI 资源名称
+const PRESSURE_LABELS: Record<string, string> = {
+  cpu: 'CPU',
+  memory: '内存',
+  io: 'I/O'
+};
+
 export function MemoryChart() {
   const chartRef = useRef<HTMLDivElement>(null);
   const chartInstance = useRef<echarts.ECharts | null>(null);
@@ -89,6 +97,18 @@ export function MemoryChart() {
             ])
           },
           data: []
+        },
+        {
+          name: '内存压力',
+          type: 'line',
+          smooth: true,
+          symbol: 'none',
+          lineStyle: {
+            color: '#f59e0b',
+            width: 1,
+            type: 'dashed'
+          },
+          data: []
         }
       ],
       tooltip: {
@@ -100,7 +120,12 @@ export function MemoryChart() {
         },
         formatter: (params: any) => {
           const data = params[0];
-          return `${data.name}<br/>内存使用率: ${data.value}%`;
+          const pressure = params[1];
+          let text = `${data.name}<br/>内存使用率: ${data.value}%`;
+          if (pressure && pressure.value !== undefined && pressure.value !== null) {
+            text += `<br/>内存压力(some avg10): ${pressure.value}%`;
+          }
+          return text;
         }
       }
     };
@@ -148,12 +173,18 @@ export function MemoryChart() {
         return isNaN(percent) ? '0' : percent.toFixed(1);
       });
 
+      const pressureValues = validHistory.map(item =>
+        item.pressure !== undefined && !isNaN(item.pressure) ? item.pressure.toFixed(2) : null
+      );
+
       chartInstance.current.setOption({
         xAxis: {
           data: times
         },
         series: [{
           data: values
+        }, {
+          data: pressureValues
         }]
       });
     } catch (error) {
@@ -279,6 +310,62 @@ export function MemoryChart() {
             </div>
           </div>
         )}
+
+        {/* 内存明细 */}
+        {memoryData && memoryData.cached !== undefined && (
+          <div className="mt-4 grid grid-cols-3 gap-4 text-xs">
+            {[
+              { label: '缓存', value: memoryData.cached },
+              { label: '缓冲区', value: memoryData.buffers },
+              { label: 'Slab', value: memoryData.slab },
+              { label: '脏页', value: memoryData.dirty },
+              { label: '回写', value: memoryData.writeback },
+              {
+                label: '大页',
+                value: memoryData.hugepages
+                  ? (memoryData.hugepages.total - memoryData.hugepages.free) * memoryData.hugepages.size
+                  : 0
+              }
+            ].map(item => (
+              <div key={item.label} className="text-center">
+                <div className="text-slate-400">{item.label}</div>
+                <div className="text-white font-medium">{formatBytes(item.value || 0)}</div>
+              </div>
+            ))}
+          </div>
+        )}
+
+        {/* 每个 NUMA 节点的内存使用和跨节点分配占比 */}
+        {memoryData && memoryData.numa && memoryData.numa.length > 1 && (
+          <div className="mt-4 space-y-1 text-xs">
+            {memoryData.numa.map(node => (
+              <div key={node.node} className="flex justify-between text-slate-400">
+                <span>NUMA 节点 {node.node}</span>
+                <span className="text-white font-mono">
+                  {formatBytes(node.memUsed)} / {formatBytes(node.memTotal)} ({node.percent.toFixed(1)}%)
+                  {' · '}远端分配 {node.remotePercent.toFixed(1)}%
+                </span>
+              </div>
+            ))}
+          </div>
+        )}
+
+        {/* PSI 压力（avg10 / avg60 / avg300） */}
+        {memoryData && memoryData.pressure && Object.keys(memoryData.pressure).length > 0 && (
+          <div className="mt-4 space-y-1 text-xs">
+            {Object.entries(memoryData.pressure).map(([resource, info]) => info && (
+              <div key={resource} className="flex justify-between text-slate-400">
+                <span>{PRESSURE_LABELS[resource] || resource} 压力</span>
+                <span className="text-white font-mono">
+                  some {info.some.avg10.toFixed(2)} / {info.some.avg60.toFixed(2)} / {info.some.avg300.toFixed(2)}
+                  {info.full && (
+                    <> · full {info.full.avg10.toFixed(2)} / {info.full.avg60.toFixed(2)} / {info.full.avg300.toFixed(2)}</>
+                  )}
+                </span>
+              </div>
+            ))}
+          </div>
+        )}
       </CardContent>
     </Card>
   );
@@ -304,6 +304,35 @@ export function NetworkDetails() {
                 </div>
               </div>
             </div>
+
+            {/* 内核协议栈计数 */}
+            {network.stack && (
+              <div className="mt-6 bg-slate-700/30 rounded-lg p-4">
+                <h3 className="font-medium text-white mb-4 flex items-center gap-2">
+                  <Shield className="h-5 w-5 text-red-400" />
+                  协议栈计数（每秒）
+                </h3>
+                <div className="grid grid-cols-1 md:grid-cols-2 gap-x-6 gap-y-2 text-sm">
+                  {[
+                    ['TCP重传', `${network.stack.tcpRetransSegs.toFixed(1)} (${network.stack.retransmitPercent.toFixed(2)}%)`],
+                    ['监听队列溢出', network.stack.listenOverflows.toFixed(1)],
+                    ['监听丢弃', network.stack.listenDrops.toFixed(1)],
+                    ['发送RST', network.stack.tcpOutRsts.toFixed(1)],
+                    ['连接被重置', network.stack.tcpEstabResets.toFixed(1)],
+                    ['UDP接收错误', network.stack.udpInErrors.toFixed(1)],
+                    ['UDP缓冲区溢出', network.stack.udpRcvbufErrors.toFixed(1)],
+                    ['TCP孤儿连接', String(network.stack.tcpOrphan)],
+                    ['TCP内存', formatBytes(network.stack.tcpMemory)],
+                    ['UDP内存', formatBytes(network.stack.udpMemory)],
+                  ].map(([label, value]) => (
+                    <div key={label} className="flex items-center justify-between">
+                      <span className="text-slate-400">{label}</span>
+                      <span className="text-slate-200 font-medium">{value}</span>
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )}
           </TabsContent>
 
           {/* 开放端口 */}
@@ -1,11 +1,38 @@
+import { useEffect, useState } from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
+import { Input } from '@/components/ui/input';
 import { useMonitorStore } from '@/stores/monitor-store';
+import { apiService } from '@/services/api';
 import { Activity, Cpu, MemoryStick } from 'lucide-react';
-import { ProcessInfo } from '@/types/monitor';
+import { ProcessInfo, ProcessSearchResult } from '@/types/monitor';
 
 export function ProcessTable() {
   const { data } = useMonitorStore();
+  const [query, setQuery] = useState('');
+  const [searchResult, setSearchResult] = useState<ProcessSearchResult | null>(null);
+
+  // 输入搜索词后由服务端在完整进程表中搜索，而不是只过滤已收到的Top-N
+  useEffect(() => {
+    const name = query.trim();
+    if (!name) {
+      setSearchResult(null);
+      return;
+    }
+    let cancelled = false;
+    const timer = window.setTimeout(async () => {
+      try {
+        const result = await apiService.searchProcesses({ name, limit: 50 });
+        if (!cancelled) setSearchResult(result);
+      } catch (error) {
+        console.error('搜索进程失败:', error);
+      }
+    }, 300);
+    return () => {
+      cancelled = true;
+      window.clearTimeout(timer);
+    };
+  }, [query]);
 
   const getStatusColor = (status: string) => {
     switch (status.toLowerCase()) {
@@ -54,7 +81,8 @@ export function ProcessTable() {
   }
 
   // 过滤无效数据并按CPU使用率排序
-  const validProcesses = data.processes.filter((p: ProcessInfo) => 
+  const sourceProcesses: ProcessInfo[] = searchResult ? searchResult.processes : data.processes;
+  const validProcesses = sourceProcesses.filter((p: ProcessInfo) => 
     p && typeof p === 'object' && p.pid !== undefined && p.name !== undefined
   );
   
@@ -71,11 +99,17 @@ export function ProcessTable() {
           </div>
           系统进程
           <Badge variant="secondary" className="ml-auto bg-slate-700 text-slate-300">
-            {validProcesses.length} 个进程
+            {searchResult ? `匹配 ${searchResult.total} 个进程` : `${validProcesses.length} 个进程`}
           </Badge>
         </CardTitle>
       </CardHeader>
       <CardContent>
+        <Input
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+          placeholder="按进程名搜索全部进程"
+          className="mb-4 bg-slate-700/50 border-slate-600 text-white"
+        />
         <div className="overflow-hidden">
           {/* 表头 */}
           <div className="grid grid-cols-12 gap-4 pb-3 mb-4 border-b border-slate-700 text-sm font-medium text-slate-400">
@@ -110,7 +144,10 @@ export function ProcessTable() {
                   <div className="col-span-1 text-slate-300 font-mono">
                     {process.pid || '-'}
                   </div>
-                  <div className="col-span-4 text-white font-medium truncate">
+                  <div
+                    className="col-span-4 text-white font-medium truncate"
+                    title={process.cmdline || process.name}
+                  >
                     {process.name || '未知进程'}
                   </div>
                   <div className="col-span-2">
@@ -1,4 +1,5 @@
 import config from '../config';
+import type { ProcessSearchResult } from '../types/monitor';
 
 export interface ApiResponse<T> {
   success: boolean;
@@ -6,7 +7,11 @@ export interface ApiResponse<T> {
   error?: string;
 }
 
+// 仪表盘通过 SSE 订阅的模块
+const STREAM_TOPICS = ['system', 'cpu', 'memory', 'disk', 'network', 'processes'];
+
 class ApiService {
+  private eventSource: EventSource | null = null;
   private pollingInterval: number | null = null;
   private pollingDelay = config.pollingInterval;
   private isRequestPending = false;
@@ -89,6 +94,16 @@ class ApiService {
     return this.get('/cpu');
   }
 
+  // 获取按 NUMA 节点分组的每核使用率
+  async getCpuInfoByNode() {
+    return this.get('/cpu?group_by=node');
+  }
+
+  // 获取 NUMA 节点内存、跨节点分配速率和 CPU 拓扑
+  async getNumaInfo() {
+    return this.get('/numa');
+  }
+
   // 获取内存信息
   async getMemoryInfo() {
     return this.get('/memory');
@@ -109,6 +124,129 @@ class ApiService {
     return this.get('/processes');
   }
 
+  // 在服务端进程表中搜索进程
+  async searchProcesses(params: {
+    name?: string;
+    regex?: boolean;
+    user?: string;
+    state?: string[];
+    minCpu?: number;
+    minMemory?: number;
+    sort?: 'cpu' | 'memory' | 'pid' | 'name';
+    offset?: number;
+    limit?: number;
+  }) {
+    const query = new URLSearchParams();
+    if (params.name) query.set('name', params.name);
+    if (params.regex) query.set('regex', 'true');
+    if (params.user) query.set('user', params.user);
+    params.state?.forEach((s) => query.append('state', s));
+    if (params.minCpu !== undefined) query.set('min_cpu', String(params.minCpu));
+    if (params.minMemory !== undefined) query.set('min_memory', String(params.minMemory));
+    if (params.sort) query.set('sort', params.sort);
+    if (params.offset !== undefined) query.set('offset', String(params.offset));
+    if (params.limit !== undefined) query.set('limit', String(params.limit));
+    return this.get<ProcessSearchResult>(`/processes/search?${query}`);
+  }
+
+  // 获取所有正在跟踪的Top进程历史序列（迷你趋势图）
+  async getProcessesHistory(since?: number) {
+    return this.get(`/processes/history${since !== undefined ? `?since=${since}` : ''}`);
+  }
+
+  // 获取单个进程的CPU/RSS历史
+  async getProcessHistory(pid: number, since?: number) {
+    return this.get(`/processes/${pid}/history${since !== undefined ? `?since=${since}` : ''}`);
+  }
+
+  // 获取序号大于 since 的进程启动/退出事件
+  async getProcessEvents(since = 0) {
+    return this.get(`/processes/events?since=${since}`);
+  }
+
+  // 获取进程树（子树CPU和内存汇总）
+  async getProcessTree(root?: number, depth?: number) {
+    const params = new URLSearchParams();
+    if (root !== undefined) params.set('root', String(root));
+    if (depth !== undefined) params.set('depth', String(depth));
+    const query = params.toString();
+    return this.get(`/processes/tree${query ? `?${query}` : ''}`);
+  }
+
+  // 获取单个进程的详细信息
+  async getProcessDetail(pid: number) {
+    return this.get(`/processes/${pid}`);
+  }
+
+  // 获取Top-N容器资源使用
+  async getContainersInfo(sort: 'cpu' | 'memory' = 'cpu', limit = 10) {
+    return this.get(`/containers?sort=${sort}&limit=${limit}`);
+  }
+
+  // 获取内核网络协议栈计数（重传、监听队列溢出、RST、UDP错误、socket内存）
+  async getNetworkStack() {
+    return this.get('/network/stack');
+  }
+
+  // 获取每个 CPU 的硬中断、软中断速率和最热的中断/CPU 组合
+  async getInterrupts(limit = 10) {
+    return this.get(`/interrupts?limit=${limit}`);
+  }
+
+  async getTopTalkers(k = 20, states: string[] = [], groupBy: 'endpoint' | 'ip' = 'endpoint') {
+    const stateParams = states.map((s) => `&state=${s}`).join('');
+    return this.get(`/network/talkers?k=${k}&group_by=${groupBy}${stateParams}`);
+  }
+
+  // 浏览器是否支持 Server-Sent Events
+  supportsStream(): boolean {
+    return typeof window !== 'undefined' && 'EventSource' in window;
+  }
+
+  // 打开SSE事件流，共享后端的采样节拍，断线后浏览器会带上 Last-Event-ID 自动重连
+  startStream(onDataReceived: (data: any) => void, onError?: (error: Error) => void) {
+    if (this.eventSource) {
+      console.log('SSE事件流已经打开，无需重新打开');
+      return;
+    }
+
+    const url = `${config.apiBaseUrl}/stream?topics=${STREAM_TOPICS.join(',')}`;
+    console.log(`打开SSE事件流: ${url}`);
+    const source = new EventSource(url);
+
+    source.addEventListener('monitor_data', (event) => {
+      try {
+        onDataReceived({ type: 'monitor_data', data: JSON.parse((event as MessageEvent).data) });
+      } catch (error) {
+        console.error('解析SSE数据失败:', error);
+      }
+    });
+
+    source.onerror = () => {
+      // CONNECTING 表示浏览器正在自动重连，CLOSED 表示服务端拒绝或不可达
+      if (source.readyState === EventSource.CLOSED) {
+        this.stopStream();
+        if (onError) {
+          onError(new Error('SSE事件流已关闭'));
+        }
+      } else {
+        console.log('SSE连接中断，正在重连...');
+      }
+    };
+
+    this.eventSource = source;
+    return () => this.stopStream();
+  }
+
+  // 关闭SSE事件流
+  stopStream() {
+    if (this.eventSource) {
+      console.log('关闭SSE事件流');
+      this.eventSource.close();
+      this.eventSource = null;
+    }
+  }
+
   // 开始HTTP轮询
   startPolling(onDataReceived: (data: any) => void, onError?: (error: Error) => void) {
     if (this.pollingInterval) {
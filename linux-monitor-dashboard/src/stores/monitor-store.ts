@@ -14,6 +14,7 @@ interface CpuHistoryItem extends HistoryItem {
 interface MemoryHistoryItem extends HistoryItem {
   percent: number;
   used: number;
+  pressure?: number;
 }
 
 interface NetworkHistoryItem extends HistoryItem {
@@ -168,7 +169,8 @@ export const useMonitorStore = create<MonitorStore>((set, get) => ({
       const newMemoryHistory = [...state.memoryHistory, {
         timestamp: now,
         percent: newData.memory.percent,
-        used: newData.memory.used
+        used: newData.memory.used,
+        pressure: newData.memory.pressure?.memory?.some.avg10
       }];
       if (newMemoryHistory.length > 30) {
         newMemoryHistory.shift();
@@ -327,7 +329,27 @@ export const useMonitorStore = create<MonitorStore>((set, get) => ({
         return
       }
       
-      // 初始化HTTP轮询
+      const onHttpError = (error: Error) => {
+        console.error('HTTP API请求错误:', error)
+        store.setConnected(false)
+        store.setLoading(false)
+        store.setError('HTTP API请求失败: ' + error.message)
+      }
+
+      // 优先使用SSE事件流：一个长连接接收所有模块，代替每个周期多次请求
+      if (apiService.supportsStream()) {
+        apiService.startStream(
+          (message) => {
+            store.setData(message.data)
+            store.setConnected(true)
+            store.setLoading(false)
+          },
+          onHttpError
+        )
+        return
+      }
+
+      // 不支持SSE的浏览器退回到HTTP轮询
       apiService.startPolling(
         (message) => {
           console.log('收到HTTP数据:', message)
@@ -364,12 +386,7 @@ export const useMonitorStore = create<MonitorStore>((set, get) => ({
             });
           }
         },
-        (error) => {
-          console.error('HTTP API请求错误:', error)
-          store.setConnected(false)
-          store.setLoading(false)
-          store.setError('HTTP API请求失败: ' + error.message)
-        }
+        onHttpError
       )
     }
   },
@@ -380,6 +397,7 @@ export const useMonitorStore = create<MonitorStore>((set, get) => ({
     if (store.connectionType === 'websocket') {
       wsService.disconnect()
     } else {
+      apiService.stopStream()
       apiService.stopPolling()
     }
     
@@ -402,6 +420,7 @@ export const useMonitorStore = create<MonitorStore>((set, get) => ({
       wsService.disconnect()
       wsService.resetReconnectAttempts()
     } else {
+      apiService.stopStream()
       apiService.stopPolling()
     }
     
@@ -432,6 +451,7 @@ export const useMonitorStore = create<MonitorStore>((set, get) => ({
     if (store.connectionType === 'websocket') {
       wsService.disconnect()
     } else if (store.connectionType === 'http') {
+      apiService.stopStream()
       apiService.stopPolling()
     }
     
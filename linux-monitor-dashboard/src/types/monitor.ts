@@ -6,12 +6,97 @@ export interface SystemInfo {
   timestamp: number;
 }
 
+export interface TemperatureReading {
+  label: string;
+  source: string;
+  kind: 'package' | 'core' | 'zone' | 'other';
+  value: number;
+}
+
 export interface CpuInfo {
   usage: number;
   cores: number[];
   frequency: number;
   temperature?: number;
   timestamp: number;
+  modes?: Record<string, number>;
+  coreModes?: Record<string, number[]>;
+  temperatures?: TemperatureReading[];
+  // 每个核心所属的 NUMA 节点，与 cores 顺序相同
+  coreNodes?: number[];
+  // 仅在 /cpu?group_by=node 时返回
+  coreGroups?: CoreGroup[];
+}
+
+export interface CpuTopology {
+  cpu: number;
+  node: number;
+  socket: number;
+  core: number;
+  siblings: number[];
+}
+
+export interface CoreGroup {
+  node: number;
+  cpus: number[];
+  cores: number[];
+  usage: number;
+}
+
+export interface IrqHotspot {
+  irq: string;
+  kind: 'hardirq' | 'softirq';
+  description?: string | null;
+  cpu: number;
+  rate: number;
+  share: number;
+}
+
+// 每个 CPU 的中断分布，列表按 cpus 中的 CPU 编号排列，速率为每秒次数
+export interface InterruptsInfo {
+  cpus: number[];
+  hardirqRates: number[];
+  softirqRates: Record<string, number[]>;
+  hotspots: IrqHotspot[];
+  timestamp: number;
+}
+
+export interface PressureStall {
+  avg10: number;
+  avg60: number;
+  avg300: number;
+  total: number;
+}
+
+export interface PressureInfo {
+  some: PressureStall;
+  full?: PressureStall | null;
+}
+
+// 单个 NUMA 节点，内存字段为字节，numastat 计数为每秒页数
+export interface NumaNode {
+  node: number;
+  cpus: number[];
+  memTotal: number;
+  memFree: number;
+  memUsed: number;
+  percent: number;
+  filePages: number;
+  anonPages: number;
+  hugepagesTotal: number;
+  hugepagesFree: number;
+  numaHit: number;
+  numaMiss: number;
+  numaForeign: number;
+  localNode: number;
+  otherNode: number;
+  remotePercent: number;
+}
+
+export interface NumaInfo {
+  nodes: NumaNode[];
+  topology: CpuTopology[];
+  timestamp: number;
 }
 
 export interface MemoryInfo {
@@ -25,6 +110,44 @@ export interface MemoryInfo {
     percent: number;
   };
   timestamp: number;
+  free?: number;
+  cached?: number;
+  buffers?: number;
+  shared?: number;
+  dirty?: number;
+  writeback?: number;
+  slab?: number;
+  slabReclaimable?: number;
+  hugepages?: {
+    total: number;
+    free: number;
+    size: number;
+  };
+  pressure?: Partial<Record<'cpu' | 'memory' | 'io', PressureInfo>>;
+  numa?: NumaNode[];
+}
+
+export interface DiskDevice {
+  name: string;
+  readSpeed: number;
+  writeSpeed: number;
+  readIops: number;
+  writeIops: number;
+  readBytes: number;
+  writeBytes: number;
+  awaitMs: number;
+  utilization: number;
+}
+
+export interface DiskMount {
+  device: string;
+  mountpoint: string;
+  fstype: string;
+  total: number;
+  used: number;
+  free: number;
+  percent: number;
+  responsive: boolean;
 }
 
 export interface DiskInfo {
@@ -35,6 +158,8 @@ export interface DiskInfo {
   readSpeed: number;
   writeSpeed: number;
   timestamp: number;
+  devices?: DiskDevice[];
+  mounts?: DiskMount[];
 }
 
 export interface NetworkInterface {
@@ -50,6 +175,17 @@ export interface NetworkInterface {
   packetsSent: number;
   errorsReceived: number;
   errorsSent: number;
+  dropsReceived?: number;
+  dropsSent?: number;
+  physical?: boolean;
+  receiveRate?: number;
+  sendRate?: number;
+  packetsReceivedRate?: number;
+  packetsSentRate?: number;
+  errorsReceivedRate?: number;
+  errorsSentRate?: number;
+  dropsReceivedRate?: number;
+  dropsSentRate?: number;
 }
 
 export interface NetworkConnections {
@@ -68,6 +204,33 @@ export interface OpenPort {
   pid?: number;
 }
 
+// 内核网络协议栈计数，速率字段为每秒次数，内存字段为字节
+export interface NetworkStackInfo {
+  tcpOutSegs: number;
+  tcpRetransSegs: number;
+  retransmitPercent: number;
+  tcpInErrs: number;
+  tcpOutRsts: number;
+  tcpEstabResets: number;
+  tcpAttemptFails: number;
+  tcpTimeouts: number;
+  listenOverflows: number;
+  listenDrops: number;
+  udpInErrors: number;
+  udpRcvbufErrors: number;
+  udpSndbufErrors: number;
+  udpNoPorts: number;
+  socketsUsed: number;
+  tcpInUse: number;
+  tcpOrphan: number;
+  tcpTimeWait: number;
+  tcpAlloc: number;
+  tcpMemory: number;
+  udpInUse: number;
+  udpMemory: number;
+  timestamp: number;
+}
+
 export interface NetworkInfo {
   uploadSpeed: number;
   downloadSpeed: number;
@@ -77,6 +240,7 @@ export interface NetworkInfo {
   interfaces: NetworkInterface[];
   openPorts: OpenPort[];
   timestamp: number;
+  stack?: NetworkStackInfo | null;
 }
 
 export interface ProcessInfo {
@@ -85,6 +249,115 @@ export interface ProcessInfo {
   cpuPercent: number;
   memoryPercent: number;
   status: string;
+  ppid?: number | null;
+  rss?: number | null;
+  vms?: number | null;
+  threads?: number | null;
+  startTime?: number | null;
+  // 以下字段只为 Top-N 和显式请求的进程采集
+  fds?: number | null;
+  readBytes?: number | null;
+  writeBytes?: number | null;
+  readRate?: number | null;
+  writeRate?: number | null;
+  cmdline?: string | null;
+  user?: string | null;
+}
+
+export interface ProcessSearchResult {
+  total: number;
+  offset: number;
+  limit: number;
+  processes: ProcessInfo[];
+  timestamp: number;
+}
+
+export interface ProcessHistorySeries {
+  pid: number;
+  name: string;
+  pinned: boolean;
+  timestamps: number[];
+  cpu: number[];
+  rss: number[];
+}
+
+export interface ProcessEvent {
+  seq: number;
+  kind: 'exec' | 'start' | 'exit';
+  pid: number;
+  ppid: number | null;
+  name: string | null;
+  cmdline: string | null;
+  exitCode: number | null;
+  exitSignal: number | null;
+  source: 'netlink' | 'scan';
+  timestamp: number;
+}
+
+export interface ProcessTreeNode {
+  pid: number;
+  name: string;
+  status: string;
+  cpuPercent: number;
+  memoryPercent: number;
+  rss: number;
+  subtreeCpuPercent: number;
+  subtreeMemoryPercent: number;
+  subtreeRss: number;
+  subtreeProcesses: number;
+  children: ProcessTreeNode[];
+}
+
+export interface ContainerInfo {
+  id: string;
+  path: string;
+  runtime: string;
+  pod?: string | null;
+  cpuPercent: number;
+  cpuThrottledPercent: number;
+  nrThrottled: number;
+  memoryCurrent: number;
+  memoryMax?: number | null;
+  ioReadBytes: number;
+  ioWriteBytes: number;
+  ioReadRate: number;
+  ioWriteRate: number;
+  pids: number;
+}
+
+export interface ContainersInfo {
+  total: number;
+  containers: ContainerInfo[];
+  timestamp: number;
+}
+
+export interface ConnectionAggregate {
+  remoteAddress: string;
+  remotePort: number | null;
+  state: string;
+  pid: number | null;
+  process: string | null;
+  count: number;
+}
+
+export interface TopTalkers {
+  totalSockets: number;
+  entries: ConnectionAggregate[];
+  timestamp: number;
+}
+
+export interface AnomalyAnnotation {
+  timestamp: number;
+  series: string;
+  value: number;
+  baseline: number;
+  score: number;
+  direction: 'high' | 'low';
+}
+
+export interface HistoryData {
+  samples: Array<Record<string, number>>;
+  annotations: AnomalyAnnotation[];
 }
 
 export interface MonitorData {
@@ -94,4 +367,5 @@ export interface MonitorData {
   disk: DiskInfo;
   network: NetworkInfo;
   processes: ProcessInfo[];
+  anomalies?: AnomalyAnnotation[];
 }
\ No newline at end of file